@@ -307,22 +307,38 @@ func (pm *IPCManager) readWebSocketMessages() {
 			break
 		}
 
-		var logMessage ipc.LogMessage
-		if err = unmarshalStrict(message, &logMessage); err == nil {
-			pm.handleLogMessage(logMessage)
-			continue
-		}
-
-		var summaryMessage ipc.Summary
-		if err = unmarshalStrict(message, &summaryMessage); err == nil {
-			if summaryMessage.SummaryMessage != "" {
-				pm.summary = &summaryMessage
+		// Messages are batched into a JSON array, single messages are sent as is.
+		if len(message) > 0 && message[0] == '[' {
+			var batch []json.RawMessage
+			if err = json.Unmarshal(message, &batch); err == nil {
+				for _, item := range batch {
+					pm.handleWebSocketMessage(item)
+				}
+				continue
 			}
-			continue
 		}
 
-		logger.Get().Debugf("Received unknown WebSocket message: %s", string(message))
+		pm.handleWebSocketMessage(message)
+	}
+}
+
+// handleWebSocketMessage processes a single log or summary message.
+func (pm *IPCManager) handleWebSocketMessage(message []byte) {
+	var logMessage ipc.LogMessage
+	if err := unmarshalStrict(message, &logMessage); err == nil {
+		pm.handleLogMessage(logMessage)
+		return
+	}
+
+	var summaryMessage ipc.Summary
+	if err := unmarshalStrict(message, &summaryMessage); err == nil {
+		if summaryMessage.SummaryMessage != "" {
+			pm.summary = &summaryMessage
+		}
+		return
 	}
+
+	logger.Get().Debugf("Received unknown WebSocket message: %s", string(message))
 }
 
 func unmarshalStrict(data []byte, v interface{}) error {
@@ -16,7 +16,8 @@ from adb_auto_player.models.decorators import GUIMetadata
     name="WMSize1080x1920",
 )
 def _exec_wm_size_1080_1920():
-    AdbController().set_display_size("1080x1920")
+    with AdbController() as controller:
+        controller.set_display_size("1080x1920")
 
 
 @register_command(
@@ -27,4 +28,5 @@ def _exec_wm_size_1080_1920():
     name="WMSizeReset",
 )
 def _reset_display_size():
-    AdbController().reset_display_size()
+    with AdbController() as controller:
+        controller.reset_display_size()
@@ -33,10 +33,11 @@ def _log_debug() -> None:
         logging.info("--- Debug Info End ---")
         return
 
-    _log_device_info(controller)
-    _test_input_delay(controller)
-    _log_display_info(controller)
-    _test_resize_display(controller)
+    with controller:
+        _log_device_info(controller)
+        _test_input_delay(controller)
+        _log_display_info(controller)
+        _test_resize_display(controller)
 
     logging.info("--- Debug Info End ---")
     return
@@ -12,7 +12,12 @@ from adb_auto_player.exceptions import (
 )
 from adb_auto_player.game import Game
 from adb_auto_player.ipc import GameGUIOptions
-from adb_auto_player.ipc_util import IPCModelConverter
+from adb_auto_player.ipc_util import (
+    GameGUIData,
+    GamePackageNames,
+    GUIOptionsCache,
+    IPCModelConverter,
+)
 from adb_auto_player.models.decorators import CacheGroup
 from adb_auto_player.registries import GAME_REGISTRY
 
@@ -54,7 +59,8 @@ def _get_running_game() -> str | None:
         detected.
     """
     try:
-        return _get_game_from_package_name(AdbController().get_running_app())
+        with AdbController() as controller:
+            return _get_game_from_package_name(controller.get_running_app())
     except (GenericAdbError, GenericAdbUnrecoverableError) as e:
         if str(e) == "closed":
             # This error usually happens when you try to initialize an ADB Connection
@@ -69,34 +75,52 @@ def _get_running_game() -> str | None:
 def _get_game_from_package_name(package_name: str | None) -> str | None:
     if not package_name:
         return None
-    for game_object in _get_games():
-        if (
-            any(pn in package_name for pn in game_object.package_name_substrings)
-            or game_object.package_name == package_name
-        ):
-            for module, game in GAME_REGISTRY.items():
-                if module in game_object.__module__:
-                    return game.name
+    for game_packages in _get_game_gui_data().game_packages:
+        if game_packages.matches(package_name):
+            return game_packages.game_title
     return None
 
 
-def _get_games() -> list[Game]:
-    game_objects = []
-    for class_name in games.__all__:
-        cls = getattr(games, class_name)
-        game_objects.append(cls())
-    return game_objects
+def _get_game_packages(game_classes: list[type[Game]]) -> list[GamePackageNames]:
+    game_packages = []
+    for cls in game_classes:
+        game_object = cls()
+        for module, game in GAME_REGISTRY.items():
+            if module in game_object.__module__:
+                game_packages.append(
+                    GamePackageNames(
+                        game_title=game.name,
+                        package_name=game_object.package_name,
+                        package_name_substrings=game_object.package_name_substrings,
+                    )
+                )
+                break
+    return game_packages
 
 
 @register_cache(CacheGroup.GAME_SETTINGS)
 @lru_cache(maxsize=1)
-def _get_game_gui_options() -> list[GameGUIOptions]:
-    """Get the menu for the GUI.
+def _get_game_gui_data() -> GameGUIData:
+    """GUI options and package names, from the disk cache if still valid."""
+    game_classes = [getattr(games, class_name) for class_name in games.__all__]
+    cache = GUIOptionsCache()
+    fingerprint = GUIOptionsCache.fingerprint(game_classes)
+    if gui_data := cache.load(fingerprint):
+        return gui_data
 
-    Used by the Wails GUI to populate the menu.
-    """
     menus: list[GameGUIOptions] = []
     for module, game in GAME_REGISTRY.items():
         menus.append(IPCModelConverter.convert_game_to_gui_options(module, game))
+    gui_data = GameGUIData(
+        gui_options=menus, game_packages=_get_game_packages(game_classes)
+    )
+    cache.save(fingerprint, gui_data)
+    return gui_data
+
 
-    return menus
+def _get_game_gui_options() -> list[GameGUIOptions]:
+    """Get the menu for the GUI.
+
+    Used by the Wails GUI to populate the menu.
+    """
+    return _get_game_gui_data().gui_options
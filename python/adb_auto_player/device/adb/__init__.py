@@ -1,10 +1,17 @@
 from .adb_client import AdbClientHelper
 from .adb_controller import AdbController
+from .device_state_monitor import DeviceStateMonitor
 from .device_stream import DeviceStream, StreamingNotSupportedError
+from .input_dispatcher import InputDispatcher
+from .shell_session import ShellResult, ShellSession
 
 __all__ = [
     "AdbClientHelper",
     "AdbController",
+    "DeviceStateMonitor",
     "DeviceStream",
+    "InputDispatcher",
+    "ShellResult",
+    "ShellSession",
     "StreamingNotSupportedError",
 ]
@@ -1,24 +1,94 @@
 import logging
+import re
+import weakref
 from functools import lru_cache
 from time import sleep
 
 from adb_auto_player.decorators import register_cache
-from adb_auto_player.exceptions import GameStartError, GenericAdbUnrecoverableError
+from adb_auto_player.exceptions import GameStartError, GenericAdbError
 from adb_auto_player.models.decorators import CacheGroup
-from adb_auto_player.models.device import DisplayInfo, Orientation
-from adb_auto_player.models.geometry import Coordinates
+from adb_auto_player.models.device import DeviceSnapshot, DisplayInfo
+from adb_auto_player.models.geometry import Coordinates, PointOutsideDisplay
+from adb_auto_player.util import Metrics
+from adbutils import AdbError
 
 from .adb_device import AdbDeviceWrapper
+from .device_state_monitor import DeviceStateMonitor
+from .evdev_touch_input import EvdevTouchInput
+from .input_dispatcher import InputDispatcher
+from .shell_session import ShellSession
+
+# Failures of the persistent shell, anything else is a bug of the caller.
+_TOUCH_INPUT_ERRORS = (GenericAdbError, AdbError, OSError)
 
 
 class AdbController:
-    """Functions to control an ADB device."""
+    """Functions to control an ADB device.
+
+    Controllers that are not owned by a Game should be used with `with` so their
+    shells and threads are closed.
+    """
 
     d: AdbDeviceWrapper
+    input_dispatcher: InputDispatcher
+    shell_session: ShellSession
+    state_monitor: DeviceStateMonitor
+
+    # Consecutive evdev failures after which `input` is used for good.
+    max_touch_input_failures: int = 3
+    # Controllers of the process whose threads and shells are still open.
+    _open_controllers: "weakref.WeakSet[AdbController]" = weakref.WeakSet()
 
-    def __init__(self):
-        """Init."""
+    def __init__(self, use_evdev_touch_input: bool = True):
+        """Init.
+
+        Args:
+            use_evdev_touch_input: Inject touches via sendevent when the device
+                supports it, `input` is used as fallback.
+        """
         self.d = AdbDeviceWrapper.create_from_settings()
+        self.input_dispatcher = InputDispatcher(name=f"InputDispatcher-{self.d.serial}")
+        self.shell_session = ShellSession(self.d.d)
+        self.state_monitor = DeviceStateMonitor(
+            ShellSession(self.d.d, name="device state monitor"),
+            name=f"DeviceStateMonitor-{self.d.serial}",
+        )
+        self.use_evdev_touch_input = use_evdev_touch_input
+        self._touch_input: EvdevTouchInput | None = None
+        self._touch_input_resolved = False
+        self._touch_input_failures = 0
+        # Touches are mapped with the display info the touch input was created for.
+        self.state_monitor.add_display_listener(self._on_display_change)
+        AdbController._open_controllers.add(self)
+
+    def close(self) -> None:
+        """Stop the background threads and close the shells of the device.
+
+        The controller must not be used afterwards.
+        """
+        AdbController._open_controllers.discard(self)
+        self.state_monitor.stop()
+        self.state_monitor.session.close()
+        self.input_dispatcher.stop()
+        self.shell_session.close()
+        self._reset_touch_input()
+
+    def __enter__(self) -> "AdbController":
+        """Return the controller, it is closed on exit."""
+        return self
+
+    def __exit__(self, *_) -> None:
+        """Close the controller."""
+        self.close()
+
+    @classmethod
+    def close_all(cls) -> None:
+        """Close every controller of the process, e.g. after a command ended."""
+        for controller in list(cls._open_controllers):
+            try:
+                controller.close()
+            except Exception as e:
+                logging.debug(f"Failed to close controller {controller.d.serial}: {e}")
 
     def set_display_size(self, display_size: str) -> None:
         """Set display size.
@@ -27,13 +97,40 @@ class AdbController:
             display_size: format width x height e.g. 1080x1920
         """
         _ = self.d.shell(f"wm size {display_size}")
+        self._invalidate_display()
         logging.info(f"Set Display Size to {display_size} for Device: {self.d.serial}")
 
-    @register_cache(CacheGroup.ADB)
-    @lru_cache(maxsize=1)
-    def get_display_info(self) -> DisplayInfo:
+    def get_snapshot(
+        self, max_age: float | None = None, force_refresh: bool = False
+    ) -> DeviceSnapshot:
+        """Get the device state captured by a single probe.
+
+        Args:
+            max_age: Maximum age of the snapshot in seconds, defaults to the
+                state monitor max_age.
+            force_refresh: Always query the device.
+
+        Raises:
+            GenericAdbUnrecoverableError: Unable to determine screen resolution or
+                orientation.
+
+        Returns:
+            DeviceSnapshot: Snapshot of the state monitor.
+        """
+        return self.state_monitor.get_snapshot(max_age, force_refresh)
+
+    def refresh_snapshot(self) -> DeviceSnapshot:
+        """Probe the device again."""
+        return self.get_snapshot(force_refresh=True)
+
+    def get_display_info(self, max_age: float | None = None) -> DisplayInfo:
         """Get display resolution and orientation.
 
+        Args:
+            max_age: Maximum age of the snapshot in seconds, defaults to the
+                state monitor max_age. Orientation changes are picked up once
+                the snapshot is older.
+
         Raises:
             GenericAdbUnrecoverableError: Unable to determine screen resolution or
                 orientation.
@@ -41,67 +138,47 @@ class AdbController:
         Returns:
             DisplayInfo: Resolution and orientation.
         """
-        result = self.d.shell("wm size")
-        if not result:
-            raise GenericAdbUnrecoverableError("Unable to determine screen resolution")
-
-        # Parse resolution from wm size output
-        lines: list[str] = result.splitlines()
-        override_size = None
-        physical_size = None
-
-        for line in lines:
-            if "Override size:" in line:
-                override_size = line.split("Override size:")[-1].strip()
-                logging.debug(f"Override size: {override_size}")
-            elif "Physical size:" in line:
-                physical_size = line.split("Physical size:")[-1].strip()
-                logging.debug(f"Physical size: {physical_size}")
-
-        resolution_str: str | None = override_size if override_size else physical_size
-
-        if not resolution_str:
-            raise GenericAdbUnrecoverableError(
-                f"Unable to determine screen resolution: {result}"
-            )
+        return self.get_snapshot(max_age).display_info
 
-        try:
-            width_str, height_str = resolution_str.split("x")
-            width, height = int(width_str), int(height_str)
-        except (ValueError, AttributeError):
-            raise GenericAdbUnrecoverableError(
-                f"Invalid resolution format: {resolution_str}"
-            )
-
-        device_orientation = _check_orientation(self.d)
-
-        return DisplayInfo(
-            width=width if Orientation.PORTRAIT == device_orientation else height,
-            height=height if Orientation.PORTRAIT == device_orientation else width,
-            orientation=device_orientation,
-        )
-
-    def get_running_app(self) -> str | None:
+    def get_running_app(
+        self, max_age: float | None = None, force_refresh: bool = False
+    ) -> str | None:
         """Get the currently running app.
 
+        Args:
+            max_age: Maximum age of the cached value in seconds, defaults to the
+                state monitor max_age.
+            force_refresh: Always query the device.
+
         Returns:
             str | None: Currently running app name, or None if unable to determine.
         """
-        app = str(
-            self.d.shell(
-                "dumpsys activity activities | grep ResumedActivity | "
-                'cut -d "{" -f2 | cut -d \' \' -f3 | cut -d "/" -f1',
-            )
-        ).strip()
-        if "\n" in app:
-            app = app.split("\n")[0].strip()
-        if app:
-            return app
+        return self.state_monitor.get_running_app(max_age, force_refresh)
+
+    @register_cache(CacheGroup.ADB)
+    @lru_cache(maxsize=4)
+    def get_app_version(self, package_name: str) -> str | None:
+        """Get the installed version of an app.
+
+        Args:
+            package_name: Package name of the app.
+
+        Returns:
+            str | None: versionName, or None if unable to determine.
+        """
+        try:
+            output = self.shell_session.run(f"dumpsys package {package_name}")
+        except Exception as e:
+            logging.debug(f"Failed to get version of {package_name}: {e}")
+            return None
+        if match := re.search(r"versionName=(\S+)", output):
+            return match.group(1)
         return None
 
     def reset_display_size(self) -> None:
         """Resets the display size of the device to its original size."""
         self.d.shell("wm size reset")
+        self._invalidate_display()
         logging.info(f"Reset Display Size for Device: {self.d.serial}")
 
     def screenshot(self) -> str | bytes:
@@ -111,6 +188,7 @@ class AdbController:
     def stop_game(self, package_name: str) -> None:
         """Stop game."""
         self.d.shell(["am", "force-stop", package_name])
+        self.state_monitor.invalidate()
         sleep(5)
 
     def start_game(self, package_name: str) -> None:
@@ -128,6 +206,7 @@ class AdbController:
         if "No activities found to run" in output:
             logging.debug(f"start_game: {output}")
             raise GameStartError("Game cannot be started")
+        self.state_monitor.invalidate()
         sleep(15)
 
     @property
@@ -143,10 +222,26 @@ class AdbController:
     ) -> None:
         """Tap the screen on the given coordinates.
 
+        Points outside of the display are skipped with a warning, except
+        PointOutsideDisplay which is tapped to measure the input delay.
+
         Args:
             coordinates (Coordinates): Point to click on.
         """
-        self.d.tap(str(coordinates.x), str(coordinates.y))
+        if not isinstance(coordinates, PointOutsideDisplay) and not self._is_on_display(
+            "Tap", coordinates
+        ):
+            return
+        if touch_input := self._get_touch_input():
+            try:
+                with Metrics.timer("tap_seconds", input="evdev"):
+                    touch_input.tap(coordinates)
+                self._touch_input_failures = 0
+                return
+            except _TOUCH_INPUT_ERRORS as e:
+                self._disable_touch_input(e)
+        with Metrics.timer("tap_seconds", input="adb"):
+            self.d.tap(str(coordinates.x), str(coordinates.y))
 
     def click(
         self,
@@ -171,11 +266,23 @@ class AdbController:
     ) -> None:
         """Swipes the screen.
 
+        Swipes starting or ending outside of the display are skipped with a
+        warning.
+
         Args:
             start_point: Start Point on the screen.
             end_point: End Point on the screen.
             duration: Swipe duration in seconds. Defaults to 1.0.
         """
+        if not self._is_on_display("Swipe", start_point, end_point):
+            return
+        if touch_input := self._get_touch_input():
+            try:
+                touch_input.swipe(start_point, end_point, duration)
+                self._touch_input_failures = 0
+                return
+            except _TOUCH_INPUT_ERRORS as e:
+                self._disable_touch_input(e)
         self.d.swipe(
             str(start_point.x),
             str(start_point.y),
@@ -189,83 +296,83 @@ class AdbController:
         coordinates: Coordinates,
         duration: float = 1.0,
     ) -> None:
-        """Hold the screen on the given coordinates."""
-        self.swipe(
-            start_point=coordinates,
-            end_point=coordinates,
-            duration=duration,
-        )
-
-    @property
-    @register_cache(CacheGroup.ADB)
-    @lru_cache(maxsize=1)
-    def is_controlling_emulator(self):
-        """Whether the controlled device is an emulator or not."""
-        result = str(self.d.shell('getprop | grep "Build"'))
-        if "Build" in result:
-            return True
-        logging.debug('getprop does not contain "Build" assuming Phone')
-        return False
-
+        """Hold the screen on the given coordinates.
 
-def _check_orientation(d: AdbDeviceWrapper) -> Orientation:
-    """Check device orientation using multiple fallback methods.
-
-    Tries different orientation detection methods in order of reliability,
-    returning as soon as a definitive result is found. Portrait orientation
-    corresponds to rotation 0, while landscape corresponds to rotations 1 and 3.
+        Points outside of the display are skipped with a warning.
+        """
+        if not self._is_on_display("Hold", coordinates):
+            return
+        if touch_input := self._get_touch_input():
+            try:
+                touch_input.hold(coordinates, duration)
+                self._touch_input_failures = 0
+                return
+            except _TOUCH_INPUT_ERRORS as e:
+                self._disable_touch_input(e)
+        self.d.swipe(
+            str(coordinates.x),
+            str(coordinates.y),
+            str(coordinates.x),
+            str(coordinates.y),
+            str(int(duration * 1000)),
+        )
 
-    Args:
-        d (AdbDevice): ADB device.
+    def _is_on_display(self, action: str, *points: Coordinates) -> bool:
+        display_info = self.get_display_info()
+        for point in points:
+            if not (
+                0 <= point.x < display_info.width and 0 <= point.y < display_info.height
+            ):
+                logging.warning(
+                    f"{action} on {point} is outside of the display {display_info}, "
+                    "skipping"
+                )
+                return False
+        return True
+
+    def _get_touch_input(self) -> EvdevTouchInput | None:
+        """Resolve the evdev touch input, None if unsupported or disabled."""
+        if (
+            not self.use_evdev_touch_input
+            or self._touch_input_failures >= self.max_touch_input_failures
+        ):
+            return None
+        if not self._touch_input_resolved:
+            self._touch_input_resolved = True
+            if self._touch_input:
+                self._touch_input.close()
+            self._touch_input = EvdevTouchInput.create(self.d, self.get_display_info())
+        return self._touch_input
+
+    def _invalidate_display(self) -> None:
+        """Drop everything derived from the previous display size."""
+        self.state_monitor.invalidate()
+        self._reset_touch_input()
+
+    def _reset_touch_input(self) -> None:
+        if self._touch_input:
+            self._touch_input.close()
+        self._touch_input = None
+        self._touch_input_resolved = False
+
+    def _on_display_change(self, display_info: DisplayInfo) -> None:
+        """Resolve the touch input again for the new resolution or orientation.
+
+        Called from the monitor thread, the touch input may be in use. It is
+        replaced on the next touch.
+        """
+        self._touch_input_resolved = False
 
-    Returns:
-        Orientation: Device orientation (PORTRAIT or LANDSCAPE).
+    def _disable_touch_input(self, error: Exception) -> None:
+        self._touch_input_failures += 1
+        logging.debug(
+            f"evdev touch input failed ({self._touch_input_failures}/"
+            f"{self.max_touch_input_failures}), falling back to input: {error}"
+        )
+        # The shell may only have dropped, the next touch opens a new one.
+        self._reset_touch_input()
 
-    Raises:
-        GenericAdbUnrecoverableError: If unable to perform any orientation checks.
-    """
-    # Check 1: SurfaceOrientation (most reliable)
-    try:
-        orientation_check = str(
-            d.shell("dumpsys input | grep 'SurfaceOrientation'")
-        ).strip()
-        if orientation_check:
-            if "Orientation: 0" in orientation_check:
-                return Orientation.PORTRAIT
-            elif any(
-                x in orientation_check for x in ["Orientation: 1", "Orientation: 3"]
-            ):
-                return Orientation.LANDSCAPE
-        logging.debug(f"orientation_check: {orientation_check}")
-    except Exception as e:
-        logging.debug(f"SurfaceOrientation check failed: {e}")
-
-    # Check 2: Current rotation (fallback)
-    try:
-        rotation_check = str(
-            d.shell_unsafe("dumpsys window | grep mCurrentRotation")
-        ).strip()
-        if rotation_check:
-            if "ROTATION_0" in rotation_check:
-                return Orientation.PORTRAIT
-            elif any(x in rotation_check for x in ["ROTATION_90", "ROTATION_270"]):
-                return Orientation.LANDSCAPE
-        logging.debug(f"rotation_check: {rotation_check}")
-    except Exception as e:
-        logging.debug(f"Rotation check failed: {e}")
-
-    # Check 3: Display orientation (last resort)
-    try:
-        display_check = str(
-            d.shell_unsafe("dumpsys display | grep -E 'orientation'")
-        ).strip()
-        if display_check:
-            if "orientation=0" in display_check:
-                return Orientation.PORTRAIT
-            elif any(x in display_check for x in ["orientation=1", "orientation=3"]):
-                return Orientation.LANDSCAPE
-        logging.debug(f"display_check: {display_check}")
-    except Exception as e:
-        logging.debug(f"Display orientation check failed: {e}")
-
-    raise GenericAdbUnrecoverableError("Unable to determine device orientation")
+    @property
+    def is_controlling_emulator(self) -> bool:
+        """Whether the controlled device is an emulator or not."""
+        return self.get_snapshot().is_emulator
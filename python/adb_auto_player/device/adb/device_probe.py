@@ -0,0 +1,220 @@
+"""ADB Auto Player Device Probe Module.
+
+Resolving display size, orientation, emulator detection and the running app used
+to take one shell round trip each, some of them more than once. The probe runs all
+of them in a single shell invocation and splits the output by section markers.
+"""
+
+import logging
+from collections.abc import Iterable
+
+from adb_auto_player.exceptions import GenericAdbUnrecoverableError
+from adb_auto_player.models.device import DeviceSnapshot, DisplayInfo, Orientation
+
+from .shell_session import ShellSession
+
+RUNNING_APP_COMMAND = (
+    "dumpsys activity activities | grep ResumedActivity | "
+    'cut -d "{" -f2 | cut -d \' \' -f3 | cut -d "/" -f1'
+)
+
+_SECTION_MARKER = "__ADB_AUTO_PLAYER_PROBE__"
+# Ordered, orientation checks are listed by reliability.
+PROBE_SECTIONS: dict[str, str] = {
+    "wm_size": "wm size",
+    "surface_orientation": "dumpsys input | grep 'SurfaceOrientation'",
+    "current_rotation": "dumpsys window | grep mCurrentRotation",
+    "display_orientation": "dumpsys display | grep -E 'orientation'",
+    "build_props": 'getprop | grep "Build"',
+    "running_app": RUNNING_APP_COMMAND,
+}
+
+
+def build_probe_script(names: Iterable[str] = PROBE_SECTIONS) -> str:
+    """Build the shell script running the given probe sections.
+
+    Args:
+        names: Names of the sections in PROBE_SECTIONS, defaults to all.
+
+    Returns:
+        str: Shell script.
+    """
+    return "; ".join(
+        f"echo {_SECTION_MARKER} {name}; {PROBE_SECTIONS[name]}" for name in names
+    )
+
+
+def split_probe_output(output: str) -> dict[str, str]:
+    """Split the output of the probe script into its sections.
+
+    Args:
+        output: Output of the probe script.
+
+    Returns:
+        dict[str, str]: Stripped output per section name.
+    """
+    sections: dict[str, list[str]] = {}
+    current: list[str] | None = None
+    for line in output.splitlines():
+        if line.startswith(_SECTION_MARKER):
+            current = sections.setdefault(line[len(_SECTION_MARKER) :].strip(), [])
+            continue
+        if current is not None:
+            current.append(line)
+    return {name: "\n".join(lines).strip() for name, lines in sections.items()}
+
+
+def parse_display_size(wm_size_output: str) -> tuple[int, int]:
+    """Parse the output of `wm size`, override size takes precedence.
+
+    Raises:
+        GenericAdbUnrecoverableError: Unable to determine screen resolution.
+
+    Returns:
+        tuple[int, int]: Width and height in the natural orientation.
+    """
+    if not wm_size_output:
+        raise GenericAdbUnrecoverableError("Unable to determine screen resolution")
+
+    override_size = None
+    physical_size = None
+    for line in wm_size_output.splitlines():
+        if "Override size:" in line:
+            override_size = line.split("Override size:")[-1].strip()
+            logging.debug(f"Override size: {override_size}")
+        elif "Physical size:" in line:
+            physical_size = line.split("Physical size:")[-1].strip()
+            logging.debug(f"Physical size: {physical_size}")
+
+    resolution_str: str | None = override_size if override_size else physical_size
+
+    if not resolution_str:
+        raise GenericAdbUnrecoverableError(
+            f"Unable to determine screen resolution: {wm_size_output}"
+        )
+
+    try:
+        width_str, height_str = resolution_str.split("x")
+        return int(width_str), int(height_str)
+    except (ValueError, AttributeError):
+        raise GenericAdbUnrecoverableError(
+            f"Invalid resolution format: {resolution_str}"
+        )
+
+
+def parse_orientation(sections: dict[str, str]) -> Orientation:
+    """Determine the orientation from the probe sections.
+
+    Checks are evaluated in order of reliability, returning as soon as a
+    definitive result is found. Portrait orientation corresponds to rotation 0,
+    while landscape corresponds to rotations 1 and 3.
+
+    Raises:
+        GenericAdbUnrecoverableError: If none of the checks is conclusive.
+
+    Returns:
+        Orientation: Device orientation (PORTRAIT or LANDSCAPE).
+    """
+    # Check 1: SurfaceOrientation (most reliable)
+    orientation_check = sections.get("surface_orientation", "")
+    if orientation_check:
+        if "Orientation: 0" in orientation_check:
+            return Orientation.PORTRAIT
+        elif any(x in orientation_check for x in ["Orientation: 1", "Orientation: 3"]):
+            return Orientation.LANDSCAPE
+    logging.debug(f"orientation_check: {orientation_check}")
+
+    # Check 2: Current rotation (fallback)
+    rotation_check = sections.get("current_rotation", "")
+    if rotation_check:
+        if "ROTATION_0" in rotation_check:
+            return Orientation.PORTRAIT
+        elif any(x in rotation_check for x in ["ROTATION_90", "ROTATION_270"]):
+            return Orientation.LANDSCAPE
+    logging.debug(f"rotation_check: {rotation_check}")
+
+    # Check 3: Display orientation (last resort)
+    display_check = sections.get("display_orientation", "")
+    if display_check:
+        if "orientation=0" in display_check:
+            return Orientation.PORTRAIT
+        elif any(x in display_check for x in ["orientation=1", "orientation=3"]):
+            return Orientation.LANDSCAPE
+    logging.debug(f"display_check: {display_check}")
+
+    raise GenericAdbUnrecoverableError("Unable to determine device orientation")
+
+
+def parse_running_app(output: str) -> str | None:
+    """Parse the output of RUNNING_APP_COMMAND.
+
+    Returns:
+        str | None: Package name of the resumed activity or None.
+    """
+    app = output.strip()
+    if "\n" in app:
+        app = app.split("\n")[0].strip()
+    return app or None
+
+
+def parse_is_emulator(build_props: str) -> bool:
+    """Emulators expose Build properties, phones do not."""
+    if "Build" in build_props:
+        return True
+    logging.debug('getprop does not contain "Build" assuming Phone')
+    return False
+
+
+def build_display_info(sections: dict[str, str]) -> DisplayInfo:
+    """Build DisplayInfo from the wm size and orientation sections.
+
+    Raises:
+        GenericAdbUnrecoverableError: Unable to determine screen resolution or
+            orientation.
+
+    Returns:
+        DisplayInfo: Resolution and orientation.
+    """
+    width, height = parse_display_size(sections.get("wm_size", ""))
+    orientation = parse_orientation(sections)
+
+    return DisplayInfo(
+        width=width if Orientation.PORTRAIT == orientation else height,
+        height=height if Orientation.PORTRAIT == orientation else width,
+        orientation=orientation,
+    )
+
+
+def snapshot_from_sections(sections: dict[str, str]) -> DeviceSnapshot:
+    """Build a DeviceSnapshot from the output of every probe section.
+
+    Raises:
+        GenericAdbUnrecoverableError: Unable to determine screen resolution or
+            orientation.
+
+    Returns:
+        DeviceSnapshot: Device state.
+    """
+    snapshot = DeviceSnapshot(
+        display_info=build_display_info(sections),
+        running_app=parse_running_app(sections.get("running_app", "")),
+        is_emulator=parse_is_emulator(sections.get("build_props", "")),
+    )
+    logging.debug(f"{snapshot}")
+    return snapshot
+
+
+def probe_device(session: ShellSession) -> DeviceSnapshot:
+    """Capture a DeviceSnapshot in a single shell round trip.
+
+    Args:
+        session: Shell session of the device.
+
+    Raises:
+        GenericAdbUnrecoverableError: Unable to determine screen resolution or
+            orientation.
+
+    Returns:
+        DeviceSnapshot: Current device state.
+    """
+    return snapshot_from_sections(split_probe_output(session.run(build_probe_script())))
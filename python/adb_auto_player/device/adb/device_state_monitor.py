@@ -0,0 +1,258 @@
+"""ADB Auto Player Device State Monitor Module."""
+
+import logging
+import threading
+import time
+from collections.abc import Callable
+
+from adb_auto_player.exceptions import GenericAdbUnrecoverableError
+from adb_auto_player.models.device import DeviceSnapshot, DisplayInfo
+
+from .device_probe import (
+    RUNNING_APP_COMMAND,
+    build_display_info,
+    build_probe_script,
+    parse_running_app,
+    snapshot_from_sections,
+    split_probe_output,
+)
+from .shell_session import ShellSession
+
+# Polled in the background, emulator detection does not change and the heavier
+# fallback orientation checks are only needed if SurfaceOrientation is missing.
+MONITOR_SECTIONS = ("wm_size", "surface_orientation", "running_app")
+
+
+class DeviceStateMonitor:
+    """Tracks foreground app, orientation and screen size of a device.
+
+    Hot loops checking whether the game is still running used to pay a shell
+    pipeline per check. The monitor keeps the latest DeviceSnapshot, refreshed at a
+    low frequency by a background thread once started, accessors only query the
+    device when the cached snapshot is older than the requested freshness bound.
+    """
+
+    default_interval: float = 5.0
+    default_max_age: float = 10.0
+
+    def __init__(
+        self,
+        session: ShellSession,
+        interval: float = default_interval,
+        max_age: float = default_max_age,
+        name: str = "DeviceStateMonitor",
+    ):
+        """Init.
+
+        Args:
+            session: Shell session used for queries, should not be shared so
+                polling does not delay other callers.
+            interval: Seconds between two background refreshes.
+            max_age: Default freshness bound of accessors in seconds.
+            name: Name of the background thread.
+        """
+        self.session = session
+        self.interval = interval
+        self.max_age = max_age
+        self._name = name
+        self._snapshot: DeviceSnapshot | None = None
+        # Running app and when it was queried on its own, see get_running_app.
+        self._running_app: tuple[str | None, float] | None = None
+        self._stale = False
+        # SurfaceOrientation is inconclusive on this device.
+        self._needs_full_probe = False
+        self._refresh_lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._worker: threading.Thread | None = None
+        self._display_listeners: list[Callable[[DisplayInfo], None]] = []
+
+    def add_display_listener(self, listener: Callable[[DisplayInfo], None]) -> None:
+        """Call listener with the new DisplayInfo when the display changes.
+
+        Lets owners drop values derived from the previous resolution or orientation.
+        """
+        self._display_listeners.append(listener)
+
+    def start(self) -> None:
+        """Start refreshing in the background, does nothing if already running."""
+        if self._worker and self._worker.is_alive():
+            return
+        self._stop_event.clear()
+        self._worker = threading.Thread(target=self._run, name=self._name, daemon=True)
+        self._worker.start()
+
+    def stop(self) -> None:
+        """Stop the background thread."""
+        self._stop_event.set()
+        worker = self._worker
+        self._worker = None
+        if worker and worker is not threading.current_thread():
+            worker.join()
+
+    def update(self, snapshot: DeviceSnapshot) -> None:
+        """Replace the cached snapshot with one captured elsewhere."""
+        with self._refresh_lock:
+            self._set_snapshot(snapshot)
+
+    def invalidate(self) -> None:
+        """Force the next accessor call to query the device."""
+        self._stale = True
+        self._running_app = None
+
+    def get_snapshot(
+        self, max_age: float | None = None, force_refresh: bool = False
+    ) -> DeviceSnapshot:
+        """Get the device state.
+
+        Args:
+            max_age: Maximum age of the cached snapshot in seconds, defaults to
+                the monitor max_age.
+            force_refresh: Always query the device.
+
+        Raises:
+            GenericAdbUnrecoverableError: Unable to determine screen resolution or
+                orientation.
+
+        Returns:
+            DeviceSnapshot: Snapshot satisfying the freshness bound.
+        """
+        max_age = self.max_age if max_age is None else max_age
+        requested_at = time.monotonic()
+
+        snapshot = self._snapshot
+        if not force_refresh and self._is_fresh(snapshot, max_age):
+            return snapshot  # type: ignore[return-value]
+
+        with self._refresh_lock:
+            snapshot = self._snapshot
+            # Another caller or the background thread refreshed while waiting.
+            if snapshot is not None and not self._stale:
+                if snapshot.captured_at >= requested_at:
+                    return snapshot
+                if not force_refresh and snapshot.age <= max_age:
+                    return snapshot
+            return self._refresh(self.session.run)
+
+    def get_running_app(
+        self, max_age: float | None = None, force_refresh: bool = False
+    ) -> str | None:
+        """Get the foreground app.
+
+        Without a fresh snapshot only RUNNING_APP_COMMAND runs, display size and
+        orientation are not queried and their errors do not affect app detection.
+
+        Args:
+            max_age: Maximum age of the cached value in seconds, defaults to the
+                monitor max_age.
+            force_refresh: Always query the device.
+
+        Returns:
+            str | None: Package name of the foreground app.
+        """
+        max_age = self.max_age if max_age is None else max_age
+        requested_at = time.monotonic()
+
+        cached = self._latest_running_app()
+        if not force_refresh and cached and time.monotonic() - cached[1] <= max_age:
+            return cached[0]
+
+        with self._refresh_lock:
+            cached = self._latest_running_app()
+            if cached and (
+                cached[1] >= requested_at
+                or (not force_refresh and time.monotonic() - cached[1] <= max_age)
+            ):
+                return cached[0]
+            captured_at = time.monotonic()
+            running_app = parse_running_app(self.session.run(RUNNING_APP_COMMAND))
+            self._running_app = (running_app, captured_at)
+            return running_app
+
+    def _latest_running_app(self) -> tuple[str | None, float] | None:
+        """Most recently captured running app and when, None if invalidated."""
+        candidates = []
+        snapshot = self._snapshot
+        if snapshot is not None and not self._stale:
+            candidates.append((snapshot.running_app, snapshot.captured_at))
+        if self._running_app is not None:
+            candidates.append(self._running_app)
+        return max(candidates, key=lambda candidate: candidate[1], default=None)
+
+    def _is_fresh(self, snapshot: DeviceSnapshot | None, max_age: float) -> bool:
+        return snapshot is not None and not self._stale and snapshot.age <= max_age
+
+    def _run(self) -> None:
+        while not self._stop_event.wait(self.interval):
+            snapshot = self._snapshot
+            if snapshot is None or self._is_fresh(snapshot, self.interval / 2):
+                # Nothing to compare against yet or refreshed by a caller.
+                continue
+            try:
+                with self._refresh_lock:
+                    # Without retry, restarting the ADB server from a background
+                    # thread would break the device stream of the main thread.
+                    self._refresh(self.session.run_unsafe, full=False)
+            except Exception as e:
+                logging.debug(f"{self._name} refresh failed: {e}")
+
+    def _refresh(self, run: Callable[[str], str], full: bool = True) -> DeviceSnapshot:
+        """Query the device and replace the snapshot.
+
+        Only background polling of a valid snapshot uses the MONITOR_SECTIONS.
+        When those are inconclusive the full probe with every orientation
+        fallback runs instead, its errors are raised.
+        """
+        previous = self._snapshot
+        snapshot = None
+        if (
+            not full
+            and previous is not None
+            and not self._stale
+            and not self._needs_full_probe
+        ):
+            snapshot = self._query(run, previous)
+        if snapshot is None:
+            snapshot = snapshot_from_sections(
+                split_probe_output(run(build_probe_script()))
+            )
+        self._set_snapshot(snapshot)
+        return snapshot
+
+    def _query(
+        self, run: Callable[[str], str], previous: DeviceSnapshot
+    ) -> DeviceSnapshot | None:
+        sections = split_probe_output(run(build_probe_script(MONITOR_SECTIONS)))
+        try:
+            display_info = build_display_info(sections)
+        except GenericAdbUnrecoverableError as e:
+            logging.debug(f"{self._name} polling with the full probe: {e}")
+            self._needs_full_probe = True
+            return None
+
+        return DeviceSnapshot(
+            display_info=display_info,
+            running_app=parse_running_app(sections.get("running_app", "")),
+            is_emulator=previous.is_emulator,
+        )
+
+    def _set_snapshot(self, snapshot: DeviceSnapshot) -> None:
+        previous = self._snapshot
+        if previous is not None:
+            if previous.running_app != snapshot.running_app:
+                logging.debug(
+                    f"Foreground app changed: {previous.running_app} -> "
+                    f"{snapshot.running_app}"
+                )
+            if previous.display_info != snapshot.display_info:
+                logging.debug(
+                    f"Display changed: {previous.display_info} -> "
+                    f"{snapshot.display_info}"
+                )
+        self._snapshot = snapshot
+        self._stale = False
+        if previous is not None and previous.display_info != snapshot.display_info:
+            for listener in self._display_listeners:
+                try:
+                    listener(snapshot.display_info)
+                except Exception as e:
+                    logging.debug(f"{self._name} display listener failed: {e}")
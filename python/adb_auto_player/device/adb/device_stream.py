@@ -4,12 +4,16 @@ import logging
 import platform
 import threading
 import time
+import weakref
 from functools import lru_cache
 
 import av
 import numpy as np
 from adb_auto_player.exceptions import AutoPlayerWarningError
+from adb_auto_player.image_manipulation import ColorFormat, PreviewPublisher
+from adb_auto_player.ipc import StreamStats
 from adb_auto_player.settings import ConfigLoader
+from adb_auto_player.util import Metrics
 from adbutils import AdbConnection
 from av.codec.codec import UnknownCodecError
 from av.codec.context import CodecContext
@@ -72,6 +76,9 @@ class StreamingNotSupportedError(AutoPlayerWarningError):
 class DeviceStream:
     """Device screen streaming."""
 
+    # Started streams of the process, see running_streams.
+    _running_streams: "weakref.WeakSet[DeviceStream]" = weakref.WeakSet()
+
     def __init__(self, controller: AdbController, fps: int | None = None):
         """Initialize the screen stream.
 
@@ -98,7 +105,15 @@ class DeviceStream:
         self.controller = controller
         self.fps = fps
         self.latest_frame: np.ndarray | None = None
+        # Increases with every decoded frame so consumers can wait for new ones.
+        self.frame_number = 0
         self._frame_lock = threading.Lock()
+        self._new_frame = threading.Condition(self._frame_lock)
+        # Number of the latest frame handed out to a consumer.
+        self._read_frame_number = 0
+        self._dropped_frames = 0
+        self._stats_frame_number = 0
+        self._stats_time = time.monotonic()
         self._running = False
         self._stream_thread: threading.Thread | None = None
         self._process: AdbConnection | None = None
@@ -109,6 +124,7 @@ class DeviceStream:
             return
 
         self._running = True
+        DeviceStream._running_streams.add(self)
         self._stream_thread = threading.Thread(target=self._stream_screen)
         self._stream_thread.daemon = True
         self._stream_thread.start()
@@ -116,6 +132,7 @@ class DeviceStream:
     def stop(self) -> None:
         """Stop the screen streaming thread."""
         self._running = False
+        DeviceStream._running_streams.discard(self)
         if self._process:
             try:
                 self._process.close()
@@ -131,12 +148,61 @@ class DeviceStream:
         # Clear the latest frame
         with self._frame_lock:
             self.latest_frame = None
+            self._new_frame.notify_all()
 
     def get_latest_frame(self) -> np.ndarray | None:
         """Get the most recent frame from the stream."""
         with self._frame_lock:
+            self._read_frame_number = self.frame_number
             return self.latest_frame
 
+    def wait_for_frame(
+        self, after: int = 0, timeout: float | None = None
+    ) -> tuple[int, np.ndarray] | None:
+        """Wait for a frame newer than the given frame number.
+
+        Args:
+            after: Frame number of the last frame the caller has seen.
+            timeout: Seconds to wait, None waits until the stream stops.
+
+        Returns:
+            tuple[int, np.ndarray] | None: Frame number and frame, None on timeout
+                or if the stream stopped.
+        """
+        with self._new_frame:
+            self._new_frame.wait_for(
+                lambda: self.frame_number > after or not self._running,
+                timeout=timeout,
+            )
+            if self.latest_frame is None or self.frame_number <= after:
+                return None
+            self._read_frame_number = self.frame_number
+            return self.frame_number, self.latest_frame
+
+    def stats(self) -> StreamStats:
+        """Get the throughput since the previous call."""
+        now = time.monotonic()
+        with self._frame_lock:
+            frame_number = self.frame_number
+            dropped_frames = self._dropped_frames
+            frames = frame_number - self._stats_frame_number
+            elapsed = now - self._stats_time
+            self._stats_frame_number = frame_number
+            self._dropped_frames = 0
+            self._stats_time = now
+        return StreamStats(
+            device=str(self.controller.d.serial),
+            fps=round(frames / elapsed, 1) if elapsed > 0 else 0.0,
+            target_fps=self.fps,
+            frames_total=frame_number,
+            dropped_frames=dropped_frames,
+        )
+
+    @classmethod
+    def running_streams(cls) -> list["DeviceStream"]:
+        """Streams of the process that are started and not stopped."""
+        return list(cls._running_streams)
+
     def _handle_stream(self) -> None:
         """Generic stream handler."""
         self._process = self.controller.d.shell(
@@ -162,7 +228,13 @@ class DeviceStream:
                     for frame in frames:
                         ndarray = frame.to_ndarray(format="rgb24")
                         with self._frame_lock:
+                            if self.frame_number > self._read_frame_number:
+                                self._dropped_frames += 1
                             self.latest_frame = ndarray
+                            self.frame_number += 1
+                            self._new_frame.notify_all()
+                        PreviewPublisher.offer(ndarray, ColorFormat.RGB)
+                        Metrics.increment("stream_frames_total")
 
                 buffer = b""
 
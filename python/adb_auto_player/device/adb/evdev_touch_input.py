@@ -0,0 +1,333 @@
+"""ADB Auto Player Evdev Touch Input Module.
+
+`input tap` starts an app_process/JVM on the device for every single tap which
+costs tens to hundreds of milliseconds. Writing the raw touch events with
+`sendevent` to the touchscreen's evdev device skips that entirely.
+"""
+
+import logging
+import re
+from functools import lru_cache
+
+from adb_auto_player.exceptions import GenericAdbError
+from adb_auto_player.models.device import DisplayInfo, TouchscreenDevice
+from adb_auto_player.models.geometry import Coordinates, PointOutsideDisplay
+
+from .adb_device import AdbDeviceWrapper
+from .shell_session import ShellSession
+
+# linux/input-event-codes.h
+EV_SYN = 0x00
+EV_KEY = 0x01
+EV_ABS = 0x03
+SYN_REPORT = 0x00
+BTN_TOUCH = 0x14A
+ABS_MT_SLOT = 0x2F
+ABS_MT_TOUCH_MAJOR = 0x30
+ABS_MT_POSITION_X = 0x35
+ABS_MT_POSITION_Y = 0x36
+ABS_MT_TRACKING_ID = 0x39
+ABS_MT_PRESSURE = 0x3A
+
+_TRACKING_ID = 1
+_PRESSURE = 50
+_TOUCH_MAJOR = 5
+# Interval between two move events of a swipe, roughly one frame at 60 Hz.
+_SWIPE_STEP_SECONDS = 1 / 60
+
+_DEVICE_PATTERN = re.compile(r"^add device \d+: (\S+)")
+_NAME_PATTERN = re.compile(r'^\s*name:\s*"(.*)"')
+_AXIS_PATTERN = re.compile(
+    r"(ABS_MT_\w+)\s*:\s*value\s+-?\d+,\s*min\s+(-?\d+),\s*max\s+(-?\d+)"
+)
+
+
+def parse_touchscreen(getevent_output: str) -> TouchscreenDevice | None:
+    """Find the touchscreen in the output of `getevent -pl`.
+
+    Only multi-touch protocol B devices (with ABS_MT_TRACKING_ID) are supported,
+    direct input devices (touchscreens rather than touchpads) are preferred.
+
+    Args:
+        getevent_output: Output of `getevent -pl`.
+
+    Returns:
+        TouchscreenDevice | None: The touchscreen or None if none was found.
+    """
+    candidates: list[tuple[bool, TouchscreenDevice]] = []
+
+    for block in re.split(r"(?m)^(?=add device)", getevent_output):
+        lines = block.splitlines()
+        if not lines or not (device_match := _DEVICE_PATTERN.match(lines[0])):
+            continue
+
+        name = ""
+        axes: dict[str, tuple[int, int]] = {}
+        for line in lines:
+            if name_match := _NAME_PATTERN.match(line):
+                name = name_match.group(1)
+            if axis_match := _AXIS_PATTERN.search(line):
+                axes[axis_match.group(1)] = (
+                    int(axis_match.group(2)),
+                    int(axis_match.group(3)),
+                )
+
+        if not all(
+            axis in axes
+            for axis in (
+                "ABS_MT_POSITION_X",
+                "ABS_MT_POSITION_Y",
+                "ABS_MT_TRACKING_ID",
+            )
+        ):
+            continue
+
+        x_min, x_max = axes["ABS_MT_POSITION_X"]
+        y_min, y_max = axes["ABS_MT_POSITION_Y"]
+        if x_max <= x_min or y_max <= y_min:
+            continue
+
+        candidates.append(
+            (
+                "INPUT_PROP_DIRECT" in block,
+                TouchscreenDevice(
+                    path=device_match.group(1),
+                    name=name,
+                    x_min=x_min,
+                    x_max=x_max,
+                    y_min=y_min,
+                    y_max=y_max,
+                    has_slot="ABS_MT_SLOT" in axes,
+                    has_pressure="ABS_MT_PRESSURE" in axes,
+                    has_touch_major="ABS_MT_TOUCH_MAJOR" in axes,
+                    has_btn_touch="BTN_TOUCH" in block,
+                ),
+            )
+        )
+
+    if not candidates:
+        return None
+
+    # stable sort, first direct input device wins
+    candidates.sort(key=lambda candidate: not candidate[0])
+    return candidates[0][1]
+
+
+def _sendevent(touchscreen: TouchscreenDevice, ev_type: int, code: int, value: int):
+    return f"sendevent {touchscreen.path} {ev_type} {code} {value}"
+
+
+def _touch_down_events(touchscreen: TouchscreenDevice, x: int, y: int) -> list[str]:
+    events = []
+    if touchscreen.has_slot:
+        events.append(_sendevent(touchscreen, EV_ABS, ABS_MT_SLOT, 0))
+    events += [
+        _sendevent(touchscreen, EV_ABS, ABS_MT_TRACKING_ID, _TRACKING_ID),
+        _sendevent(touchscreen, EV_ABS, ABS_MT_POSITION_X, x),
+        _sendevent(touchscreen, EV_ABS, ABS_MT_POSITION_Y, y),
+    ]
+    if touchscreen.has_touch_major:
+        events.append(_sendevent(touchscreen, EV_ABS, ABS_MT_TOUCH_MAJOR, _TOUCH_MAJOR))
+    if touchscreen.has_pressure:
+        events.append(_sendevent(touchscreen, EV_ABS, ABS_MT_PRESSURE, _PRESSURE))
+    if touchscreen.has_btn_touch:
+        events.append(_sendevent(touchscreen, EV_KEY, BTN_TOUCH, 1))
+    events.append(_sendevent(touchscreen, EV_SYN, SYN_REPORT, 0))
+    return events
+
+
+def _touch_move_events(touchscreen: TouchscreenDevice, x: int, y: int) -> list[str]:
+    return [
+        _sendevent(touchscreen, EV_ABS, ABS_MT_POSITION_X, x),
+        _sendevent(touchscreen, EV_ABS, ABS_MT_POSITION_Y, y),
+        _sendevent(touchscreen, EV_SYN, SYN_REPORT, 0),
+    ]
+
+
+def _touch_up_events(touchscreen: TouchscreenDevice) -> list[str]:
+    events = [_sendevent(touchscreen, EV_ABS, ABS_MT_TRACKING_ID, -1)]
+    if touchscreen.has_btn_touch:
+        events.append(_sendevent(touchscreen, EV_KEY, BTN_TOUCH, 0))
+    events.append(_sendevent(touchscreen, EV_SYN, SYN_REPORT, 0))
+    return events
+
+
+@lru_cache(maxsize=256)
+def build_tap_script(touchscreen: TouchscreenDevice, x: int, y: int) -> str:
+    """Build the shell script for a tap, coordinates are touchscreen coordinates."""
+    return " && ".join(
+        _touch_down_events(touchscreen, x, y) + _touch_up_events(touchscreen)
+    )
+
+
+def build_hold_script(
+    touchscreen: TouchscreenDevice, x: int, y: int, duration: float
+) -> str:
+    """Build the shell script for a hold, coordinates are touchscreen coordinates."""
+    return " && ".join(
+        [
+            *_touch_down_events(touchscreen, x, y),
+            f"sleep {duration:.3f}",
+            *_touch_up_events(touchscreen),
+        ]
+    )
+
+
+def build_swipe_script(
+    touchscreen: TouchscreenDevice,
+    start: tuple[int, int],
+    end: tuple[int, int],
+    duration: float,
+) -> str:
+    """Build the shell script for a swipe, coordinates are touchscreen coordinates."""
+    steps = max(1, round(duration / _SWIPE_STEP_SECONDS))
+    step_sleep = f"sleep {duration / steps:.3f}"
+    sx, sy = start
+    ex, ey = end
+
+    events = _touch_down_events(touchscreen, sx, sy)
+    for step in range(1, steps + 1):
+        events.append(step_sleep)
+        events += _touch_move_events(
+            touchscreen,
+            sx + (ex - sx) * step // steps,
+            sy + (ey - sy) * step // steps,
+        )
+    events += _touch_up_events(touchscreen)
+    return " && ".join(events)
+
+
+class EvdevTouchInput:
+    """Injects touch events via sendevent over a single persistent shell."""
+
+    default_timeout: float = 3.0
+
+    def __init__(
+        self,
+        session: ShellSession,
+        touchscreen: TouchscreenDevice,
+        display_info: DisplayInfo,
+    ):
+        """Init.
+
+        Args:
+            session: Shell the events are sent over, should not be shared with
+                other callers so touches are not delayed by slow queries.
+            touchscreen: Touchscreen the events are written to.
+            display_info: Display the coordinates are mapped from.
+        """
+        self.session = session
+        self.touchscreen = touchscreen
+        self.display_info = display_info
+
+    @staticmethod
+    def create(
+        d: AdbDeviceWrapper, display_info: DisplayInfo
+    ) -> "EvdevTouchInput | None":
+        """Discover the touchscreen of the device.
+
+        Args:
+            d: ADB device.
+            display_info: Display the coordinates are mapped from.
+
+        Returns:
+            EvdevTouchInput | None: None if no supported touchscreen was found.
+        """
+        try:
+            output = str(d.shell("getevent -pl"))
+        except Exception as e:
+            logging.debug(f"getevent failed: {e}")
+            return None
+
+        touchscreen = parse_touchscreen(output)
+        if touchscreen is None:
+            logging.debug("No evdev touchscreen found")
+            return None
+
+        # Axes are in the touchscreen's native orientation, mapping rotated
+        # coordinates would require the exact rotation which we do not know.
+        if (touchscreen.width > touchscreen.height) != (
+            display_info.width > display_info.height
+        ):
+            logging.debug(
+                f"{touchscreen} orientation does not match {display_info}, "
+                "evdev touch input not supported"
+            )
+            return None
+
+        logging.debug(f"Using evdev touch input: {touchscreen}")
+        return EvdevTouchInput(
+            ShellSession(d.d, name="evdev touch input"), touchscreen, display_info
+        )
+
+    def tap(self, coordinates: Coordinates) -> None:
+        """Tap the screen on the given coordinates.
+
+        Raises:
+            ValueError: Coordinates are outside of the display.
+        """
+        if isinstance(coordinates, PointOutsideDisplay):
+            # Nothing to touch, still do the round trip so measured input delay
+            # matches a real tap.
+            self._run(":")
+            return
+        point = self._to_touchscreen(coordinates)
+        if point is None:
+            raise ValueError(f"Tap on {coordinates} is outside of the display")
+        self._run(build_tap_script(self.touchscreen, *point))
+
+    def hold(self, coordinates: Coordinates, duration: float) -> None:
+        """Hold the screen on the given coordinates for duration seconds.
+
+        Raises:
+            ValueError: Coordinates are outside of the display.
+        """
+        point = self._to_touchscreen(coordinates)
+        if point is None:
+            raise ValueError(f"Hold on {coordinates} is outside of the display")
+        self._run(
+            build_hold_script(self.touchscreen, *point, duration),
+            timeout=self.default_timeout + duration,
+        )
+
+    def swipe(
+        self, start_point: Coordinates, end_point: Coordinates, duration: float
+    ) -> None:
+        """Swipe from start_point to end_point over duration seconds.
+
+        Raises:
+            ValueError: Start or end point is outside of the display.
+        """
+        start = self._to_touchscreen(start_point)
+        end = self._to_touchscreen(end_point)
+        if start is None or end is None:
+            raise ValueError(
+                f"Swipe from {start_point} to {end_point} is outside of the display"
+            )
+        self._run(
+            build_swipe_script(self.touchscreen, start, end, duration),
+            timeout=self.default_timeout + duration * 2,
+        )
+
+    def close(self) -> None:
+        """Close the persistent shell."""
+        self.session.close()
+
+    def _to_touchscreen(self, coordinates: Coordinates) -> tuple[int, int] | None:
+        x, y = coordinates.x, coordinates.y
+        if not (0 <= x < self.display_info.width and 0 <= y < self.display_info.height):
+            return None
+        return (
+            self.touchscreen.x_min
+            + x * self.touchscreen.width // self.display_info.width,
+            self.touchscreen.y_min
+            + y * self.touchscreen.height // self.display_info.height,
+        )
+
+    def _run(self, script: str, timeout: float | None = None) -> None:
+        # No retry, failures are handled by falling back to input.
+        result = self.session.execute(script, timeout or self.default_timeout)
+        if result.exit_code != 0:
+            raise GenericAdbError(
+                f"sendevent failed with exit code {result.exit_code}: {result.output}"
+            )
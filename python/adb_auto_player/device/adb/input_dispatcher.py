@@ -0,0 +1,177 @@
+"""ADB Auto Player Input Dispatcher Module."""
+
+import logging
+import queue
+import threading
+import time
+from collections.abc import Callable, Hashable
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Any
+
+
+@dataclass
+class _InputAction:
+    func: Callable[..., Any]
+    args: tuple[Any, ...]
+    kwargs: dict[str, Any]
+    coalesce_key: Hashable | None = None
+    detached: bool = False
+    future: Future = field(default_factory=Future)
+
+
+class InputDispatcher:
+    """Serializes input actions for a single device on one long-lived worker.
+
+    Non-blocking taps used to spawn a thread per tap, each opening its own ADB
+    shell. The dispatcher replaces that with a bounded queue and a single worker
+    that executes actions in submission order while enforcing a minimum interval
+    between them so the ADB server is not flooded.
+    """
+
+    default_min_interval: float = 1 / 30  # Assuming 30 FPS, 1 Tap per Frame
+    default_max_queue_size: int = 64
+
+    def __init__(
+        self,
+        min_interval: float = default_min_interval,
+        max_queue_size: int = default_max_queue_size,
+        name: str = "InputDispatcher",
+    ):
+        """Init.
+
+        Args:
+            min_interval: Minimum time in seconds between the start of two actions.
+            max_queue_size: Maximum number of pending actions, submit blocks when
+                the queue is full.
+            name: Name of the worker thread.
+        """
+        self.min_interval = min_interval
+        self._queue: queue.Queue[_InputAction | None] = queue.Queue(
+            maxsize=max_queue_size
+        )
+        self._pending: dict[Hashable, _InputAction] = {}
+        self._lock = threading.Lock()
+        self._last_action_time: float = 0.0
+        self._name = name
+        self._worker: threading.Thread | None = None
+        self._running = False
+
+    def submit(
+        self,
+        func: Callable[..., Any],
+        *args: Any,
+        coalesce_key: Hashable | None = None,
+        detached: bool = False,
+        **kwargs: Any,
+    ) -> Future:
+        """Queue an action for execution on the worker thread.
+
+        Args:
+            func: Callable performing the input action.
+            *args: Positional arguments for func.
+            coalesce_key: Actions sharing a key supersede each other, if an action
+                with the same key is still waiting to be executed its future is
+                returned instead of queueing a duplicate.
+            detached: Nobody waits for the result, failures are logged as warning.
+            **kwargs: Keyword arguments for func.
+
+        Returns:
+            Future: Resolves with the return value of func once it has been executed.
+        """
+        with self._lock:
+            self._ensure_worker()
+            if coalesce_key is not None and coalesce_key in self._pending:
+                return self._pending[coalesce_key].future
+
+            action = _InputAction(
+                func=func,
+                args=args,
+                kwargs=kwargs,
+                coalesce_key=coalesce_key,
+                detached=detached,
+            )
+            if coalesce_key is not None:
+                self._pending[coalesce_key] = action
+
+        # Blocking put outside the lock, a full queue applies backpressure to the
+        # caller without stalling other submitters looking up pending actions.
+        self._queue.put(action)
+        return action.future
+
+    def wait_idle(self, timeout: float | None = None) -> bool:
+        """Wait until every queued action has been executed.
+
+        Args:
+            timeout: Maximum time to wait in seconds, None waits indefinitely.
+
+        Returns:
+            bool: True if the queue was drained, False on timeout.
+        """
+        marker: Future = self.submit(lambda: None)
+        try:
+            marker.result(timeout=timeout)
+            return True
+        except TimeoutError:
+            return False
+
+    def stop(self) -> None:
+        """Stop the worker thread after the pending actions have been executed."""
+        with self._lock:
+            if not self._running:
+                return
+            self._running = False
+            worker = self._worker
+            self._worker = None
+
+        self._queue.put(None)
+        if worker and worker is not threading.current_thread():
+            worker.join()
+
+    def _ensure_worker(self) -> None:
+        if self._running and self._worker and self._worker.is_alive():
+            return
+
+        self._running = True
+        self._worker = threading.Thread(
+            target=self._run,
+            name=self._name,
+            daemon=True,
+        )
+        self._worker.start()
+
+    def _run(self) -> None:
+        while True:
+            action = self._queue.get()
+            if action is None:
+                return
+
+            if action.coalesce_key is not None:
+                with self._lock:
+                    if self._pending.get(action.coalesce_key) is action:
+                        del self._pending[action.coalesce_key]
+
+            if not action.future.set_running_or_notify_cancel():
+                continue
+
+            self._wait_for_rate_limit()
+            try:
+                result = action.func(*action.args, **action.kwargs)
+            except BaseException as e:
+                if action.detached:
+                    logging.warning(
+                        f"Input action {action.func.__name__} failed: {e}", exc_info=e
+                    )
+                else:
+                    logging.debug(f"Input action {action.func.__name__} failed: {e}")
+                action.future.set_exception(e)
+            else:
+                action.future.set_result(result)
+
+    def _wait_for_rate_limit(self) -> None:
+        now = time.perf_counter()
+        remaining = self._last_action_time + self.min_interval - now
+        if remaining > 0:
+            time.sleep(remaining)
+            now = time.perf_counter()
+        self._last_action_time = now
@@ -0,0 +1,142 @@
+"""ADB Auto Player Shell Session Module.
+
+Every `adb shell <cmd>` opens a new connection to the ADB server and spawns a new
+shell on the device. A `ShellSession` keeps one `sh` open and runs commands on it
+one after another, each command is framed by a unique sentinel so its output and
+exit code can be separated reliably from the stream.
+"""
+
+import logging
+import re
+import threading
+import uuid
+from typing import NamedTuple
+
+from adb_auto_player.util import Metrics
+from adbutils import AdbConnection, AdbDevice
+
+from .adb_device import _check_output_for_error
+from .retry_decorator import adb_retry
+
+_SENTINEL_PREFIX = "__ADB_AUTO_PLAYER_SHELL__"
+_RECV_SIZE = 65536
+
+
+class ShellResult(NamedTuple):
+    """Output and exit code of a command run in a ShellSession."""
+
+    exit_code: int
+    output: str
+
+
+class ShellSession:
+    """Long-lived interactive shell of a single device.
+
+    Commands are executed sequentially, a failed or timed out command closes the
+    connection and the next command transparently opens a new one.
+    """
+
+    d: AdbDevice
+    default_timeout: float = 10.0
+
+    def __init__(self, d: AdbDevice, name: str = "shell"):
+        """Init.
+
+        Args:
+            d: ADB device.
+            name: Used in log messages.
+        """
+        self.d = d
+        self.name = name
+        self._connection: AdbConnection | None = None
+        self._lock = threading.Lock()
+
+    @adb_retry
+    def run(self, command: str, timeout: float | None = default_timeout) -> str:
+        """Run a command with retry.
+
+        Args:
+            command: Shell command, pipes and redirections are supported.
+            timeout: Maximum time in seconds to wait for the command to finish.
+
+        Returns:
+            str: Combined stdout and stderr of the command, right stripped.
+        """
+        output = self.execute(command, timeout).output
+        _check_output_for_error(output)
+        return output
+
+    def run_unsafe(self, command: str, timeout: float | None = default_timeout) -> str:
+        """Run a command without retry.
+
+        Should not be used really unless you have a good reason.
+        """
+        return self.execute(command, timeout).output
+
+    def execute(
+        self, command: str, timeout: float | None = default_timeout
+    ) -> ShellResult:
+        """Run a command and return its exit code and output.
+
+        Args:
+            command: Shell command, pipes and redirections are supported.
+            timeout: Maximum time in seconds to wait for the command to finish.
+
+        Returns:
+            ShellResult: Exit code and combined stdout and stderr of the command.
+        """
+        sentinel = f"{_SENTINEL_PREFIX}{uuid.uuid4().hex}"
+        # stdin is redirected so commands reading from it cannot consume the
+        # sentinel line, the newline before the closing brace keeps trailing
+        # comments in command from swallowing it.
+        framed = f"{{ {command}\n}} </dev/null 2>&1; echo {sentinel} $?\n"
+
+        with self._lock:
+            if self._connection is None:
+                logging.debug(f"Opening {self.name} session")
+                self._connection = self.d.shell("sh", stream=True)
+            connection = self._connection
+
+            try:
+                with Metrics.timer("adb_shell_seconds", session=self.name):
+                    connection.conn.settimeout(timeout)
+                    connection.send(framed.encode())
+                    exit_code, output = self._read_until_sentinel(connection, sentinel)
+            except Exception:
+                self._close_connection()
+                raise
+
+        return ShellResult(
+            exit_code=exit_code,
+            output=output.decode("utf-8", errors="replace").rstrip(),
+        )
+
+    def close(self) -> None:
+        """Close the shell."""
+        with self._lock:
+            self._close_connection()
+
+    @staticmethod
+    def _read_until_sentinel(
+        connection: AdbConnection, sentinel: str
+    ) -> tuple[int, bytes]:
+        pattern = re.compile(rf"{sentinel} (\d+)\r?\n".encode())
+        buffer = bytearray()
+        search_from = 0
+        while not (match := pattern.search(buffer, search_from)):
+            chunk = connection.recv(_RECV_SIZE)
+            if not chunk:
+                raise ConnectionError("Shell session closed unexpectedly")
+            # the sentinel can be split across chunks
+            search_from = max(0, len(buffer) - len(sentinel) - 16)
+            buffer += chunk
+        return int(match.group(1)), bytes(buffer[: match.start()])
+
+    def _close_connection(self) -> None:
+        if self._connection is None:
+            return
+        try:
+            self._connection.close()
+        except Exception as e:
+            logging.debug(f"Failed to close {self.name} session: {e}")
+        self._connection = None
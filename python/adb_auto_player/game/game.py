@@ -3,10 +3,10 @@
 import logging
 import os
 import sys
-import threading
 import platform
 from abc import ABC, abstractmethod
 from collections.abc import Callable
+from concurrent.futures import Future
 from dataclasses import dataclass
 from enum import StrEnum, auto
 from pathlib import Path
@@ -29,7 +29,9 @@ from adb_auto_player.exceptions import (
 from adb_auto_player.image_manipulation import (
     IO,
     Color,
+    ColorFormat,
     Cropping,
+    PreviewPublisher,
 )
 from adb_auto_player.models import ConfidenceValue
 from adb_auto_player.models.device import DisplayInfo, Orientation
@@ -41,7 +43,7 @@ from adb_auto_player.models.template_matching import MatchMode, TemplateMatchRes
 from adb_auto_player.registries import CUSTOM_ROUTINE_REGISTRY
 from adb_auto_player.settings import ConfigLoader
 from adb_auto_player.template_matching import TemplateMatcher
-from adb_auto_player.util import Execute, StringHelper
+from adb_auto_player.util import Execute, Metrics, StringHelper
 from PIL import Image
 from pydantic import BaseModel
 
@@ -92,6 +94,7 @@ class Game(ABC):
         self._debug_screenshot_counter: int = 0
         self._device: AdbController | None = None
         self._scale_factor: float | None = None
+        self._screenshot_number: int = 0
         self._stream: DeviceStream | None = None
         self._template_dir_path: Path | None = None
 
@@ -177,6 +180,13 @@ class Game(ABC):
             self._stream.stop()
             self._stream = None
 
+    def close(self) -> None:
+        """Stop the device stream and release the device after the command."""
+        self.stop_stream()
+        if self._device is not None:
+            self._device.close()
+            self._device = None
+
     def open_eyes(self, device_streaming: bool = True) -> None:
         """Give the bot eyes.
 
@@ -185,6 +195,9 @@ class Game(ABC):
         Args:
             device_streaming (bool, optional): Whether to start the device stream.
         """
+        # Display, orientation, emulator and running app in one round trip.
+        self.device.refresh_snapshot()
+        self.device.state_monitor.start()
         self._set_device_resolution()
         self._check_requirements()
 
@@ -199,7 +212,7 @@ class Game(ABC):
 
         logging.warning("Game is not running, trying to start the game.")
         self.start_game()
-        if not self.is_game_running():
+        if not self.is_game_running(force_refresh=True):
             raise GameNotRunningOrFrozenError("Game could not be started, exiting...")
         return
 
@@ -313,11 +326,10 @@ class Game(ABC):
         coordinates: Coordinates,
         scale: bool = False,
         blocking: bool = True,
-        # Assuming 30 FPS, 1 Tap per Frame
-        non_blocking_sleep_duration: float | None = 1 / 30,
+        coalesce: bool = False,
         log_message: str | None = None,
         log: bool = True,
-    ) -> None:
+    ) -> Future[None]:
         """Tap the screen on the given point.
 
         Args:
@@ -325,10 +337,13 @@ class Game(ABC):
             scale (bool, optional): Whether to scale the coordinates.
             blocking (bool, optional): Whether to block the process and
                 wait for ADBServer to confirm the tap has happened.
-            non_blocking_sleep_duration (float, optional): Sleep time in seconds for
-                non-blocking taps, needed to not DoS the ADBServer.
+            coalesce (bool, optional): Whether the tap can be merged with a tap on
+                the same point that is still waiting to be dispatched.
             log_message (str | None, optional): Custom Log message, default msg if None
             log (bool, optional): Log the tap command.
+
+        Returns:
+            Future[None]: Resolves once the tap has been performed.
         """
         original_point = coordinates
         final_point = coordinates
@@ -345,24 +360,16 @@ class Game(ABC):
         else:
             log_message = None
 
-        # Perform the tap
+        future = self.device.input_dispatcher.submit(
+            self._click,
+            final_point,
+            log_message,
+            coalesce_key=(("tap", final_point.x, final_point.y) if coalesce else None),
+            detached=not blocking,
+        )
         if blocking:
-            self._click(
-                final_point,
-                log_message,
-            )
-        else:
-            thread = threading.Thread(
-                target=self._click,
-                args=(
-                    final_point,
-                    log_message,
-                ),
-                daemon=True,
-            )
-            thread.start()
-            if non_blocking_sleep_duration is not None:
-                sleep(non_blocking_sleep_duration)
+            future.result()
+        return future
 
     @staticmethod
     def _build_tap_log_message(
@@ -401,18 +408,22 @@ class Game(ABC):
             AdbException: Screenshot cannot be recorded
         """
         if self._stream:
-            image = self._stream.get_latest_frame()
+            with Metrics.timer("screenshot_seconds", backend="stream"):
+                image = self._stream.get_latest_frame()
+                bgr_image = Color.to_bgr(image) if image is not None else None
             if image is not None:
                 self._debug_save_screenshot(image, is_bgr=False)
-                return Color.to_bgr(image)
+                return bgr_image
 
         max_retries = 3
         for attempt in range(max_retries):
             try:
-                data = self.device.screenshot()
+                with Metrics.timer("screenshot_seconds", backend="screencap"):
+                    data = self.device.screenshot()
                 if isinstance(data, bytes):
                     image = IO.get_bgr_np_array_from_png_bytes(data)
                     self._debug_save_screenshot(image, is_bgr=True)
+                    PreviewPublisher.offer(image, ColorFormat.BGR)
                     return image
             except (OSError, ValueError) as e:
                 logging.debug(
@@ -425,15 +436,51 @@ class Game(ABC):
             f"Screenshots cannot be recorded from device: {self.device.identifier}"
         )
 
+    def wait_for_new_screenshot(
+        self, after: int = 0, timeout: float | None = None
+    ) -> tuple[int, np.ndarray] | None:
+        """Wait for a screenshot newer than the one the caller has seen.
+
+        Lets background consumers process every frame once instead of polling.
+        Without device stream a new screenshot is taken on every call.
+
+        Args:
+            after: Frame number returned by the previous call.
+            timeout: Seconds to wait for the device stream.
+
+        Raises:
+            AdbException: Screenshot cannot be recorded
+
+        Returns:
+            tuple[int, np.ndarray] | None: Frame number and BGR image, None on
+                timeout.
+        """
+        if stream := self._stream:
+            frame = stream.wait_for_frame(after, timeout)
+            if frame is not None:
+                frame_number, image = frame
+                return frame_number, Color.to_bgr(image)
+            if self._stream is not None:
+                return None
+
+        image = self.get_screenshot()
+        self._screenshot_number = max(self._screenshot_number, after) + 1
+        return self._screenshot_number, image
+
     def force_stop_game(self):
         """Force stops the Game."""
         if not self.package_name:
             return
         self.device.stop_game(self.package_name)
 
-    def is_game_running(self) -> bool:
-        """Check if Game is still running."""
-        package_name = self.device.get_running_app()
+    def is_game_running(self, force_refresh: bool = False) -> bool:
+        """Check if Game is still running.
+
+        Args:
+            force_refresh: Query the device instead of using the foreground app
+                cached by the device state monitor.
+        """
+        package_name = self.device.get_running_app(force_refresh=force_refresh)
         if package_name is None:
             return False
 
@@ -555,23 +602,24 @@ class Game(ABC):
             crop_regions=crop_regions,
         )
 
-        match = TemplateMatcher.find_template_match(
-            base_image=crop_result.image,
-            template_image=self._load_image(
-                template=template,
+        template_image = self._load_image(template=template, grayscale=grayscale)
+        with Metrics.timer("template_match_seconds", template=template):
+            match = TemplateMatcher.find_template_match(
+                base_image=crop_result.image,
+                template_image=template_image,
+                match_mode=match_mode,
+                threshold=threshold or self.default_threshold,
                 grayscale=grayscale,
-            ),
-            match_mode=match_mode,
-            threshold=threshold or self.default_threshold,
-            grayscale=grayscale,
-        )
+            )
 
         if match is None:
             return None
 
-        return match.with_offset(crop_result.offset).to_template_match_result(
+        result = match.with_offset(crop_result.offset).to_template_match_result(
             template=str(template)
         )
+        PreviewPublisher.add_match(result.box)
+        return result
 
     def _load_image(
         self,
@@ -604,14 +652,13 @@ class Game(ABC):
             image=self.get_screenshot(), crop_regions=crop_regions
         )
 
-        result = TemplateMatcher.find_worst_template_match(
-            base_image=crop_result.image,
-            template_image=self._load_image(
-                template=template,
+        template_image = self._load_image(template=template, grayscale=grayscale)
+        with Metrics.timer("template_match_seconds", template=template):
+            result = TemplateMatcher.find_worst_template_match(
+                base_image=crop_result.image,
+                template_image=template_image,
                 grayscale=grayscale,
-            ),
-            grayscale=grayscale,
-        )
+            )
 
         if result is None:
             return None
@@ -645,16 +692,15 @@ class Game(ABC):
             image=self.get_screenshot(), crop_regions=crop_regions
         )
 
-        result = TemplateMatcher.find_all_template_matches(
-            base_image=crop_result.image,
-            template_image=self._load_image(
-                template=template,
+        template_image = self._load_image(template=template, grayscale=grayscale)
+        with Metrics.timer("template_match_seconds", template=template):
+            result = TemplateMatcher.find_all_template_matches(
+                base_image=crop_result.image,
+                template_image=template_image,
+                threshold=threshold or self.default_threshold,
                 grayscale=grayscale,
-            ),
-            threshold=threshold or self.default_threshold,
-            grayscale=grayscale,
-            min_distance=min_distance,
-        )
+                min_distance=min_distance,
+            )
 
         results: list[TemplateMatchResult] = []
         for match in result:
@@ -663,6 +709,7 @@ class Game(ABC):
                     template=str(template)
                 )
             )
+            PreviewPublisher.add_match(results[-1].box)
         return results
 
     def wait_for_template(
@@ -963,11 +1010,12 @@ class Game(ABC):
         )
 
         logging.debug(f"swipe_{direction} - from ({sx}, {sy}) to ({ex}, {ey})")
-        self.device.swipe(
+        self.device.input_dispatcher.submit(
+            self.device.swipe,
             Point(sx, sy).scale(self._scale_factor),
             Point(ex, ey).scale(self._scale_factor),
             duration=params.duration,
-        )
+        ).result()
 
     def hold(
         self,
@@ -975,14 +1023,20 @@ class Game(ABC):
         duration: float = 3.0,
         blocking: bool = True,
         log: bool = True,
-    ) -> threading.Thread | None:
+    ) -> Future[None]:
         """Holds a point on the screen.
 
+        Input actions of a device run one after another, a non-blocking hold
+        delays every tap or swipe submitted after it until it has been released.
+
         Args:
             coordinates (Point): Point on the screen.
             duration (float, optional): Hold duration. Defaults to 3.0.
-            blocking (bool, optional): Whether the call should happen async.
+            blocking (bool, optional): Whether to wait for the hold to finish.
             log (bool, optional): Log the hold command.
+
+        Returns:
+            Future[None]: Resolves once the hold has been released.
         """
         point = Point(coordinates.x, coordinates.y).scale(self._scale_factor)
 
@@ -991,22 +1045,15 @@ class Game(ABC):
                 f"hold: ({coordinates.x}, {coordinates.y}) for {duration} seconds"
             )
 
-        if blocking:
-            self.device.hold(
-                coordinates=point,
-                duration=duration,
-            )
-            return None
-        thread = threading.Thread(
-            target=self.device.hold,
-            kwargs={
-                "coordinates": point,
-                "duration": duration,
-            },
-            daemon=True,
+        future = self.device.input_dispatcher.submit(
+            self.device.hold,
+            coordinates=point,
+            duration=duration,
+            detached=not blocking,
         )
-        thread.start()
-        return thread
+        if blocking:
+            future.result()
+        return future
 
     T = TypeVar("T")
 
@@ -1028,6 +1075,7 @@ class Game(ABC):
         end_time_exceeded = False
 
         while True:
+            Metrics.increment("wait_iterations_total")
             result = operation()
             if result_should_be_none and result is None:
                 return None  # type: ignore
@@ -1038,6 +1086,7 @@ class Game(ABC):
             time_spent_waiting += delay
 
             if time_spent_waiting >= timeout or end_time_exceeded:
+                Metrics.increment("wait_timeouts_total")
                 raise GameTimeoutError(f"{timeout_message}")
 
             if end_time <= time():
@@ -1,5 +1,5 @@
 import logging
-import threading
+from concurrent.futures import Future, wait
 from time import sleep
 
 import cv2
@@ -184,7 +184,7 @@ class Fishing(AFKJourneyBase):
         check_book_at = 20
         click_strong_pull_at = 10
         count = 0
-        thread = None
+        hold: Future[None] | None = None
 
         try:
             while True:
@@ -192,11 +192,12 @@ class Fishing(AFKJourneyBase):
                 screenshot = self.get_screenshot()
 
                 if count % click_strong_pull_at == 0:
-                    if not thread or not thread.is_alive():
+                    if not hold or hold.done():
                         # don't log this its clicking like 5 million times
                         self.tap(
                             STRONG_PULL,
                             blocking=False,
+                            coalesce=True,
                             log=False,
                         )
 
@@ -214,30 +215,30 @@ class Fishing(AFKJourneyBase):
                         # Might have to OCR the remaining attempts?
                         break
 
-                if not thread or not thread.is_alive():
+                if not hold or hold.done():
                     cropped = Cropping.crop(
                         screenshot,
                         CropRegions(left=0.1, right=0.1, top="980px", bottom="740px"),
                     )
                     top, middle = _find_fishing_colors_fast(cropped.image)
                     if top and middle and top > middle:
-                        thread = self._handle_hold_for_distance(
+                        hold = self._handle_hold_for_distance(
                             btn=btn,
                             distance=(top - middle),
-                            thread=thread,
+                            hold=hold,
                         )
                 # Without this CPU usage will go insane
                 sleep(FISHING_DELAY)
         finally:
-            if thread and thread.is_alive():
-                thread.join()
+            if hold and not hold.done():
+                wait([hold])
 
     def _handle_hold_for_distance(
         self,
         btn: Coordinates,
         distance: int,
-        thread: threading.Thread | None,
-    ) -> threading.Thread | None:
+        hold: Future[None] | None,
+    ) -> Future[None] | None:
         # TODO distance and duration could be adjusted
         # Holds are not blocking so processing can continue
         # Debug log disabled to reduce IO/Processing time
@@ -251,7 +252,7 @@ class Fishing(AFKJourneyBase):
             return self.hold(btn, duration=0.5, blocking=False, log=False)
         if distance > DISTANCE_50:
             return self.hold(btn, duration=0.25, blocking=False, log=False)
-        return thread
+        return hold
 
 
 def _find_fishing_colors_fast(img: np.ndarray) -> tuple[int | None, int | None]:
@@ -2,7 +2,11 @@ import logging
 import re
 import time
 from abc import ABC
+from collections.abc import Iterator
+from contextlib import contextmanager
 from dataclasses import dataclass, replace
+from functools import lru_cache
+from pathlib import Path
 
 import numpy as np
 from adb_auto_player.exceptions import AutoPlayerWarningError
@@ -13,8 +17,18 @@ from adb_auto_player.models.geometry import Point
 from adb_auto_player.models.image_manipulation import CropRegions
 from adb_auto_player.models.ocr import OCRResult
 from adb_auto_player.models.template_matching import MatchMode, TemplateMatchResult
-from adb_auto_player.ocr import PSM, TesseractBackend, TesseractConfig
-from adb_auto_player.util import StringHelper
+from adb_auto_player.ocr import (
+    PSM,
+    OCRPreprocessor,
+    PreprocessResult,
+    TesseractConfig,
+    TextSignatureStore,
+    create_tesseract_backend,
+)
+from adb_auto_player.settings import ConfigLoader
+from adb_auto_player.util import ApproximateMatcher
+
+from .popup_watcher import PopupWatcher, PopupWatcherMode
 
 
 @dataclass(frozen=True)
@@ -179,6 +193,50 @@ popup_messages: list[PopupMessage] = (
 )
 
 
+def _strip_numbers(text: str) -> str:
+    text = re.sub(r"\d+", "", text)
+    text = re.sub(r"\s+", " ", text)
+    return text.strip()
+
+
+@lru_cache
+def _get_popup_matcher(
+    similarity_threshold: ConfidenceValue,
+) -> ApproximateMatcher[PopupMessage]:
+    """All popup messages compiled once, earlier messages take precedence."""
+    return ApproximateMatcher(
+        [(popup.text, popup) for popup in popup_messages],
+        similarity_threshold,
+        normalizers=[
+            _strip_numbers if popup.strip_numbers else None for popup in popup_messages
+        ],
+    )
+
+
+@lru_cache
+def _get_popups_by_text() -> dict[str, PopupMessage]:
+    return {popup.text: popup for popup in popup_messages}
+
+
+def _is_read_exactly(ocr_results: list[OCRResult], popup: PopupMessage) -> bool:
+    """Whether OCR read the popup text without errors.
+
+    Only these are learned, a misread matched by fuzzy matching must not be
+    recognized without OCR from then on.
+    """
+    matcher = _get_popup_matcher(ConfidenceValue("80%"))
+    for result in ocr_results:
+        match = matcher.find(result.text)
+        if match and match.value is popup and match.similarity >= 1.0:
+            return True
+    return False
+
+
+@lru_cache
+def _get_popup_signature_store(path: Path) -> TextSignatureStore:
+    return TextSignatureStore(persist_path=path)
+
+
 @dataclass(frozen=True)
 class PopupPreprocessResult:
     original_image: np.ndarray
@@ -189,11 +247,71 @@ class PopupPreprocessResult:
 
 
 class PopupMessageHandler(Game, ABC):
+    # Crops the popup body to its text and binarizes it before OCR, None sends
+    # the whole grayscale popup body to Tesseract. Opt-in until the benchmark
+    # ran against Tesseract on a committed set of popup screenshots.
+    popup_ocr_preprocessor: OCRPreprocessor | None = None
+    # Popups OCR read exactly are learned and recognized by their text
+    # signature next time, OCR only runs for unknown popups. Opt-in.
+    use_popup_signatures: bool = False
+    _popup_watcher: PopupWatcher | None = None
+
     def handle_popup_messages(
         self,
         navigate_to_homestead: bool = False,
     ) -> bool:
-        """Handles multiple popups."""
+        """Handles multiple popups.
+
+        While a popup watcher is running no screenshot is taken, see watch_popups.
+        """
+        if watcher := self._popup_watcher:
+            if watcher.mode == PopupWatcherMode.HANDLE:
+                return watcher.consume_handled()
+            if not watcher.drain_events():
+                return False
+            with watcher.lock:
+                return self._handle_popup_messages(navigate_to_homestead)
+        return self._handle_popup_messages(navigate_to_homestead)
+
+    @contextmanager
+    def watch_popups(
+        self,
+        mode: PopupWatcherMode = PopupWatcherMode.HANDLE,
+        navigate_to_homestead: bool = False,
+    ) -> Iterator[PopupWatcher]:
+        """Detect popups in the background while the block runs.
+
+        handle_popup_messages only reports popups the watcher confirmed in
+        PopupWatcherMode.HANDLE, and only checks the screen after the watcher saw
+        a popup in PopupWatcherMode.NOTIFY, so loops calling it are no longer
+        slowed down by template matching and OCR.
+
+        Args:
+            mode: Confirm popups in the background or only publish events.
+            navigate_to_homestead: See handle_popup_messages.
+
+        Yields:
+            PopupWatcher: The running watcher, e.g. to wait for events.
+        """
+        watcher = PopupWatcher(
+            self, mode=mode, navigate_to_homestead=navigate_to_homestead
+        )
+        self._popup_watcher = watcher
+        watcher.start()
+        try:
+            yield watcher
+        finally:
+            watcher.stop()
+            self._popup_watcher = None
+
+    def close(self) -> None:
+        """Stop a popup watcher left running, then release the device."""
+        if self._popup_watcher:
+            self._popup_watcher.stop()
+            self._popup_watcher = None
+        super().close()
+
+    def _handle_popup_messages(self, navigate_to_homestead: bool) -> bool:
         max_popups = 5
         count = 0
 
@@ -231,22 +349,20 @@ class PopupMessageHandler(Game, ABC):
         if not preprocess_result:
             return None
 
-        # PSM 6 - Single Block of Text works best here.
-        ocr = TesseractBackend(config=TesseractConfig(psm=PSM.SINGLE_BLOCK))
-        ocr_results = ocr.detect_text_blocks(
-            image=preprocess_result.cropped_image, min_confidence=ConfidenceValue("80%")
-        )
-        # This is actually not needed in this scenario because we do not need
-        # The coordinates or boundaries of the text
-        # Leaving this for demo though.
-        ocr_results = [
-            result.with_offset(preprocess_result.crop_offset) for result in ocr_results
-        ]
-
-        matching_popup = self._get_popup_message_from_ocr_results(ocr_results)
+        matching_popup = self._identify_popup(preprocess_result)
         if not matching_popup:
             return None
 
+        return self._confirm_popup(
+            preprocess_result, matching_popup, navigate_to_homestead
+        )
+
+    def _confirm_popup(
+        self,
+        preprocess_result: PopupPreprocessResult,
+        matching_popup: PopupMessage,
+        navigate_to_homestead: bool = False,
+    ) -> PopupMessage | None:
         if navigate_to_homestead:
             if matching_popup == HEAD_FROM_WORLD_TO_HOMESTEAD_MESSAGE:
                 matching_popup = replace(
@@ -282,6 +398,82 @@ class PopupMessageHandler(Game, ABC):
 
         return popup_message
 
+    def _identify_popup(
+        self, preprocess_result: PopupPreprocessResult
+    ) -> PopupMessage | None:
+        image = preprocess_result.cropped_image
+        ocr_preprocess_result = None
+        if self.popup_ocr_preprocessor:
+            ocr_preprocess_result = self.popup_ocr_preprocessor.process(image)
+            if not ocr_preprocess_result.has_text:
+                logging.debug("No text found in popup.")
+                return self._get_popup_message_from_ocr_results([])
+            image = ocr_preprocess_result.image
+
+        signature_store = self._get_popup_signature_store()
+        match = signature_store.lookup(image) if signature_store else None
+        if match and match.verified:
+            if popup := _get_popups_by_text().get(match.label):
+                logging.debug(
+                    f"Popup recognized by signature: {popup.text} "
+                    f"(similarity: {match.similarity})"
+                )
+                return popup
+
+        ocr_results = self._detect_popup_text(
+            preprocess_result, image, ocr_preprocess_result
+        )
+        popup = self._get_popup_message_from_ocr_results(ocr_results)
+        if not signature_store:
+            return popup
+        if match and not match.verified:
+            # Signatures from disk are checked by OCR on their first match.
+            if popup and popup.text == match.label:
+                signature_store.confirm(match.label)
+            else:
+                logging.debug(
+                    f"Dropping text signature of {match.label!r}, "
+                    f"OCR identified {popup.text if popup else None!r}"
+                )
+                signature_store.remove(match.label)
+        if popup and _is_read_exactly(ocr_results, popup):
+            signature_store.add(image, popup.text)
+        return popup
+
+    def _get_popup_signature_store(self) -> TextSignatureStore | None:
+        """Signatures learned for the installed game version."""
+        if not self.use_popup_signatures:
+            return None
+        version = None
+        if self.package_name:
+            version = self.device.get_app_version(self.package_name)
+        file_name = f"{self.package_name or 'unknown'}-{version or 'unknown'}.json"
+        return _get_popup_signature_store(
+            ConfigLoader.cache_dir() / "popup_signatures" / file_name
+        )
+
+    def _detect_popup_text(
+        self,
+        preprocess_result: PopupPreprocessResult,
+        image: np.ndarray,
+        ocr_preprocess_result: PreprocessResult | None,
+    ) -> list[OCRResult]:
+        # PSM 6 - Single Block of Text works best here.
+        ocr = create_tesseract_backend(TesseractConfig(psm=PSM.SINGLE_BLOCK))
+        ocr_results = ocr.detect_text_blocks(
+            image=image, min_confidence=ConfidenceValue("80%")
+        )
+        # This is actually not needed in this scenario because we do not need
+        # The coordinates or boundaries of the text
+        # Leaving this for demo though.
+        if ocr_preprocess_result:
+            ocr_results = [ocr_preprocess_result.to_source(r) for r in ocr_results]
+        ocr_results = [
+            result.with_offset(preprocess_result.crop_offset) for result in ocr_results
+        ]
+
+        return ocr_results
+
     def _handle_popup_button(
         self,
         result: PopupPreprocessResult,
@@ -305,8 +497,11 @@ class PopupMessageHandler(Game, ABC):
         time.sleep(3)
         return popup
 
-    def _preprocess_screenshot_for_popup(self) -> PopupPreprocessResult | None:
-        screenshot = self.get_screenshot()
+    def _preprocess_screenshot_for_popup(
+        self, screenshot: np.ndarray | None = None
+    ) -> PopupPreprocessResult | None:
+        if screenshot is None:
+            screenshot = self.get_screenshot()
         image = screenshot.copy()
         height, width = image.shape[:2]
 
@@ -364,31 +559,5 @@ class PopupMessageHandler(Game, ABC):
         Returns:
             PopupMessage or None if no match found
         """
-        for popup in popup_messages:
-            if PopupMessageHandler._popup_fuzzy_substring_search(
-                ocr_text,
-                popup,
-                similarity_threshold,
-            ):
-                return popup
-        return None
-
-    @staticmethod
-    def _popup_fuzzy_substring_search(
-        text: str,
-        popup: PopupMessage,
-        similarity_threshold: ConfidenceValue = ConfidenceValue("80%"),
-    ) -> bool:
-        pattern = popup.text
-        if popup.strip_numbers:
-            text = re.sub(r"\d+", "", text)
-            text = re.sub(r"\s+", " ", text)
-            text = text.strip()
-
-        if StringHelper.fuzzy_substring_match(
-            text,
-            pattern,
-            similarity_threshold,
-        ):
-            return True
-        return False
+        match = _get_popup_matcher(similarity_threshold).find(ocr_text)
+        return match.value if match else None
@@ -0,0 +1,214 @@
+"""Watch the device screen for popups in the background."""
+
+import logging
+import queue
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from enum import StrEnum, auto
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import numpy as np
+
+    from .popup_message_handler import (
+        PopupMessage,
+        PopupMessageHandler,
+        PopupPreprocessResult,
+    )
+
+
+class PopupWatcherMode(StrEnum):
+    """What the watcher does with identified popups."""
+
+    # Confirm popups on the watcher thread.
+    HANDLE = auto()
+    # Only publish events, the routine decides what to do.
+    NOTIFY = auto()
+
+
+@dataclass(frozen=True)
+class PopupEvent:
+    """Popup identified by a PopupWatcher."""
+
+    popup: "PopupMessage"
+    preprocess_result: "PopupPreprocessResult"
+    detected_at: float
+    # Confirmed on the watcher thread, only in PopupWatcherMode.HANDLE.
+    handled: bool = False
+    # Exception the popup raises before or after confirming, re-raised on the
+    # routine thread by PopupWatcher.consume_handled.
+    error: Exception | None = None
+
+
+class PopupWatcher:
+    """Detects popups on new frames independent of the routine cadence.
+
+    Every new frame is checked for the popup confirm button in its known region,
+    which is a single template match. Only when a button appears the popup text is
+    classified, at most once per popup.
+    """
+
+    default_frame_timeout: float = 1.0
+
+    def __init__(
+        self,
+        handler: "PopupMessageHandler",
+        mode: PopupWatcherMode = PopupWatcherMode.HANDLE,
+        *,
+        min_interval: float = 0.1,
+        max_events: int = 16,
+        on_event: Callable[[PopupEvent], None] | None = None,
+        navigate_to_homestead: bool = False,
+        name: str = "PopupWatcher",
+    ):
+        """Init.
+
+        Args:
+            handler: Game used to take screenshots and to identify popups.
+            mode: Confirm popups or only publish events.
+            min_interval: Minimum seconds between two checked frames, frames in
+                between are skipped.
+            max_events: Unconsumed events kept, the oldest is dropped beyond this.
+            on_event: Called on the watcher thread for every event.
+            navigate_to_homestead: See PopupMessageHandler.handle_popup_messages.
+            name: Name of the background thread.
+        """
+        self.handler = handler
+        self.mode = mode
+        self.min_interval = min_interval
+        self.on_event = on_event
+        self.navigate_to_homestead = navigate_to_homestead
+        self._name = name
+        # Held while a popup is classified or confirmed, inline popup handling
+        # takes it as well so both never tap the same popup.
+        self.lock = threading.Lock()
+        self._events: queue.Queue[PopupEvent] = queue.Queue(maxsize=max_events)
+        self._stop_event = threading.Event()
+        self._worker: threading.Thread | None = None
+        # Whether the popup currently open has been classified.
+        self._classified = False
+
+    @property
+    def is_running(self) -> bool:
+        """Whether the background thread is running."""
+        return self._worker is not None and self._worker.is_alive()
+
+    def start(self) -> None:
+        """Start watching, does nothing if already running."""
+        if self.is_running:
+            return
+        self._stop_event.clear()
+        self._classified = False
+        self._worker = threading.Thread(target=self._run, name=self._name, daemon=True)
+        self._worker.start()
+
+    def stop(self) -> None:
+        """Stop watching, a popup being confirmed is finished first."""
+        self._stop_event.set()
+        worker = self._worker
+        self._worker = None
+        if worker and worker is not threading.current_thread():
+            worker.join()
+
+    def get_event(self, timeout: float | None = 0) -> PopupEvent | None:
+        """Get the oldest unconsumed event.
+
+        Args:
+            timeout: Seconds to wait for an event, None waits forever.
+
+        Returns:
+            PopupEvent | None: None if there is no event.
+        """
+        try:
+            if timeout == 0:
+                return self._events.get_nowait()
+            return self._events.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def drain_events(self) -> list[PopupEvent]:
+        """Get all unconsumed events, oldest first."""
+        events: list[PopupEvent] = []
+        while event := self.get_event():
+            events.append(event)
+        return events
+
+    def consume_handled(self) -> bool:
+        """Consume events of popups confirmed in the background.
+
+        Raises:
+            Exception: The first exception raised by a consumed popup.
+
+        Returns:
+            bool: True if a popup was confirmed since the last call.
+        """
+        events = self.drain_events()
+        for event in events:
+            if event.error is not None:
+                raise event.error
+        return any(event.handled for event in events)
+
+    def _run(self) -> None:
+        frame_number = 0
+        while not self._stop_event.is_set():
+            started_at = time.monotonic()
+            try:
+                frame = self.handler.wait_for_new_screenshot(
+                    frame_number, timeout=self.default_frame_timeout
+                )
+                if frame is not None:
+                    frame_number, image = frame
+                    self._check_frame(image)
+            except Exception as e:
+                logging.debug(f"Popup watcher: {e}")
+            self._stop_event.wait(
+                max(0.0, self.min_interval - (time.monotonic() - started_at))
+            )
+
+    def _check_frame(self, image: "np.ndarray") -> None:
+        preprocess_result = self.handler._preprocess_screenshot_for_popup(image)
+        if preprocess_result is None:
+            self._classified = False
+            return
+        if self._classified:
+            return
+
+        with self.lock:
+            popup = self.handler._identify_popup(preprocess_result)
+            self._classified = True
+            if popup is None:
+                return
+            detected_at = time.time()
+            if self.mode == PopupWatcherMode.NOTIFY:
+                self._publish(PopupEvent(popup, preprocess_result, detected_at))
+                return
+
+            error = None
+            try:
+                handled = (
+                    self.handler._confirm_popup(
+                        preprocess_result, popup, self.navigate_to_homestead
+                    )
+                    is not None
+                )
+            except Exception as e:
+                handled, error = True, e
+            if handled:
+                # Popups can be chained without a frame in between.
+                self._classified = False
+                self._publish(
+                    PopupEvent(popup, preprocess_result, detected_at, handled, error)
+                )
+
+    def _publish(self, event: PopupEvent) -> None:
+        logging.debug(f"Popup watcher: {event.popup.text}, handled: {event.handled}")
+        while True:
+            try:
+                self._events.put_nowait(event)
+                break
+            except queue.Full:
+                self.get_event()
+        if self.on_event:
+            self.on_event(event)
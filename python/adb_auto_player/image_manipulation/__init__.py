@@ -3,6 +3,7 @@
 from .color import Color, ColorFormat
 from .cropping import Cropping
 from .io import IO
+from .preview_publisher import PreviewPublisher
 from .scaling import Scaling
 
 __all__ = [
@@ -10,5 +11,6 @@ __all__ = [
     "Color",
     "ColorFormat",
     "Cropping",
+    "PreviewPublisher",
     "Scaling",
 ]
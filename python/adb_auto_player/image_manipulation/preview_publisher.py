@@ -0,0 +1,154 @@
+"""Live preview of the frames a command works with."""
+
+import logging
+import threading
+import time
+from collections import deque
+from multiprocessing.queues import Queue
+from multiprocessing.synchronize import Event
+from typing import ClassVar
+
+import cv2
+import numpy as np
+from adb_auto_player.models.geometry import Box
+
+from .color import ColorFormat
+
+_BOX_COLOR_BGR = (0, 255, 0)
+
+
+class PreviewPublisher:
+    """Sends downscaled JPEG frames to the server while somebody watches.
+
+    Screenshot producers offer every frame, which only keeps a reference. A
+    background thread encodes the newest frame at most max_fps times a second
+    and only while the server requested a preview. Template matches found in the
+    last match_box_lifetime seconds are drawn onto the frame.
+    """
+
+    max_fps: float = 10.0
+    # Longest side of the encoded frame in pixels.
+    max_size: int = 960
+    jpeg_quality: int = 70
+    match_box_lifetime: float = 1.0
+
+    _message_queue: Queue | None = None
+    _requested: Event | None = None
+    _thread: threading.Thread | None = None
+    _new_frame: ClassVar[threading.Condition] = threading.Condition()
+    _frame: np.ndarray | None = None
+    _frame_format: ColorFormat = ColorFormat.BGR
+    _frame_number: int = 0
+    _matches: ClassVar[deque[tuple[float, Box]]] = deque(maxlen=32)
+
+    @classmethod
+    def configure(cls, message_queue: Queue, requested: Event) -> None:
+        """Start publishing frames of this process.
+
+        Args:
+            message_queue: Queue for sending messages to the main process.
+            requested: Set by the server while a preview is watched.
+        """
+        cls._message_queue = message_queue
+        cls._requested = requested
+        if cls._thread is None or not cls._thread.is_alive():
+            cls._thread = threading.Thread(
+                target=cls._run, name="PreviewPublisher", daemon=True
+            )
+            cls._thread.start()
+
+    @classmethod
+    def is_requested(cls) -> bool:
+        """Whether a preview is watched right now."""
+        return cls._requested is not None and cls._requested.is_set()
+
+    @classmethod
+    def offer(cls, frame: np.ndarray, color_format: ColorFormat) -> None:
+        """Offer the newest frame, cheap enough to call for every frame.
+
+        Args:
+            frame: Screenshot or decoded stream frame, it must not be modified
+                afterwards.
+            color_format: Channel order of the frame.
+        """
+        if not cls.is_requested():
+            return
+        with cls._new_frame:
+            cls._frame = frame
+            cls._frame_format = color_format
+            cls._frame_number += 1
+            cls._new_frame.notify()
+
+    @classmethod
+    def add_match(cls, box: Box) -> None:
+        """Draw a template match onto the next frames."""
+        if cls.is_requested():
+            cls._matches.append((time.monotonic(), box))
+
+    @classmethod
+    def encode(
+        cls,
+        frame: np.ndarray,
+        color_format: ColorFormat = ColorFormat.BGR,
+        boxes: list[Box] | None = None,
+    ) -> bytes | None:
+        """Downscale the frame, draw the boxes and encode it as JPEG.
+
+        Returns:
+            bytes | None: JPEG data, None if encoding failed.
+        """
+        scale = min(1.0, cls.max_size / max(frame.shape[:2]))
+        if scale < 1.0:
+            image = cv2.resize(
+                frame,
+                (round(frame.shape[1] * scale), round(frame.shape[0] * scale)),
+                interpolation=cv2.INTER_AREA,
+            )
+        else:
+            image = frame.copy()
+        if color_format == ColorFormat.RGB:
+            image = cv2.cvtColor(image, cv2.COLOR_RGB2BGR)
+        for box in boxes or []:
+            cv2.rectangle(
+                image,
+                (round(box.left * scale), round(box.top * scale)),
+                (
+                    round((box.left + box.width) * scale),
+                    round((box.top + box.height) * scale),
+                ),
+                _BOX_COLOR_BGR,
+                2,
+            )
+        success, data = cv2.imencode(
+            ".jpg", image, [cv2.IMWRITE_JPEG_QUALITY, cls.jpeg_quality]
+        )
+        return data.tobytes() if success else None
+
+    @classmethod
+    def _recent_matches(cls) -> list[Box]:
+        oldest = time.monotonic() - cls.match_box_lifetime
+        return [box for found_at, box in list(cls._matches) if found_at >= oldest]
+
+    @classmethod
+    def _run(cls) -> None:
+        published = 0
+        while True:
+            requested = cls._requested
+            if requested is None or not requested.wait(timeout=1.0):
+                continue
+            started_at = time.monotonic()
+            with cls._new_frame:
+                cls._new_frame.wait_for(
+                    lambda: cls._frame_number != published, timeout=1.0
+                )
+                frame, color_format = cls._frame, cls._frame_format
+                published = cls._frame_number
+                cls._frame = None
+            if frame is not None and cls._message_queue is not None:
+                try:
+                    data = cls.encode(frame, color_format, cls._recent_matches())
+                    if data is not None:
+                        cls._message_queue.put({"preview_frame": data})
+                except Exception as e:
+                    logging.debug(f"Cannot publish preview frame: {e}")
+            time.sleep(max(0.0, 1 / cls.max_fps - (time.monotonic() - started_at)))
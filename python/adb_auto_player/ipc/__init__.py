@@ -19,6 +19,7 @@ from .constraint_factory import ConstraintFactory
 from .game_gui import GameGUIOptions
 from .log_message import LogLevel, LogMessage
 from .menu_option import MenuOption
+from .stream_stats import StreamStats
 from .summary import Summary
 
 __all__: list[str] = [
@@ -35,6 +36,7 @@ __all__: list[str] = [
     "MyCustomRoutineConstraintDict",
     "NumberConstraintDict",
     "SelectConstraintDict",
+    "StreamStats",
     "Summary",
     "TextConstraintDict",
 ]
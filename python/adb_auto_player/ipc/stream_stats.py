@@ -0,0 +1,25 @@
+"""IPC Stream Stats."""
+
+import json
+from dataclasses import asdict, dataclass
+
+
+@dataclass(frozen=True)
+class StreamStats:
+    """Throughput of a device stream since the previous stats."""
+
+    device: str
+    # Frames decoded per second.
+    fps: float
+    target_fps: int
+    frames_total: int
+    # Frames replaced by a newer one before anything read them.
+    dropped_frames: int
+
+    def to_dict(self) -> dict:
+        """Convert StreamStats to dictionary for JSON serialization."""
+        return {"stream_stats": asdict(self)}
+
+    def to_json(self) -> str:
+        """Convert StreamStats JSON."""
+        return json.dumps(self.to_dict())
@@ -3,10 +3,22 @@
 Separated from utils to prevent circular dependencies.
 """
 
+from .frame_channel import FrameChannel
+from .gui_options_cache import GameGUIData, GamePackageNames, GUIOptionsCache
 from .ipc_constraint_extractor import IPCConstraintExtractor
 from .ipc_model_converter import IPCModelConverter
+from .log_channel import EncodedMessage, LogChannel
+from .message_hub import HubTopic, MessageHub
 
 __all__ = [
+    "EncodedMessage",
+    "FrameChannel",
+    "GUIOptionsCache",
+    "GameGUIData",
+    "GamePackageNames",
+    "HubTopic",
     "IPCConstraintExtractor",
     "IPCModelConverter",
+    "LogChannel",
+    "MessageHub",
 ]
@@ -0,0 +1,102 @@
+"""Delivery of preview frames to one viewer at its own frame rate."""
+
+import asyncio
+import threading
+import time
+from collections.abc import Awaitable, Callable
+
+
+class FrameChannel:
+    """Newest frame of one viewer, sent at most max_fps times a second.
+
+    There is no queue, a frame arriving before the previous one was sent
+    replaces it. Frames are sent as they are so one encoded frame can be shared
+    by all viewers.
+    """
+
+    def __init__(
+        self,
+        send: Callable[[bytes], Awaitable[None]],
+        *,
+        max_fps: float = 5.0,
+        send_timeout: float = 5.0,
+    ):
+        """Init.
+
+        Args:
+            send: Sends one binary frame, e.g. WebSocket.send_bytes.
+            max_fps: Frames sent per second at most.
+            send_timeout: Seconds a frame may take, the channel closes after.
+        """
+        self.max_fps = max_fps
+        self.send_timeout = send_timeout
+        # Frames replaced before they were sent.
+        self.skipped = 0
+        self._send = send
+        self._lock = threading.Lock()
+        self._frame: bytes | None = None
+        self._closed = False
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._wakeup: asyncio.Event | None = None
+
+    def put(self, frame: bytes) -> bool:
+        """Replace the pending frame, can be called from any thread.
+
+        Returns:
+            bool: False if the channel is closed.
+        """
+        with self._lock:
+            if self._closed:
+                return False
+            if self._frame is not None:
+                self.skipped += 1
+            self._frame = frame
+        self._wake()
+        return True
+
+    async def run(self) -> None:
+        """Send frames until closed."""
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        if self._frame is not None:
+            self._wakeup.set()
+        try:
+            while not self._closed:
+                await self._wakeup.wait()
+                self._wakeup.clear()
+                with self._lock:
+                    frame, self._frame = self._frame, None
+                if frame is None:
+                    continue
+                sent_at = time.monotonic()
+                await asyncio.wait_for(self._send(frame), timeout=self.send_timeout)
+                await asyncio.sleep(
+                    max(0.0, 1 / self.max_fps - (time.monotonic() - sent_at))
+                )
+        except Exception as e:
+            print(f"Error sending preview frames: {e}")
+        finally:
+            with self._lock:
+                self._closed = True
+
+    def close(self) -> None:
+        """Stop sending, run returns."""
+        with self._lock:
+            self._closed = True
+        self._wake()
+
+    def _wake(self) -> None:
+        loop, wakeup = self._loop, self._wakeup
+        if loop is None or wakeup is None:
+            return
+        try:
+            if asyncio.get_running_loop() is loop:
+                wakeup.set()
+                return
+        except RuntimeError:
+            pass
+        try:
+            loop.call_soon_threadsafe(wakeup.set)
+        except RuntimeError:
+            # Event loop closed.
+            pass
@@ -0,0 +1,170 @@
+"""Game GUI options persisted between processes.
+
+Every CLI call and every server worker is a fresh process, building the GUI
+options walks the JSON schema of every game config and matching the running app
+instantiates every Game. Both are stored in the cache dir and reused as long as
+the fingerprint of the config models, registries and config files matches.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import sys
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+from adb_auto_player.ipc import GameGUIOptions, MenuOption
+from adb_auto_player.registries import COMMAND_REGISTRY, GAME_REGISTRY
+from adb_auto_player.settings import ConfigLoader
+
+_FILE_FORMAT_VERSION = 1
+
+
+@dataclass(frozen=True)
+class GamePackageNames:
+    """Package names identifying the app of a game."""
+
+    game_title: str
+    package_name: str | None
+    package_name_substrings: list[str]
+
+    def matches(self, package_name: str) -> bool:
+        """Whether the running app belongs to the game."""
+        return (
+            any(pn in package_name for pn in self.package_name_substrings)
+            or self.package_name == package_name
+        )
+
+
+@dataclass(frozen=True)
+class GameGUIData:
+    """Everything the GUI menu is built from."""
+
+    gui_options: list[GameGUIOptions]
+    game_packages: list[GamePackageNames]
+
+
+class GUIOptionsCache:
+    """JSON file holding GameGUIData and the fingerprint it was built for."""
+
+    def __init__(self, path: Path | None = None):
+        """Init.
+
+        Args:
+            path: JSON file, gui_options.json in the cache dir by default.
+        """
+        self.path = path or ConfigLoader.cache_dir() / "gui_options.json"
+
+    @staticmethod
+    def fingerprint(game_classes: list[type]) -> str:
+        """Hash of everything the GUI data is derived from.
+
+        Covers the registered games and commands, the schema and source of the
+        game config models, the source of the Game classes and the config files
+        menu labels are read from.
+
+        Args:
+            game_classes: Game classes the package names are taken from.
+
+        Returns:
+            str: Hex digest.
+        """
+        digest = hashlib.sha256()
+        for module, game in sorted(GAME_REGISTRY.items()):
+            digest.update(repr((module, game)).encode())
+            config_class = game.gui_metadata and game.gui_metadata.config_class
+            if config_class:
+                digest.update(repr(config_class.__pydantic_core_schema__).encode())
+                digest.update(_source_stamp(config_class).encode())
+            if game.config_file_path:
+                digest.update(
+                    _file_stamp(
+                        ConfigLoader.games_dir() / game.config_file_path
+                    ).encode()
+                )
+        for module, commands in sorted(COMMAND_REGISTRY.items()):
+            for name, command in commands.items():
+                digest.update(repr((module, name, command.menu_item)).encode())
+        for game_class in game_classes:
+            digest.update(_source_stamp(game_class).encode())
+        return digest.hexdigest()
+
+    def load(self, fingerprint: str) -> GameGUIData | None:
+        """Cached data, None if missing, invalid or built for another fingerprint."""
+        if not self.path.is_file():
+            return None
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+            if (
+                data.get("version") != _FILE_FORMAT_VERSION
+                or data.get("fingerprint") != fingerprint
+            ):
+                return None
+            return GameGUIData(
+                gui_options=[
+                    GameGUIOptions(
+                        **{
+                            **options,
+                            "menu_options": [
+                                MenuOption(**option)
+                                for option in options["menu_options"]
+                            ],
+                        }
+                    )
+                    for options in data["gui_options"]
+                ],
+                game_packages=[
+                    GamePackageNames(**packages) for packages in data["game_packages"]
+                ],
+            )
+        except Exception as e:
+            logging.debug(f"Failed to load GUI options {self.path}: {e}")
+            return None
+
+    def save(self, fingerprint: str, gui_data: GameGUIData) -> None:
+        """Store the data for the fingerprint, replacing what was cached."""
+        data = {
+            "version": _FILE_FORMAT_VERSION,
+            "fingerprint": fingerprint,
+            "gui_options": [asdict(options) for options in gui_data.gui_options],
+            "game_packages": [asdict(packages) for packages in gui_data.game_packages],
+        }
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            # Workers may save at the same time, each writes its own file.
+            tmp_path = self.path.with_suffix(f".{os.getpid()}.tmp")
+            tmp_path.write_text(json.dumps(data), encoding="utf-8")
+            tmp_path.replace(self.path)
+        except Exception as e:
+            logging.debug(f"Failed to save GUI options {self.path}: {e}")
+
+    def invalidate(self) -> None:
+        """Delete the cached data, the next process rebuilds it."""
+        try:
+            self.path.unlink(missing_ok=True)
+        except OSError as e:
+            logging.debug(f"Failed to delete GUI options {self.path}: {e}")
+
+
+def _file_stamp(path: Path) -> str:
+    try:
+        stat = path.stat()
+    except OSError:
+        return f"{path}:missing"
+    return f"{path}:{stat.st_mtime_ns}:{stat.st_size}"
+
+
+def _source_stamp(cls: type) -> str:
+    """Modification stamps of the files defining the class and its bases.
+
+    Frozen builds have no source files, their code cannot change either.
+    """
+    stamps = []
+    for base in cls.__mro__:
+        module = sys.modules.get(base.__module__)
+        if not base.__module__.startswith("adb_auto_player") or module is None:
+            continue
+        file = getattr(module, "__file__", None)
+        stamps.append(_file_stamp(Path(file)) if file else base.__qualname__)
+    return ";".join(stamps)
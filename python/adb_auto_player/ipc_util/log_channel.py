@@ -0,0 +1,218 @@
+"""Bounded, batched delivery of log messages to a slow consumer."""
+
+import asyncio
+import heapq
+import itertools
+import json
+import threading
+from collections import Counter, deque
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any
+
+from adb_auto_player.ipc import LogLevel, LogMessage
+
+# Lower priorities are dropped first once the buffer is full.
+_LEVEL_PRIORITY: dict[str, int] = {
+    LogLevel.TRACE: 0,
+    LogLevel.DEBUG: 1,
+    LogLevel.INFO: 2,
+    LogLevel.WARNING: 3,
+    LogLevel.ERROR: 4,
+    LogLevel.FATAL: 5,
+}
+# Messages without level, e.g. summaries, are only dropped for each other.
+_HIGHEST_PRIORITY = len(_LEVEL_PRIORITY)
+
+
+@dataclass(frozen=True)
+class EncodedMessage:
+    """Message serialized once, to be put on any number of channels."""
+
+    text: str
+    level: str | None = None
+
+    @classmethod
+    def from_dict(cls, message: dict[str, Any]) -> "EncodedMessage":
+        """Serialize a LogMessage or Summary dict."""
+        return cls(json.dumps(message), message.get("level"))
+
+
+class LogChannel:
+    """Outbound log messages of one connection.
+
+    Messages are buffered and sent as one JSON array per batch, a single message
+    is sent as object. Once the buffer is full the oldest message of the lowest
+    level is dropped, DEBUG goes before INFO and so on. The number of dropped
+    messages is reported with the next batch.
+    """
+
+    default_max_buffered: int = 2000
+    default_batch_size: int = 200
+    default_flush_interval: float = 0.05
+
+    def __init__(
+        self,
+        send: Callable[[str], Awaitable[None]],
+        *,
+        max_buffered: int = default_max_buffered,
+        batch_size: int = default_batch_size,
+        flush_interval: float = default_flush_interval,
+        send_timeout: float = 5.0,
+    ):
+        """Init.
+
+        Args:
+            send: Sends one text frame, e.g. WebSocket.send_text.
+            max_buffered: Messages buffered while the consumer is slow.
+            batch_size: Messages per frame, a full batch is sent immediately.
+            flush_interval: Seconds messages are collected before sending.
+            send_timeout: Seconds a frame may take, the channel closes after.
+        """
+        self.max_buffered = max_buffered
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.send_timeout = send_timeout
+        self.dropped: Counter[str] = Counter()
+        self._send = send
+        self._lock = threading.Lock()
+        self._sequence = itertools.count()
+        self._buffers: list[deque[tuple[int, EncodedMessage]]] = [
+            deque() for _ in range(_HIGHEST_PRIORITY + 1)
+        ]
+        self._buffered = 0
+        self._unreported_drops: Counter[str] = Counter()
+        self._closed = False
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._wakeup: asyncio.Event | None = None
+
+    @property
+    def buffered(self) -> int:
+        """Messages waiting to be sent."""
+        return self._buffered
+
+    def put(self, message: dict[str, Any] | EncodedMessage) -> bool:
+        """Queue a message without blocking, can be called from any thread.
+
+        Args:
+            message: LogMessage or Summary dict, or the already encoded message.
+
+        Returns:
+            bool: False if the message was dropped.
+        """
+        if not isinstance(message, EncodedMessage):
+            message = EncodedMessage.from_dict(message)
+        level = message.level
+        priority = _LEVEL_PRIORITY.get(level, _HIGHEST_PRIORITY)  # type: ignore[arg-type]
+        with self._lock:
+            if self._closed:
+                return False
+            if self._buffered >= self.max_buffered and not self._drop_below(priority):
+                self._count_drop(level)
+                return False
+            self._buffers[priority].append((next(self._sequence), message))
+            self._buffered += 1
+            full_batch = self._buffered >= self.batch_size
+        if full_batch:
+            self._wake()
+        return True
+
+    async def run(self) -> None:
+        """Send batches until closed, the remaining messages are sent last."""
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        try:
+            while not self._closed:
+                try:
+                    await asyncio.wait_for(
+                        self._wakeup.wait(), timeout=self.flush_interval
+                    )
+                except TimeoutError:
+                    pass
+                self._wakeup.clear()
+                await self._flush()
+            await self._flush()
+        except Exception as e:
+            print(f"Error sending log messages: {e}")
+            with self._lock:
+                self._closed = True
+
+    def close(self) -> None:
+        """Stop accepting messages, run sends what is left and returns."""
+        with self._lock:
+            self._closed = True
+        self._wake()
+
+    async def _flush(self) -> None:
+        while True:
+            with self._lock:
+                batch = self._take(self.batch_size)
+                drops = self._unreported_drops
+                self._unreported_drops = Counter()
+            if drops:
+                batch.append(self._drop_report(drops))
+            if not batch:
+                return
+            if len(batch) == 1:
+                payload = batch[0].text
+            else:
+                payload = "[" + ",".join(message.text for message in batch) + "]"
+            await asyncio.wait_for(self._send(payload), timeout=self.send_timeout)
+
+    def _take(self, count: int) -> list[EncodedMessage]:
+        """Take the oldest messages over all levels in order."""
+        entries = list(
+            itertools.islice(heapq.merge(*self._buffers, key=lambda e: e[0]), count)
+        )
+        for sequence, _ in entries:
+            for buffer in self._buffers:
+                if buffer and buffer[0][0] == sequence:
+                    buffer.popleft()
+                    break
+        self._buffered -= len(entries)
+        return [message for _, message in entries]
+
+    def _drop_below(self, priority: int) -> bool:
+        """Drop the oldest message with at most the given priority."""
+        for buffer in self._buffers[: priority + 1]:
+            if buffer:
+                _, message = buffer.popleft()
+                self._buffered -= 1
+                self._count_drop(message.level)
+                return True
+        return False
+
+    def _count_drop(self, level: str | None) -> None:
+        level = level or "OTHER"
+        self.dropped[level] += 1
+        self._unreported_drops[level] += 1
+
+    def _wake(self) -> None:
+        loop, wakeup = self._loop, self._wakeup
+        if loop is None or wakeup is None:
+            return
+        try:
+            if asyncio.get_running_loop() is loop:
+                wakeup.set()
+                return
+        except RuntimeError:
+            pass
+        try:
+            loop.call_soon_threadsafe(wakeup.set)
+        except RuntimeError:
+            # Event loop closed.
+            pass
+
+    @staticmethod
+    def _drop_report(drops: Counter[str]) -> EncodedMessage:
+        details = ", ".join(f"{level}: {count}" for level, count in drops.items())
+        report = LogMessage(
+            level=LogLevel.WARNING,
+            message=(
+                f"{drops.total()} log messages were dropped because the "
+                f"connection could not keep up ({details})"
+            ),
+            timestamp=datetime.now(timezone.utc),
+        )
+        return EncodedMessage.from_dict(report.to_dict())
@@ -0,0 +1,105 @@
+"""Fan-out of server messages to any number of subscribers."""
+
+import threading
+from collections.abc import Iterable
+from enum import StrEnum, auto
+from typing import Any
+
+from .frame_channel import FrameChannel
+from .log_channel import EncodedMessage, LogChannel
+
+_Channel = LogChannel | FrameChannel
+
+
+class HubTopic(StrEnum):
+    """Kinds of messages subscribers can choose from."""
+
+    LOGS = auto()
+    SUMMARIES = auto()
+    STREAM_STATS = auto()
+    PREVIEW_FRAMES = auto()
+
+    @classmethod
+    def of(cls, message: dict[str, Any]) -> "HubTopic":
+        """Topic of a message forwarded from a command."""
+        if "summary_message" in message:
+            return cls.SUMMARIES
+        if "stream_stats" in message:
+            return cls.STREAM_STATS
+        if "preview_frame" in message:
+            return cls.PREVIEW_FRAMES
+        return cls.LOGS
+
+
+class MessageHub:
+    """Publishes messages to every subscriber of their topic.
+
+    Each subscriber has its own channel, so a slow subscriber only loses its
+    own messages. Messages are serialized once no matter how many subscribers
+    there are and publishing without subscribers costs a dict lookup. Preview
+    frames are already encoded and go to FrameChannels as they are.
+    """
+
+    def __init__(self):
+        """Init."""
+        self._lock = threading.Lock()
+        # Replaced instead of modified so publish can read without the lock.
+        self._subscribers: dict[HubTopic, tuple[_Channel, ...]] = {}
+
+    def subscribe(self, channel: _Channel, topics: Iterable[HubTopic]) -> None:
+        """Send messages of the given topics to the channel.
+
+        Args:
+            channel: Channel of the subscriber, the subscriber runs it.
+            topics: Topics to subscribe to.
+        """
+        with self._lock:
+            subscribers = dict(self._subscribers)
+            for topic in set(topics):
+                if channel not in subscribers.get(topic, ()):
+                    subscribers[topic] = (*subscribers.get(topic, ()), channel)
+            self._subscribers = subscribers
+
+    def unsubscribe(self, channel: _Channel) -> None:
+        """Stop sending messages to the channel."""
+        with self._lock:
+            self._subscribers = {
+                topic: remaining
+                for topic, channels in self._subscribers.items()
+                if (remaining := tuple(c for c in channels if c is not channel))
+            }
+
+    def has_subscribers(self, topic: HubTopic) -> bool:
+        """Whether messages of the topic would be delivered to anyone."""
+        return bool(self._subscribers.get(topic))
+
+    def publish(
+        self,
+        message: dict[str, Any] | EncodedMessage | bytes,
+        topic: HubTopic | None = None,
+    ) -> int:
+        """Put a message on the channels of all subscribers of its topic.
+
+        Can be called from any thread.
+
+        Args:
+            message: Message dict, the already encoded message or a JPEG frame
+                for HubTopic.PREVIEW_FRAMES.
+            topic: Topic of the message, derived from a message dict by default.
+
+        Raises:
+            ValueError: Encoded message or frame without topic.
+
+        Returns:
+            int: Number of subscribers the message was put on.
+        """
+        if topic is None:
+            if not isinstance(message, dict):
+                raise ValueError("Topic is required for encoded messages")
+            topic = HubTopic.of(message)
+        channels = self._subscribers.get(topic, ())
+        if channels and isinstance(message, dict):
+            message = EncodedMessage.from_dict(message)
+        for channel in channels:
+            channel.put(message)  # type: ignore[arg-type]
+        return len(channels)
@@ -1,6 +1,12 @@
 """Logging package."""
 
 from .log_presets import LogPreset
-from .logging_setup import LogHandlerType, MemoryLogHandler, setup_logging
+from .logging_setup import LogHandlerType, LogPipeline, MemoryLogHandler, setup_logging
 
-__all__ = ["LogHandlerType", "LogPreset", "MemoryLogHandler", "setup_logging"]
+__all__ = [
+    "LogHandlerType",
+    "LogPipeline",
+    "LogPreset",
+    "MemoryLogHandler",
+    "setup_logging",
+]
@@ -1,8 +1,12 @@
 """ADB Auto Player Logging Setup Module."""
 
+import atexit
 import logging
+import queue
 import sys
+import threading
 from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener
 from typing import ClassVar, Literal
 
 from adb_auto_player.ipc import LogMessage
@@ -16,7 +20,90 @@ from .log_presets import LogPreset
 
 
 class BaseLogHandler(logging.Handler):
-    """Base log handler with common functionality."""
+    """Base log handler with common functionality.
+
+    Lines are written without flushing, a LogPipeline flushes once its queue is
+    empty.
+    """
+
+    def flush(self) -> None:
+        """Flush stdout."""
+        sys.stdout.flush()
+
+
+class LogRecordQueueHandler(QueueHandler):
+    """Puts records on the queue of a LogPipeline and nothing else."""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """Render the message now, arguments may change before it is handled.
+
+        Unlike QueueHandler.prepare neither copies nor formats the record,
+        exc_info is kept for the source location.
+        """
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+
+class _DrainMarker:
+    """Queued by LogPipeline.drain, set once the records before it were handled."""
+
+    __slots__ = ("handled",)
+
+    def __init__(self) -> None:
+        self.handled = threading.Event()
+
+
+class _FlushingQueueListener(QueueListener):
+    def handle(self, record: logging.LogRecord | _DrainMarker) -> None:
+        if not isinstance(record, _DrainMarker):
+            super().handle(record)
+            if not self.queue.empty():
+                return
+        for handler in self.handlers:
+            handler.flush()
+        if isinstance(record, _DrainMarker):
+            record.handled.set()
+
+
+class LogPipeline:
+    """Runs log handlers on a dedicated thread.
+
+    Logging calls only enqueue the record, formatting, sanitizing, writing and
+    IPC messages of the handlers happen on the thread of the pipeline.
+    """
+
+    def __init__(self, *handlers: logging.Handler):
+        """Init.
+
+        Args:
+            *handlers: Handlers run on the pipeline thread.
+        """
+        self.queue: queue.SimpleQueue = queue.SimpleQueue()
+        self.handler = LogRecordQueueHandler(self.queue)
+        self._listener = _FlushingQueueListener(
+            self.queue, *handlers, respect_handler_level=True
+        )
+        self._running = False
+
+    def start(self) -> None:
+        """Start the pipeline thread."""
+        if not self._running:
+            self._listener.start()
+            self._running = True
+
+    def drain(self) -> None:
+        """Block until every record logged so far was handled."""
+        if self._running:
+            marker = _DrainMarker()
+            self.queue.put(marker)
+            marker.handled.wait()
+
+    def stop(self) -> None:
+        """Handle the remaining records and stop the pipeline thread."""
+        if self._running:
+            self._running = False
+            self._listener.stop()
 
 
 class TerminalLogHandler(BaseLogHandler):
@@ -53,8 +140,7 @@ class TerminalLogHandler(BaseLogHandler):
             f"{StringHelper.sanitize_path(record.getMessage())}"
             f"{self.COLORS['RESET']}"
         )
-        print(formatted_message)
-        sys.stdout.flush()
+        sys.stdout.write(formatted_message + "\n")
 
 
 class TextLogHandler(BaseLogHandler):
@@ -77,8 +163,7 @@ class TextLogHandler(BaseLogHandler):
             f"{TracebackHelper.format_debug_info(record)} "
             f"{StringHelper.sanitize_path(record.getMessage())}"
         )
-        print(formatted_message)
-        sys.stdout.flush()
+        sys.stdout.write(formatted_message + "\n")
 
 
 class MemoryLogHandler(logging.Handler):
@@ -118,6 +203,9 @@ class MemoryLogHandler(logging.Handler):
 
 LogHandlerType = Literal["terminal", "text", "raw"]
 
+# Pipeline of the handler added by setup_logging.
+_pipelines: list[LogPipeline] = []
+
 
 def setup_logging(handler_type: LogHandlerType, level: int | str) -> None:
     """Set up logging with specified handler type and level.
@@ -132,7 +220,7 @@ def setup_logging(handler_type: LogHandlerType, level: int | str) -> None:
     if "raw" == handler_type:
         return
 
-    for handler in logger.handlers:
+    for handler in logger.handlers[:]:
         logger.removeHandler(handler)
 
     handler_mapping = {
@@ -141,7 +229,13 @@ def setup_logging(handler_type: LogHandlerType, level: int | str) -> None:
     }
 
     handler_class = handler_mapping.get(handler_type)
-    if handler_class:
-        logger.addHandler(handler_class())
-    else:
+    if not handler_class:
         raise ValueError(f"Unknown handler type: {handler_type}")
+
+    while _pipelines:
+        _pipelines.pop().stop()
+    pipeline = LogPipeline(handler_class())
+    pipeline.start()
+    atexit.register(pipeline.stop)
+    _pipelines.append(pipeline)
+    logger.addHandler(pipeline.handler)
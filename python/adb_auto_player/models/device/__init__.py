@@ -1,3 +1,5 @@
+from .device_snapshot import DeviceSnapshot
 from .display import DisplayInfo, Orientation
+from .touchscreen import TouchscreenDevice
 
-__all__ = ["DisplayInfo", "Orientation"]
+__all__ = ["DeviceSnapshot", "DisplayInfo", "Orientation", "TouchscreenDevice"]
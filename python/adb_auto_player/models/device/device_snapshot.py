@@ -0,0 +1,30 @@
+import time
+from dataclasses import dataclass, field
+
+from .display import DisplayInfo
+
+
+@dataclass(frozen=True)
+class DeviceSnapshot:
+    """Data class containing the device state captured by a single probe.
+
+    Display and emulator detection do not change while the bot is running, the
+    running app is only current at the time of the probe.
+    """
+
+    display_info: DisplayInfo
+    running_app: str | None
+    is_emulator: bool
+    captured_at: float = field(default_factory=time.monotonic)
+
+    @property
+    def age(self) -> float:
+        """Seconds since the snapshot was captured."""
+        return time.monotonic() - self.captured_at
+
+    def __str__(self) -> str:
+        """Return a string representation of the snapshot."""
+        return (
+            f"DeviceSnapshot(display_info={self.display_info}, "
+            f"running_app={self.running_app}, is_emulator={self.is_emulator})"
+        )
@@ -0,0 +1,38 @@
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class TouchscreenDevice:
+    """Data class containing the evdev touchscreen of a device.
+
+    Axis ranges are in the touchscreens native coordinate space as reported by
+    `getevent -pl`.
+    """
+
+    path: str
+    name: str
+    x_min: int
+    x_max: int
+    y_min: int
+    y_max: int
+    has_slot: bool = False
+    has_pressure: bool = False
+    has_touch_major: bool = False
+    has_btn_touch: bool = False
+
+    @property
+    def width(self) -> int:
+        """Number of distinct values on the x-axis."""
+        return self.x_max - self.x_min + 1
+
+    @property
+    def height(self) -> int:
+        """Number of distinct values on the y-axis."""
+        return self.y_max - self.y_min + 1
+
+    def __str__(self) -> str:
+        """Return a string representation of the touchscreen."""
+        return (
+            f"TouchscreenDevice(path={self.path}, name={self.name}, "
+            f"x=[{self.x_min}, {self.x_max}], y=[{self.y_min}, {self.y_max}])"
+        )
@@ -1,9 +1,63 @@
 """OCR."""
 
+from .mosaic import Mosaic, build_mosaic
+from .native_tesseract_backend import (
+    NativeTesseractBackend,
+    create_tesseract_backend,
+    is_native_tesseract_available,
+)
+from .numeric_reader import NumberReading, NumberSource, NumericReader
+from .ocr_cache import OCRCache, OCRCacheStats, get_default_ocr_cache
+from .ocr_document import GroupingLevel, OCRDocument
+from .ocr_executor import (
+    OCRExecutor,
+    get_ocr_executor,
+    submit_ocr,
+    wait_first,
+)
+from .preprocessing import (
+    OCRPreprocessConfig,
+    OCRPreprocessor,
+    PreprocessResult,
+    TextRegionDetector,
+    find_text_regions,
+)
+from .signature_store import SignatureMatch, TextSignatureStore, text_signature
 from .tesseract_backend import TesseractBackend
 from .tesseract_config import TesseractConfig
 from .tesseract_lang import Lang
 from .tesseract_oem import OEM
 from .tesseract_psm import PSM
 
-__all__ = ["OEM", "PSM", "Lang", "TesseractBackend", "TesseractConfig"]
+__all__ = [
+    "OEM",
+    "PSM",
+    "GroupingLevel",
+    "Lang",
+    "Mosaic",
+    "NativeTesseractBackend",
+    "NumberReading",
+    "NumberSource",
+    "NumericReader",
+    "OCRCache",
+    "OCRCacheStats",
+    "OCRDocument",
+    "OCRExecutor",
+    "OCRPreprocessConfig",
+    "OCRPreprocessor",
+    "PreprocessResult",
+    "SignatureMatch",
+    "TesseractBackend",
+    "TesseractConfig",
+    "TextRegionDetector",
+    "TextSignatureStore",
+    "build_mosaic",
+    "create_tesseract_backend",
+    "find_text_regions",
+    "get_default_ocr_cache",
+    "get_ocr_executor",
+    "is_native_tesseract_available",
+    "submit_ocr",
+    "text_signature",
+    "wait_first",
+]
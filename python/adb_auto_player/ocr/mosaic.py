@@ -0,0 +1,133 @@
+"""Pack several regions of an image into one image for a single OCR run."""
+
+from dataclasses import dataclass
+
+import numpy as np
+from adb_auto_player.models.geometry import Box, Point
+
+from .ocr_document import OCRDocument
+
+# Blank space between tiles, large enough for Tesseract to never join text of
+# neighbouring tiles into one line or word.
+DEFAULT_MOSAIC_PADDING = 24
+
+
+@dataclass(frozen=True)
+class Mosaic:
+    """Regions stacked vertically with padding in between."""
+
+    image: np.ndarray
+    # Top left corner of each region in the mosaic, same order as the regions.
+    origins: tuple[Point, ...]
+    regions: tuple[Box, ...]
+
+    def tile_of(self, points: np.ndarray) -> np.ndarray:
+        """Index of the tile containing each point, -1 for padding.
+
+        Args:
+            points: (n, 2) x, y coordinates in the mosaic.
+
+        Returns:
+            np.ndarray: (n,) tile indices.
+        """
+        tiles = np.full(len(points), -1, dtype=np.int64)
+        for index, (origin, region) in enumerate(zip(self.origins, self.regions)):
+            inside = (
+                (points[:, 0] >= origin.x)
+                & (points[:, 0] < origin.x + region.width)
+                & (points[:, 1] >= origin.y)
+                & (points[:, 1] < origin.y + region.height)
+            )
+            tiles[inside] = index
+        return tiles
+
+    def split(self, document: OCRDocument) -> list[OCRDocument]:
+        """Split the document of the mosaic into one document per region.
+
+        Words are assigned to the tile containing their center, boxes are
+        clipped to the tile and translated to source image coordinates.
+
+        Args:
+            document: OCRDocument of the mosaic image.
+
+        Returns:
+            list[OCRDocument]: Same order as the regions.
+        """
+        boxes = document.boxes.astype(np.int64)
+        tiles = self.tile_of(boxes[:, :2] + boxes[:, 2:] // 2)
+
+        documents = []
+        for index, (origin, region) in enumerate(zip(self.origins, self.regions)):
+            mask = tiles == index
+            tile_boxes = boxes[mask]
+            left = np.clip(tile_boxes[:, 0], origin.x, origin.x + region.width)
+            top = np.clip(tile_boxes[:, 1], origin.y, origin.y + region.height)
+            right = np.clip(
+                tile_boxes[:, 0] + tile_boxes[:, 2], origin.x, origin.x + region.width
+            )
+            bottom = np.clip(
+                tile_boxes[:, 1] + tile_boxes[:, 3], origin.y, origin.y + region.height
+            )
+            source_boxes = np.column_stack(
+                [
+                    left - origin.x + region.left,
+                    top - origin.y + region.top,
+                    right - left,
+                    bottom - top,
+                ]
+            )
+            documents.append(document.select(mask, source_boxes))
+        return documents
+
+
+def _border_fill(crop: np.ndarray) -> np.ndarray:
+    """Median color of the crop border, padding blends in with the background."""
+    border = np.concatenate(
+        [crop[0], crop[-1], crop[:, 0], crop[:, -1]],
+        axis=0,
+    )
+    return np.median(border, axis=0).astype(crop.dtype)
+
+
+def build_mosaic(
+    image: np.ndarray,
+    regions: list[Box],
+    padding: int = DEFAULT_MOSAIC_PADDING,
+) -> Mosaic:
+    """Stack regions of an image vertically into one padded image.
+
+    Args:
+        image: Source image, grayscale or color.
+        regions: Regions of the source image, must lie within it.
+        padding: Space around each region.
+
+    Returns:
+        Mosaic: Image and tile positions.
+
+    Raises:
+        ValueError: No regions or a region outside the image.
+    """
+    if not regions:
+        raise ValueError("No regions to build a mosaic from")
+
+    height, width = image.shape[:2]
+    for region in regions:
+        if region.right > width or region.bottom > height:
+            raise ValueError(f"{region} is outside of the image {width}x{height}")
+
+    mosaic_width = max(region.width for region in regions) + 2 * padding
+    mosaic_height = sum(region.height + padding for region in regions) + padding
+    mosaic = np.empty((mosaic_height, mosaic_width, *image.shape[2:]), image.dtype)
+
+    origins = []
+    y = 0
+    for region in regions:
+        crop = image[region.top : region.bottom, region.left : region.right]
+        slot_height = region.height + padding + (padding if y == 0 else 0)
+        mosaic[y : y + slot_height] = _border_fill(crop)
+        top = y + (padding if y == 0 else 0)
+        mosaic[top : top + region.height, padding : padding + region.width] = crop
+        origins.append(Point(padding, top))
+        y += slot_height
+
+    return Mosaic(image=mosaic, origins=tuple(origins), regions=tuple(regions))
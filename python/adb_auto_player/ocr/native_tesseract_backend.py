@@ -0,0 +1,348 @@
+"""In-process Tesseract OCR backend using the libtesseract C API.
+
+pytesseract writes a temporary image, spawns a tesseract process and loads the
+traineddata for every call. This backend binds libtesseract with ctypes instead
+and keeps one initialized engine per (lang, oem, psm) for the whole session.
+"""
+
+import ctypes
+import ctypes.util
+import logging
+import os
+import platform
+import threading
+from functools import lru_cache
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+from adb_auto_player.settings import ConfigLoader
+
+from .ocr_cache import OCRCache, get_default_ocr_cache
+from .tesseract_backend import TesseractBackend
+from .tesseract_config import TesseractConfig
+from .tesseract_lang import Lang
+
+# Column order of TessBaseAPIGetTsvText, same as `tesseract ... tsv`.
+TSV_COLUMNS = (
+    "level",
+    "page_num",
+    "block_num",
+    "par_num",
+    "line_num",
+    "word_num",
+    "left",
+    "top",
+    "width",
+    "height",
+    "conf",
+    "text",
+)
+_INT_COLUMNS = frozenset(TSV_COLUMNS[:10])
+_GRAYSCALE_NDIM = 2
+_COLOR_NDIM = 3
+_SUPPORTED_CHANNELS = (3, 4)  # RGB, RGBA
+
+
+def _library_candidates() -> list[str | Path]:
+    if platform.system() == "Windows":
+        binaries_dir = ConfigLoader.binaries_dir()
+        return [
+            binaries_dir / "tesseract" / "libtesseract-5.dll",
+            binaries_dir / "windows" / "tesseract" / "libtesseract-5.dll",
+        ]
+
+    candidates: list[str | Path] = []
+    if found := ctypes.util.find_library("tesseract"):
+        candidates.append(found)
+    if platform.system() == "Darwin":
+        candidates += [
+            "/opt/homebrew/lib/libtesseract.dylib",
+            "/usr/local/lib/libtesseract.dylib",
+        ]
+    else:
+        candidates += ["libtesseract.so.5", "libtesseract.so"]
+    return candidates
+
+
+def _declare_functions(lib: ctypes.CDLL) -> None:
+    handle = ctypes.c_void_p
+    signatures: dict[str, tuple[Any, list[Any]]] = {
+        "TessVersion": (ctypes.c_char_p, []),
+        "TessBaseAPICreate": (handle, []),
+        "TessBaseAPIDelete": (None, [handle]),
+        "TessBaseAPIEnd": (None, [handle]),
+        "TessBaseAPIInit2": (
+            ctypes.c_int,
+            [handle, ctypes.c_char_p, ctypes.c_char_p, ctypes.c_int],
+        ),
+        "TessBaseAPISetPageSegMode": (None, [handle, ctypes.c_int]),
+        "TessBaseAPISetImage": (
+            None,
+            [
+                handle,
+                ctypes.c_void_p,
+                ctypes.c_int,
+                ctypes.c_int,
+                ctypes.c_int,
+                ctypes.c_int,
+            ],
+        ),
+        "TessBaseAPIRecognize": (ctypes.c_int, [handle, ctypes.c_void_p]),
+        # Returned strings have to be freed with TessDeleteText, c_char_p would
+        # copy and drop the pointer.
+        "TessBaseAPIGetUTF8Text": (ctypes.c_void_p, [handle]),
+        "TessBaseAPIGetTsvText": (ctypes.c_void_p, [handle, ctypes.c_int]),
+        "TessBaseAPIClear": (None, [handle]),
+        "TessDeleteText": (None, [ctypes.c_void_p]),
+        "TessBaseAPIGetAvailableLanguagesAsVector": (ctypes.c_void_p, [handle]),
+        "TessDeleteTextArray": (None, [ctypes.c_void_p]),
+    }
+    for name, (restype, argtypes) in signatures.items():
+        function = getattr(lib, name)
+        function.restype = restype
+        function.argtypes = argtypes
+
+
+@lru_cache(maxsize=1)
+def _load_libtesseract() -> ctypes.CDLL:
+    """Load libtesseract once.
+
+    Raises:
+        RuntimeError: If libtesseract cannot be found or loaded.
+    """
+    errors: list[str] = []
+    for candidate in _library_candidates():
+        path = Path(candidate)
+        if path.is_absolute() and not path.is_file():
+            continue
+        try:
+            if platform.system() == "Windows":
+                # Dependencies (leptonica, ...) are shipped next to the dll.
+                os.add_dll_directory(str(path.parent))
+            lib = ctypes.CDLL(str(candidate))
+            _declare_functions(lib)
+            logging.debug(f"Loaded libtesseract: {candidate}")
+            return lib
+        except (OSError, AttributeError) as e:
+            errors.append(f"{candidate}: {e}")
+
+    raise RuntimeError(f"libtesseract not found: {errors}")
+
+
+def _tessdata_dir() -> str | None:
+    """Shipped tessdata on Windows, library default everywhere else."""
+    if os.getenv("TESSDATA_PREFIX") or platform.system() != "Windows":
+        return None
+    for tessdata in (
+        ConfigLoader.binaries_dir() / "tesseract" / "tessdata",
+        ConfigLoader.binaries_dir() / "windows" / "tesseract" / "tessdata",
+    ):
+        if tessdata.is_dir():
+            return str(tessdata)
+    return None
+
+
+def _take_string(lib: ctypes.CDLL, pointer: int | None) -> str:
+    """Copy a string allocated by libtesseract and free it."""
+    if not pointer:
+        return ""
+    try:
+        return ctypes.string_at(pointer).decode("utf-8", errors="replace")
+    finally:
+        lib.TessDeleteText(pointer)
+
+
+def _as_tesseract_image(image: np.ndarray) -> np.ndarray:
+    """Return a C-contiguous uint8 HxW or HxWxC array with 3 or 4 channels."""
+    if image.dtype != np.uint8:
+        image = image.astype(np.uint8)
+    if image.ndim == _COLOR_NDIM and image.shape[2] == 1:
+        image = image[:, :, 0]
+    if image.ndim == _GRAYSCALE_NDIM or (
+        image.ndim == _COLOR_NDIM and image.shape[2] in _SUPPORTED_CHANNELS
+    ):
+        return np.ascontiguousarray(image)
+    raise ValueError(f"Unsupported image shape: {image.shape}")
+
+
+def parse_tsv(tsv: str) -> dict[str, list[Any]]:
+    """Parse TSV output into the format of pytesseract.image_to_data.
+
+    Args:
+        tsv: TSV output without header line.
+
+    Returns:
+        dict[str, list[Any]]: Values per column.
+    """
+    data: dict[str, list[Any]] = {column: [] for column in TSV_COLUMNS}
+    for line in tsv.splitlines():
+        if not line:
+            continue
+        values = line.split("\t")
+        if len(values) < len(TSV_COLUMNS) - 1:
+            continue
+        values += [""] * (len(TSV_COLUMNS) - len(values))
+        for column, value in zip(TSV_COLUMNS, values):
+            if column in _INT_COLUMNS:
+                data[column].append(int(value))
+            elif column == "conf":
+                data[column].append(float(value))
+            else:
+                data[column].append(value)
+    return data
+
+
+class _TesseractEngine:
+    """Initialized TessBaseAPI handle, calls are serialized."""
+
+    def __init__(self, lib: ctypes.CDLL, config: TesseractConfig):
+        self._lib = lib
+        self._lock = threading.Lock()
+        self._handle = lib.TessBaseAPICreate()
+        tessdata = _tessdata_dir()
+        if lib.TessBaseAPIInit2(
+            self._handle,
+            tessdata.encode() if tessdata else None,
+            config.lang_string.encode(),
+            int(config.oem.value),
+        ):
+            lib.TessBaseAPIDelete(self._handle)
+            raise RuntimeError(
+                f"libtesseract failed to initialize {config}, tessdata: {tessdata}"
+            )
+        lib.TessBaseAPISetPageSegMode(self._handle, int(config.psm.value))
+
+    def recognize(self, image: np.ndarray, tsv: bool) -> str:
+        image = _as_tesseract_image(image)
+        height, width = image.shape[:2]
+        bytes_per_pixel = 1 if image.ndim == _GRAYSCALE_NDIM else image.shape[2]
+
+        with self._lock:
+            # No copy, tesseract reads the numpy buffer directly.
+            self._lib.TessBaseAPISetImage(
+                self._handle,
+                image.ctypes.data,
+                width,
+                height,
+                bytes_per_pixel,
+                image.strides[0],
+            )
+            try:
+                if self._lib.TessBaseAPIRecognize(self._handle, None):
+                    raise RuntimeError("libtesseract recognition failed")
+                if tsv:
+                    pointer = self._lib.TessBaseAPIGetTsvText(self._handle, 0)
+                else:
+                    pointer = self._lib.TessBaseAPIGetUTF8Text(self._handle)
+                return _take_string(self._lib, pointer)
+            finally:
+                self._lib.TessBaseAPIClear(self._handle)
+
+    def available_languages(self) -> list[str]:
+        with self._lock:
+            pointer = self._lib.TessBaseAPIGetAvailableLanguagesAsVector(self._handle)
+        if not pointer:
+            return []
+        try:
+            array = ctypes.cast(pointer, ctypes.POINTER(ctypes.c_char_p))
+            languages = []
+            i = 0
+            while array[i]:
+                languages.append(array[i].decode())
+                i += 1
+            return languages
+        finally:
+            self._lib.TessDeleteTextArray(pointer)
+
+
+@lru_cache(maxsize=1)
+def is_native_tesseract_available() -> bool:
+    """Whether libtesseract can be loaded, checked once."""
+    try:
+        _load_libtesseract()
+        return True
+    except RuntimeError as e:
+        logging.debug(f"In-process Tesseract unavailable: {e}")
+        return False
+
+
+@lru_cache
+def _get_engine(config: TesseractConfig) -> _TesseractEngine:
+    return _TesseractEngine(_load_libtesseract(), config)
+
+
+class NativeTesseractBackend(TesseractBackend):
+    """Tesseract OCR backend running libtesseract in-process."""
+
+    def __init__(
+        self,
+        config: TesseractConfig = TesseractConfig(),
+        cache: OCRCache | None = None,
+    ):
+        """Initialize native Tesseract backend.
+
+        Args:
+            config: TesseractConfig instance
+            cache: Optional OCRCache results are looked up in before running OCR
+
+        Raises:
+            RuntimeError: If libtesseract cannot be loaded or initialized.
+        """
+        self.config = config
+        self.cache = cache
+        _get_engine(config)
+
+    def _image_to_string(self, image: np.ndarray, config: TesseractConfig) -> str:
+        return _get_engine(config).recognize(image, tsv=False)
+
+    def _image_to_data(
+        self, image: np.ndarray, config: TesseractConfig
+    ) -> dict[str, list[Any]]:
+        return parse_tsv(_get_engine(config).recognize(image, tsv=True))
+
+    def get_backend_info(self) -> dict[str, Any]:
+        """Get information about the backend.
+
+        Returns:
+            Backend information dictionary
+        """
+        try:
+            version = _load_libtesseract().TessVersion().decode()
+        except Exception:
+            version = "Unknown"
+
+        return {
+            "name": "Tesseract (in-process)",
+            "version": version,
+            "config": self.config,
+            "supported_languages": self._get_supported_languages(),
+        }
+
+    def _get_supported_languages(self) -> list[str]:
+        try:
+            return sorted(_get_engine(self.config).available_languages())
+        except Exception:
+            return Lang.get_supported_languages()
+
+
+def create_tesseract_backend(
+    config: TesseractConfig = TesseractConfig(),
+    use_cache: bool = True,
+) -> TesseractBackend:
+    """Create the in-process backend, falls back to the pytesseract backend.
+
+    Args:
+        config: TesseractConfig instance
+        use_cache: Use the session wide OCRCache
+
+    Returns:
+        TesseractBackend: NativeTesseractBackend if libtesseract is available.
+    """
+    cache = get_default_ocr_cache() if use_cache else None
+    if is_native_tesseract_available():
+        try:
+            return NativeTesseractBackend(config, cache=cache)
+        except RuntimeError as e:
+            logging.debug(f"In-process Tesseract failed, using pytesseract: {e}")
+    return TesseractBackend(config, cache=cache)
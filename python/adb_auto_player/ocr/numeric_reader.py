@@ -0,0 +1,255 @@
+"""Glyph template based reader for numbers rendered in a fixed game font.
+
+Tesseract is slow and unreliable on stylized HUD fonts. Digits of a game are
+always rendered the same way though, after learning one template per glyph from
+a few labelled samples numbers can be read by correlating column segmented
+glyphs with the templates.
+"""
+
+import logging
+import re
+from dataclasses import dataclass
+from enum import StrEnum
+from pathlib import Path
+
+import cv2
+import numpy as np
+from adb_auto_player.image_manipulation import Color, ColorFormat
+from adb_auto_player.models import ConfidenceValue
+
+from .tesseract_backend import TesseractBackend
+from .tesseract_config import TesseractConfig
+from .tesseract_psm import PSM
+
+_MAX_PIXEL = 255
+# Glyphs are compared at this size (width, height).
+GLYPH_SIZE = (12, 20)
+
+
+class NumberSource(StrEnum):
+    """Where a NumberReading came from."""
+
+    GLYPHS = "glyphs"
+    TESSERACT = "tesseract"
+
+
+@dataclass(frozen=True)
+class NumberReading:
+    """Number read from an image."""
+
+    value: int
+    confidence: ConfidenceValue
+    text: str
+    source: NumberSource = NumberSource.GLYPHS
+
+
+def _binarize(image: np.ndarray) -> np.ndarray:
+    """Foreground mask, the minority class after Otsu thresholding is text."""
+    if not Color.is_grayscale(image):
+        image = Color.to_grayscale(image, ColorFormat.BGR)
+    _, mask = cv2.threshold(image, 0, _MAX_PIXEL, cv2.THRESH_BINARY | cv2.THRESH_OTSU)
+    foreground = mask > 0
+    if np.count_nonzero(foreground) > foreground.size / 2:
+        foreground = ~foreground
+    return foreground
+
+
+def segment_glyphs(image: np.ndarray, min_glyph_pixels: int = 4) -> list[np.ndarray]:
+    """Split an image of a single line of text into glyph masks.
+
+    Glyphs are separated by empty columns of the foreground mask.
+
+    Args:
+        image: Grayscale or BGR image containing one line of text.
+        min_glyph_pixels: Segments with fewer foreground pixels are noise.
+
+    Returns:
+        list[np.ndarray]: Boolean masks cropped to each glyph, left to right.
+    """
+    foreground = _binarize(image)
+    columns = foreground.any(axis=0).astype(np.int8)
+    # Rising and falling edges of the column projection.
+    edges = np.flatnonzero(np.diff(np.concatenate(([0], columns, [0]))))
+    glyphs = []
+    for start, end in zip(edges[::2], edges[1::2]):
+        glyph = foreground[:, start:end]
+        if np.count_nonzero(glyph) < min_glyph_pixels:
+            continue
+        rows = np.flatnonzero(glyph.any(axis=1))
+        glyphs.append(glyph[rows[0] : rows[-1] + 1])
+    return glyphs
+
+
+def _glyph_vectors(glyphs: list[np.ndarray]) -> np.ndarray:
+    """Resize, flatten and normalize glyphs for correlation, shape (n, d)."""
+    if not glyphs:
+        return np.zeros((0, GLYPH_SIZE[0] * GLYPH_SIZE[1]), dtype=np.float32)
+    vectors = np.stack(
+        [
+            cv2.resize(
+                glyph.astype(np.float32), GLYPH_SIZE, interpolation=cv2.INTER_AREA
+            ).ravel()
+            for glyph in glyphs
+        ]
+    )
+    vectors -= vectors.mean(axis=1, keepdims=True)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.maximum(norms, 1e-6)
+
+
+class NumericReader:
+    """Reads integers using glyph templates with Tesseract as fallback."""
+
+    def __init__(
+        self,
+        min_confidence: ConfidenceValue = ConfidenceValue("80%"),
+        fallback: TesseractBackend | None = None,
+    ):
+        """Init.
+
+        Args:
+            min_confidence: Glyph readings below this use the fallback.
+            fallback: Backend used when glyphs are unknown or uncertain.
+        """
+        self.min_confidence = min_confidence
+        self.fallback = fallback
+        self._sums: dict[str, np.ndarray] = {}
+        self._counts: dict[str, int] = {}
+        self._labels: list[str] = []
+        self._templates = _glyph_vectors([])
+
+    @property
+    def labels(self) -> list[str]:
+        """Characters with a template."""
+        return list(self._labels)
+
+    def learn(self, image: np.ndarray, text: str) -> bool:
+        """Add a labelled sample to the glyph templates.
+
+        Args:
+            image: Image of a single line of text.
+            text: The text in the image, whitespace is ignored.
+
+        Returns:
+            bool: False if the number of segmented glyphs does not match the text.
+        """
+        characters = [c for c in text if not c.isspace()]
+        glyphs = segment_glyphs(image)
+        if len(glyphs) != len(characters):
+            logging.debug(
+                f"Cannot learn '{text}': {len(glyphs)} glyphs for "
+                f"{len(characters)} characters"
+            )
+            return False
+
+        for character, vector in zip(characters, _glyph_vectors(glyphs)):
+            if character in self._sums:
+                self._sums[character] += vector
+                self._counts[character] += 1
+            else:
+                self._sums[character] = vector.copy()
+                self._counts[character] = 1
+        self._rebuild_templates()
+        return True
+
+    def read_text(self, image: np.ndarray) -> tuple[str, float]:
+        """Classify each glyph.
+
+        Args:
+            image: Image of a single line of text.
+
+        Returns:
+            tuple[str, float]: Text and the lowest glyph correlation (0.0-1.0),
+                confidence is 0.0 if nothing could be read.
+        """
+        glyphs = segment_glyphs(image)
+        if not glyphs or not self._labels:
+            return "", 0.0
+
+        scores = _glyph_vectors(glyphs) @ self._templates.T
+        best = scores.argmax(axis=1)
+        confidence = float(np.clip(scores[np.arange(len(best)), best].min(), 0, 1))
+        return "".join(self._labels[i] for i in best), confidence
+
+    def read(self, image: np.ndarray) -> NumberReading | None:
+        """Read an integer.
+
+        Args:
+            image: Image of a single number, separators like "," are ignored.
+
+        Returns:
+            NumberReading | None: None if neither glyphs nor fallback found one.
+        """
+        text, confidence = self.read_text(image)
+        digits = re.sub(r"\D", "", text)
+        if digits and confidence >= self.min_confidence.value:
+            return NumberReading(
+                value=int(digits),
+                confidence=ConfidenceValue(confidence),
+                text=text,
+            )
+
+        if self.fallback is None:
+            return None
+        return self._read_with_fallback(image, self.fallback)
+
+    def save(self, path: Path) -> None:
+        """Save the glyph templates.
+
+        Args:
+            path: .npz file.
+        """
+        path.parent.mkdir(parents=True, exist_ok=True)
+        np.savez_compressed(
+            path,
+            labels=np.array(self._labels),
+            sums=np.stack([self._sums[label] for label in self._labels])
+            if self._labels
+            else self._templates,
+            counts=np.array([self._counts[label] for label in self._labels]),
+        )
+
+    def load(self, path: Path) -> None:
+        """Load glyph templates, replacing learned ones.
+
+        Args:
+            path: .npz file created by save.
+        """
+        with np.load(path) as data:
+            self._sums = {
+                str(label): vector
+                for label, vector in zip(data["labels"], data["sums"])
+            }
+            self._counts = {
+                str(label): int(count)
+                for label, count in zip(data["labels"], data["counts"])
+            }
+        self._rebuild_templates()
+
+    def _rebuild_templates(self) -> None:
+        self._labels = sorted(self._sums)
+        if not self._labels:
+            self._templates = _glyph_vectors([])
+            return
+        templates = np.stack(
+            [self._sums[label] / self._counts[label] for label in self._labels]
+        )
+        norms = np.linalg.norm(templates, axis=1, keepdims=True)
+        self._templates = templates / np.maximum(norms, 1e-6)
+
+    @staticmethod
+    def _read_with_fallback(
+        image: np.ndarray, fallback: TesseractBackend
+    ) -> NumberReading | None:
+        document = fallback.recognize(image, TesseractConfig(psm=PSM.SINGLE_LINE))
+        digits = re.sub(r"\D", "", document.text)
+        if not digits:
+            return None
+        valid = document.confidences[document.confidences >= 0]
+        confidence = float(valid.mean()) / 100.0 if valid.size else 0.0
+        return NumberReading(
+            value=int(digits),
+            confidence=ConfidenceValue(confidence),
+            text=document.text,
+            source=NumberSource.TESSERACT,
+        )
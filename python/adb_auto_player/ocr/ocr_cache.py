@@ -0,0 +1,262 @@
+"""Content-addressed OCR result cache.
+
+The same popups and labels are recognized over and over during a session. Results
+are cached by a hash of the grayscale image region and the Tesseract config so
+repeated occurrences skip Tesseract entirely.
+"""
+
+import atexit
+import hashlib
+import json
+import logging
+import os
+import threading
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Any
+
+import cv2
+import numpy as np
+from adb_auto_player.util import Metrics
+
+_COLOR_NDIM = 3
+_RGB_CHANNELS = 3
+_RGBA_CHANNELS = 4
+# Perceptual hash is a difference hash of a (size + 1) x size thumbnail.
+_PHASH_SIZE = 16
+_SAVE_EVERY_N_INSERTS = 32
+
+
+@dataclass
+class OCRCacheStats:
+    """Lookup counters of an OCRCache."""
+
+    hits: int = 0
+    near_duplicate_hits: int = 0
+    misses: int = 0
+
+    @property
+    def lookups(self) -> int:
+        """Total number of lookups."""
+        return self.hits + self.near_duplicate_hits + self.misses
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of lookups served from the cache."""
+        if not self.lookups:
+            return 0.0
+        return (self.hits + self.near_duplicate_hits) / self.lookups
+
+    def __str__(self) -> str:
+        """Return a string representation of the stats."""
+        return (
+            f"{self.hit_rate:.1%} "
+            f"({self.hits + self.near_duplicate_hits}/{self.lookups})"
+        )
+
+
+@dataclass
+class _Entry:
+    value: Any
+    shape: tuple[int, ...]
+    phash: int
+
+
+def _to_grayscale(image: np.ndarray) -> np.ndarray:
+    if image.ndim != _COLOR_NDIM:
+        return image
+    if image.shape[2] == _RGB_CHANNELS:
+        return cv2.cvtColor(image, cv2.COLOR_RGB2GRAY)
+    if image.shape[2] == _RGBA_CHANNELS:
+        return cv2.cvtColor(image, cv2.COLOR_RGBA2GRAY)
+    return image[:, :, 0]
+
+
+def content_hash(gray: np.ndarray) -> str:
+    """Exact hash of the image content and shape."""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(str(gray.shape).encode())
+    digest.update(np.ascontiguousarray(gray).data)
+    return digest.hexdigest()
+
+
+def perceptual_hash(gray: np.ndarray) -> int:
+    """Difference hash, robust to small rendering and animation differences."""
+    thumbnail = cv2.resize(
+        gray.astype(np.uint8),
+        (_PHASH_SIZE + 1, _PHASH_SIZE),
+        interpolation=cv2.INTER_AREA,
+    )
+    bits = (thumbnail[:, 1:] > thumbnail[:, :-1]).flatten()
+    return int.from_bytes(np.packbits(bits).tobytes(), "big")
+
+
+class OCRCache:
+    """Bounded LRU cache of OCR results keyed by image content and config."""
+
+    default_max_entries: int = 512
+
+    def __init__(
+        self,
+        max_entries: int = default_max_entries,
+        persist_path: Path | None = None,
+        near_duplicate_max_distance: int = 0,
+    ):
+        """Init.
+
+        Args:
+            max_entries: Least recently used entries are evicted beyond this.
+            persist_path: JSON file the cache is loaded from and saved to.
+            near_duplicate_max_distance: Maximum Hamming distance of the
+                perceptual hashes for an image of the same shape to count as the
+                same image, 0 only allows exact matches.
+        """
+        self.max_entries = max_entries
+        self.persist_path = persist_path
+        self.near_duplicate_max_distance = near_duplicate_max_distance
+        self.stats = OCRCacheStats()
+        self._entries: OrderedDict[tuple[str, str], _Entry] = OrderedDict()
+        self._lock = threading.Lock()
+        self._unsaved_inserts = 0
+
+        if persist_path is not None:
+            self.load()
+            atexit.register(self.save)
+
+    def get_or_compute(
+        self, image: np.ndarray, config_key: str, compute: Callable[[], Any]
+    ) -> Any:
+        """Return the cached result for image and config or compute it.
+
+        Args:
+            image: Image region passed to OCR.
+            config_key: Everything besides the image that influences the result.
+            compute: Runs OCR on a miss, the result has to be JSON serializable
+                if the cache is persisted.
+
+        Returns:
+            Any: Cached or computed result.
+        """
+        gray = _to_grayscale(image)
+        key = (config_key, content_hash(gray))
+
+        with self._lock:
+            result = "hit"
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.stats.hits += 1
+            elif self.near_duplicate_max_distance > 0:
+                entry = self._find_near_duplicate(config_key, gray)
+                if entry is not None:
+                    self.stats.near_duplicate_hits += 1
+                    result = "near_duplicate"
+
+            if entry is None:
+                self.stats.misses += 1
+                result = "miss"
+        Metrics.increment("ocr_cache_lookups_total", result=result)
+
+        if entry is not None:
+            return entry.value
+
+        value = compute()
+        with self._lock:
+            self._entries[key] = _Entry(
+                value=value,
+                shape=tuple(gray.shape),
+                phash=perceptual_hash(gray),
+            )
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            self._unsaved_inserts += 1
+            should_save = (
+                self.persist_path is not None
+                and self._unsaved_inserts >= _SAVE_EVERY_N_INSERTS
+            )
+        if should_save:
+            self.save()
+        return value
+
+    def clear(self) -> None:
+        """Remove all entries and reset the stats."""
+        with self._lock:
+            self._entries.clear()
+            self.stats = OCRCacheStats()
+
+    def __len__(self) -> int:
+        """Number of cached entries."""
+        return len(self._entries)
+
+    def load(self) -> None:
+        """Load entries from persist_path, invalid files are ignored."""
+        if self.persist_path is None or not self.persist_path.is_file():
+            return
+        try:
+            data = json.loads(self.persist_path.read_text(encoding="utf-8"))
+            with self._lock:
+                for item in data[-self.max_entries :]:
+                    self._entries[(item["config"], item["hash"])] = _Entry(
+                        value=item["value"],
+                        shape=tuple(item["shape"]),
+                        phash=int(item["phash"], 16),
+                    )
+            logging.debug(f"Loaded {len(data)} OCR cache entries")
+        except Exception as e:
+            logging.debug(f"Failed to load OCR cache {self.persist_path}: {e}")
+
+    def save(self) -> None:
+        """Save entries to persist_path in least recently used order."""
+        if self.persist_path is None:
+            return
+        with self._lock:
+            data = [
+                {
+                    "config": config_key,
+                    "hash": image_hash,
+                    "shape": list(entry.shape),
+                    "phash": f"{entry.phash:x}",
+                    "value": entry.value,
+                }
+                for (config_key, image_hash), entry in self._entries.items()
+            ]
+            self._unsaved_inserts = 0
+        try:
+            self.persist_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.persist_path.with_suffix(".tmp")
+            tmp_path.write_text(json.dumps(data), encoding="utf-8")
+            tmp_path.replace(self.persist_path)
+        except Exception as e:
+            logging.debug(f"Failed to save OCR cache {self.persist_path}: {e}")
+
+    def _find_near_duplicate(self, config_key: str, gray: np.ndarray) -> _Entry | None:
+        phash = perceptual_hash(gray)
+        shape = tuple(gray.shape)
+        best_key = None
+        best_distance = self.near_duplicate_max_distance + 1
+        for key, entry in self._entries.items():
+            if key[0] != config_key or entry.shape != shape:
+                continue
+            distance = (entry.phash ^ phash).bit_count()
+            if distance < best_distance:
+                best_key, best_distance = key, distance
+
+        if best_key is None:
+            return None
+        self._entries.move_to_end(best_key)
+        return self._entries[best_key]
+
+
+@lru_cache(maxsize=1)
+def get_default_ocr_cache() -> OCRCache:
+    """Session wide OCR cache.
+
+    Persisted to the file in ADB_AUTO_PLAYER_OCR_CACHE_FILE if it is set.
+    """
+    cache_file = os.getenv("ADB_AUTO_PLAYER_OCR_CACHE_FILE")
+    return OCRCache(
+        persist_path=Path(cache_file).expanduser() if cache_file else None,
+    )
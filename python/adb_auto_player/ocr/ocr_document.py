@@ -0,0 +1,243 @@
+"""Structured result of a single Tesseract run."""
+
+from enum import IntEnum
+from typing import Any
+
+import numpy as np
+from adb_auto_player.models import ConfidenceValue
+from adb_auto_player.models.geometry import Box, Point
+from adb_auto_player.models.ocr import OCRResult
+
+
+class GroupingLevel(IntEnum):
+    """Text grouping levels, values match Tesseract's TSV level column."""
+
+    BLOCK = 2
+    PARAGRAPH = 3
+    LINE = 4
+    WORD = 5
+
+
+# Number of hierarchy id columns (page, block, par, line) forming a group key.
+_KEY_COLUMNS = {
+    GroupingLevel.BLOCK: 2,
+    GroupingLevel.PARAGRAPH: 3,
+    GroupingLevel.LINE: 4,
+}
+
+
+class OCRDocument:
+    """Words of one recognition run stored column-wise.
+
+    Words, lines, paragraphs and blocks are derived lazily from the same arrays,
+    callers needing several granularities pay for recognition only once.
+    """
+
+    def __init__(
+        self,
+        texts: np.ndarray,
+        confidences: np.ndarray,
+        boxes: np.ndarray,
+        hierarchy: np.ndarray,
+    ):
+        """Init.
+
+        Args:
+            texts: (n,) stripped word texts.
+            confidences: (n,) Tesseract confidences (0.0-100.0, -1 for non words).
+            boxes: (n, 4) left, top, width, height.
+            hierarchy: (n, 4) page_num, block_num, par_num, line_num.
+        """
+        self.texts = texts
+        self.confidences = confidences
+        self.boxes = boxes
+        self.hierarchy = hierarchy
+        self._views: dict[tuple[GroupingLevel, float], list[OCRResult]] = {}
+
+    @classmethod
+    def from_tesseract_data(cls, data: dict[str, list[Any]]) -> "OCRDocument":
+        """Create from the output of pytesseract.image_to_data.
+
+        Args:
+            data: Values per TSV column.
+
+        Returns:
+            OCRDocument: Only rows containing text are kept.
+        """
+        texts = np.array([str(text).strip() for text in data["text"]], dtype=object)
+        keep = texts != ""
+        return cls(
+            texts=texts[keep],
+            confidences=np.asarray(data["conf"], dtype=np.float32)[keep],
+            boxes=np.column_stack(
+                [
+                    np.asarray(data[column], dtype=np.int32)
+                    for column in ("left", "top", "width", "height")
+                ]
+            ).reshape(-1, 4)[keep],
+            hierarchy=np.column_stack(
+                [
+                    np.asarray(data[column], dtype=np.int32)
+                    for column in ("page_num", "block_num", "par_num", "line_num")
+                ]
+            ).reshape(-1, 4)[keep],
+        )
+
+    def select(self, mask: np.ndarray, boxes: np.ndarray) -> "OCRDocument":
+        """Document of the masked words with replaced boxes.
+
+        Args:
+            mask: (n,) words to keep.
+            boxes: (mask.sum(), 4) left, top, width, height of the kept words.
+
+        Returns:
+            OCRDocument: Views are computed independently of this document.
+        """
+        return OCRDocument(
+            texts=self.texts[mask],
+            confidences=self.confidences[mask],
+            boxes=boxes,
+            hierarchy=self.hierarchy[mask],
+        )
+
+    def __len__(self) -> int:
+        """Number of words."""
+        return len(self.texts)
+
+    @property
+    def text(self) -> str:
+        """All words joined, lines separated by newlines."""
+        return "\n".join(line.text for line in self.lines())
+
+    def words(
+        self, min_confidence: ConfidenceValue = ConfidenceValue(0.0)
+    ) -> list[OCRResult]:
+        """Words with bounding boxes.
+
+        Args:
+            min_confidence: Minimum confidence threshold, default no Threshold
+
+        Returns:
+            list[OCRResult]: Words in reading order.
+        """
+        return self._view(GroupingLevel.WORD, min_confidence)
+
+    def lines(
+        self, min_confidence: ConfidenceValue = ConfidenceValue(0.0)
+    ) -> list[OCRResult]:
+        """Lines with bounding boxes, see words."""
+        return self._view(GroupingLevel.LINE, min_confidence)
+
+    def paragraphs(
+        self, min_confidence: ConfidenceValue = ConfidenceValue(0.0)
+    ) -> list[OCRResult]:
+        """Paragraphs with bounding boxes, see words."""
+        return self._view(GroupingLevel.PARAGRAPH, min_confidence)
+
+    def blocks(
+        self, min_confidence: ConfidenceValue = ConfidenceValue(0.0)
+    ) -> list[OCRResult]:
+        """Blocks with bounding boxes, see words."""
+        return self._view(GroupingLevel.BLOCK, min_confidence)
+
+    def group(
+        self,
+        level: GroupingLevel,
+        min_confidence: ConfidenceValue = ConfidenceValue(0.0),
+    ) -> list[OCRResult]:
+        """Results for the given grouping level, see words."""
+        return self._view(level, min_confidence)
+
+    def _view(
+        self, level: GroupingLevel, min_confidence: ConfidenceValue
+    ) -> list[OCRResult]:
+        threshold = min_confidence.tesseract_format
+        key = (level, threshold)
+        if key not in self._views:
+            mask = self.confidences >= threshold
+            if level == GroupingLevel.WORD:
+                self._views[key] = self._build_words(mask)
+            else:
+                self._views[key] = self._build_groups(mask, _KEY_COLUMNS[level])
+        # Copy so callers cannot modify the cached view.
+        return list(self._views[key])
+
+    def _build_words(self, mask: np.ndarray) -> list[OCRResult]:
+        results = []
+        for text, (left, top, width, height) in zip(
+            self.texts[mask], self.boxes[mask].tolist()
+        ):
+            try:
+                box = Box(Point(x=left, y=top), width=width, height=height)
+            except ValueError:
+                # Skip invalid boxes
+                continue
+            # Word confidence has always been reported as 100%.
+            results.append(
+                OCRResult(text=text, confidence=ConfidenceValue(100), box=box)
+            )
+        return results
+
+    def _build_groups(self, mask: np.ndarray, key_columns: int) -> list[OCRResult]:
+        if not mask.any():
+            return []
+
+        keys = self.hierarchy[mask, :key_columns]
+        _, first_index, inverse = np.unique(
+            keys, axis=0, return_index=True, return_inverse=True
+        )
+        inverse = inverse.reshape(-1)
+        # np.unique sorts the keys, groups are returned in reading order.
+        order = np.argsort(first_index, kind="stable")
+        rank = np.empty_like(order)
+        rank[order] = np.arange(len(order))
+        group_ids = rank[inverse]
+        n_groups = len(order)
+
+        boxes = self.boxes[mask]
+        lefts = np.full(n_groups, np.iinfo(np.int32).max)
+        tops = np.full(n_groups, np.iinfo(np.int32).max)
+        rights = np.zeros(n_groups, dtype=np.int64)
+        bottoms = np.zeros(n_groups, dtype=np.int64)
+        np.minimum.at(lefts, group_ids, boxes[:, 0])
+        np.minimum.at(tops, group_ids, boxes[:, 1])
+        np.maximum.at(rights, group_ids, boxes[:, 0] + boxes[:, 2])
+        np.maximum.at(bottoms, group_ids, boxes[:, 1] + boxes[:, 3])
+
+        counts = np.bincount(group_ids, minlength=n_groups)
+        confidences = (
+            np.bincount(
+                group_ids,
+                weights=self.confidences[mask].astype(np.float64),
+                minlength=n_groups,
+            )
+            / counts
+            / 100.0
+        )
+
+        # Texts are joined in word order within each group.
+        word_order = np.argsort(group_ids, kind="stable")
+        texts = np.split(self.texts[mask][word_order], np.cumsum(counts)[:-1])
+
+        results = []
+        for group_texts, left, top, right, bottom, confidence in zip(
+            texts,
+            lefts.tolist(),
+            tops.tolist(),
+            rights.tolist(),
+            bottoms.tolist(),
+            confidences.tolist(),
+        ):
+            try:
+                box = Box(Point(x=left, y=top), width=right - left, height=bottom - top)
+                results.append(
+                    OCRResult(
+                        text=" ".join(group_texts),
+                        confidence=ConfidenceValue(confidence),
+                        box=box,
+                    )
+                )
+            except ValueError:
+                # Skip invalid boxes
+                continue
+        return results
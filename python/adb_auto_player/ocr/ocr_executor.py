@@ -0,0 +1,243 @@
+"""Run OCR in a pool of warm worker processes.
+
+OCR is the slowest perception primitive, running it on the bot thread blocks
+template matching and input. Work submitted here runs in parallel, callers get a
+Future and can take the next screenshot or match templates in the meantime.
+"""
+
+import atexit
+import logging
+import os
+import threading
+from collections import deque
+from collections.abc import Iterable
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    CancelledError,
+    Executor,
+    Future,
+    ProcessPoolExecutor,
+    wait,
+)
+from dataclasses import dataclass, field
+from functools import lru_cache, partial
+
+import numpy as np
+
+from .native_tesseract_backend import create_tesseract_backend
+from .ocr_document import OCRDocument
+from .tesseract_backend import TesseractBackend
+from .tesseract_config import TesseractConfig
+
+
+@lru_cache
+def _worker_backend(config: TesseractConfig) -> TesseractBackend:
+    # Each worker would keep a cache of its own, submit_ocr results are not cached.
+    return create_tesseract_backend(config, use_cache=False)
+
+
+def _warm_up(config: TesseractConfig) -> None:
+    """Initialize Tesseract once per worker instead of on the first request."""
+    try:
+        _worker_backend(config)
+    except Exception as e:
+        logging.debug(f"OCR worker warm up failed: {e}")
+
+
+def _recognize(image: np.ndarray, config: TesseractConfig) -> OCRDocument:
+    return _worker_backend(config).recognize(image, config)
+
+
+def default_worker_count() -> int:
+    """One worker per core, one core is left for the bot and the device stream."""
+    return max(1, (os.cpu_count() or 1) - 1)
+
+
+def wait_first(
+    futures: Iterable[Future], timeout: float | None = None
+) -> Future | None:
+    """Wait until the first of several futures is done.
+
+    Args:
+        futures: OCR requests or any other futures, e.g. template matching.
+        timeout: Seconds to wait, None waits forever.
+
+    Returns:
+        Future | None: First done future, None on timeout.
+    """
+    futures = list(futures)
+    for future in futures:
+        if future.done():
+            return future
+    done, _ = wait(futures, timeout=timeout, return_when=FIRST_COMPLETED)
+    if not done:
+        return None
+    # Prefer submission order if several finished at once.
+    return next(future for future in futures if future in done)
+
+
+@dataclass
+class _Request:
+    image: np.ndarray
+    config: TesseractConfig
+    tag: str | None
+    future: Future = field(default_factory=Future)
+
+
+class OCRExecutor:
+    """Process pool of warm Tesseract workers with a bounded queue.
+
+    Requests wait in a queue of the executor and are only handed to the pool when
+    a worker is free. The pool queues submitted calls itself, where they can no
+    longer be cancelled.
+    """
+
+    def __init__(
+        self,
+        max_workers: int | None = None,
+        max_pending: int | None = None,
+        warm_up_config: TesseractConfig = TesseractConfig(),
+        executor: Executor | None = None,
+    ):
+        """Init.
+
+        Args:
+            max_workers: Worker processes, defaults to default_worker_count().
+            max_pending: Requests submitted but not done. Once reached the
+                oldest request that has not started is cancelled, defaults to
+                twice the worker count.
+            warm_up_config: Config every worker initializes on start.
+            executor: Use this executor instead of creating a process pool.
+        """
+        self.max_workers = max_workers or default_worker_count()
+        self.max_pending = max_pending or 2 * self.max_workers
+        self._executor = executor or ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            initializer=_warm_up,
+            initargs=(warm_up_config,),
+        )
+        self._condition = threading.Condition()
+        self._queued: deque[_Request] = deque()
+        self._running = 0
+
+    def submit_ocr(
+        self,
+        image: np.ndarray,
+        config: TesseractConfig = TesseractConfig(),
+        tag: str | None = None,
+    ) -> "Future[OCRDocument]":
+        """Recognize an image in a worker.
+
+        Once max_pending requests are not done the oldest queued request is
+        cancelled. Blocks only if every pending request is already running.
+
+        Args:
+            image: Input image, sent to the worker process.
+            config: Tesseract config.
+            tag: Groups requests, e.g. the screen they were taken from, so they
+                can be cancelled together with cancel_stale.
+
+        Returns:
+            Future[OCRDocument]: Cancelled if it went stale before it started.
+        """
+        request = _Request(image, config, tag)
+        with self._condition:
+            while len(self._queued) + self._running >= self.max_pending:
+                if self._queued:
+                    self._queued.popleft().future.cancel()
+                    logging.debug("OCR queue full, cancelled oldest request")
+                else:
+                    # Every pending request is already running.
+                    self._condition.wait()
+            self._queued.append(request)
+            self._dispatch()
+        return request.future
+
+    def cancel_stale(self, tag: str | None = None) -> int:
+        """Cancel requests that have not started yet.
+
+        Call when the screen changed and queued results are of no use anymore.
+
+        Args:
+            tag: Only cancel requests with this tag, None cancels all.
+
+        Returns:
+            int: Number of cancelled requests.
+        """
+        with self._condition:
+            stale = [
+                request for request in self._queued if tag is None or request.tag == tag
+            ]
+            for request in stale:
+                self._queued.remove(request)
+            self._condition.notify_all()
+        return sum(1 for request in stale if request.future.cancel())
+
+    @property
+    def pending(self) -> int:
+        """Submitted requests that are not done."""
+        with self._condition:
+            return self._running + sum(
+                1 for request in self._queued if not request.future.cancelled()
+            )
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Cancel queued requests and stop the workers."""
+        with self._condition:
+            queued, self._queued = self._queued, deque()
+            self._condition.notify_all()
+        for request in queued:
+            request.future.cancel()
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+
+    def _dispatch(self) -> None:
+        """Hand queued requests to the pool while workers are free.
+
+        Called with the condition held.
+        """
+        while self._queued and self._running < self.max_workers:
+            request = self._queued.popleft()
+            if not request.future.set_running_or_notify_cancel():
+                continue
+            try:
+                worker_future = self._executor.submit(
+                    _recognize, request.image, request.config
+                )
+            except Exception as e:
+                request.future.set_exception(e)
+                continue
+            self._running += 1
+            worker_future.add_done_callback(partial(self._on_done, request.future))
+
+    def _on_done(self, future: Future, worker_future: Future) -> None:
+        with self._condition:
+            self._running -= 1
+            self._dispatch()
+            self._condition.notify_all()
+
+        if worker_future.cancelled():
+            future.set_exception(CancelledError())
+        elif (error := worker_future.exception()) is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(worker_future.result())
+
+
+@lru_cache(maxsize=1)
+def get_ocr_executor() -> OCRExecutor:
+    """Session wide OCR executor, started on first use."""
+    executor = OCRExecutor()
+    atexit.register(executor.shutdown, wait=False)
+    return executor
+
+
+def submit_ocr(
+    image: np.ndarray,
+    config: TesseractConfig = TesseractConfig(),
+    tag: str | None = None,
+) -> "Future[OCRDocument]":
+    """Recognize an image using the session wide OCR executor.
+
+    See OCRExecutor.submit_ocr.
+    """
+    return get_ocr_executor().submit_ocr(image, config, tag)
@@ -0,0 +1,244 @@
+"""Preprocessing of images before OCR.
+
+Screen regions passed to Tesseract are mostly background. Cropping to the text,
+binarizing and scaling the text to the size Tesseract was trained on makes
+recognition faster and usually more reliable.
+"""
+
+from dataclasses import dataclass
+from enum import StrEnum
+
+import cv2
+import numpy as np
+from adb_auto_player.image_manipulation import Color, ColorFormat
+from adb_auto_player.models.geometry import Box, Point
+from adb_auto_player.models.ocr import OCRResult
+
+_MAX_PIXEL = 255
+_MIDDLE_GRAY = 127
+
+
+class TextRegionDetector(StrEnum):
+    """Methods to locate text in an image."""
+
+    # Morphological gradient, Otsu threshold and horizontal closing. Fast and
+    # works well for lines of text on flat backgrounds.
+    GRADIENT = "gradient"
+    # Maximally stable extremal regions. Slower but more robust on busy
+    # backgrounds.
+    MSER = "mser"
+
+
+@dataclass(frozen=True)
+class OCRPreprocessConfig:
+    """Configuration of OCRPreprocessor.
+
+    Attributes:
+        crop_to_text: Crop to the bounding box of all detected text regions.
+        detector: Method used to detect text regions.
+        padding: Pixels kept around the detected text.
+        min_region_height: Regions lower than this are ignored as noise.
+        min_region_width: Regions narrower than this are ignored as noise.
+        binarize: Apply adaptive thresholding, output is black text on white.
+        block_size: Neighbourhood size of the adaptive threshold, has to be odd.
+        threshold_offset: Constant subtracted from the neighbourhood mean.
+        target_text_height: Text lines are rescaled to roughly this height in
+            pixels, None disables rescaling. Tesseract works best with a
+            capital letter height of 20-30 px.
+        min_scale: Lower bound of the rescale factor.
+        max_scale: Upper bound of the rescale factor.
+    """
+
+    crop_to_text: bool = True
+    detector: TextRegionDetector = TextRegionDetector.GRADIENT
+    padding: int = 8
+    min_region_height: int = 8
+    min_region_width: int = 8
+    binarize: bool = True
+    block_size: int = 31
+    threshold_offset: int = 15
+    target_text_height: int | None = 32
+    min_scale: float = 0.5
+    max_scale: float = 2.0
+
+
+@dataclass(frozen=True)
+class PreprocessResult:
+    """Preprocessed image and the transform from the source image."""
+
+    image: np.ndarray
+    # Top left corner of the crop in source image coordinates.
+    offset: Point
+    # Preprocessed pixels per source pixel.
+    scale: float
+    # Detected text regions in source image coordinates.
+    text_regions: tuple[Box, ...] = ()
+
+    @property
+    def has_text(self) -> bool:
+        """Whether text was detected, always True if detection was disabled."""
+        return self.image.size > 0
+
+    def to_source(self, result: OCRResult) -> OCRResult:
+        """Map an OCR result on the preprocessed image back to the source image.
+
+        Args:
+            result: OCRResult with coordinates in the preprocessed image.
+
+        Returns:
+            OCRResult: With coordinates in the source image.
+        """
+        if self.scale == 1.0:
+            return result.with_offset(self.offset)
+
+        top_left = Point(
+            int(result.box.top_left.x / self.scale) + self.offset.x,
+            int(result.box.top_left.y / self.scale) + self.offset.y,
+        )
+        box = Box(
+            top_left,
+            width=max(1, round(result.box.width / self.scale)),
+            height=max(1, round(result.box.height / self.scale)),
+        )
+        return OCRResult(result.text, result.confidence, box)
+
+
+def _to_grayscale(image: np.ndarray, color_format: ColorFormat) -> np.ndarray:
+    if Color.is_grayscale(image):
+        return image
+    return Color.to_grayscale(image, color_format)
+
+
+def _gradient_regions(gray: np.ndarray) -> list[tuple[int, int, int, int]]:
+    kernel = cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (3, 3))
+    gradient = cv2.morphologyEx(gray, cv2.MORPH_GRADIENT, kernel)
+    _, mask = cv2.threshold(
+        gradient, 0, _MAX_PIXEL, cv2.THRESH_BINARY | cv2.THRESH_OTSU
+    )
+    # Connect characters of the same line.
+    line_kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (9, 1))
+    mask = cv2.morphologyEx(mask, cv2.MORPH_CLOSE, line_kernel)
+    contours, _ = cv2.findContours(mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+    return [cv2.boundingRect(contour) for contour in contours]
+
+
+def _mser_regions(gray: np.ndarray) -> list[tuple[int, int, int, int]]:
+    _, boxes = cv2.MSER_create().detectRegions(gray)
+    return [tuple(int(v) for v in box) for box in boxes]  # type: ignore[misc]
+
+
+def find_text_regions(
+    gray: np.ndarray, config: OCRPreprocessConfig = OCRPreprocessConfig()
+) -> list[Box]:
+    """Detect regions likely containing text.
+
+    Args:
+        gray: Grayscale image.
+        config: Detection settings.
+
+    Returns:
+        list[Box]: Regions sorted top to bottom, left to right.
+    """
+    if config.detector == TextRegionDetector.MSER:
+        rects = _mser_regions(gray)
+    else:
+        rects = _gradient_regions(gray)
+
+    height, width = gray.shape[:2]
+    regions = [
+        Box(Point(x, y), width=w, height=h)
+        for x, y, w, h in rects
+        if config.min_region_height <= h < height
+        and config.min_region_width <= w
+        and not (w == width and h == height)
+    ]
+    return sorted(regions, key=lambda box: (box.top, box.left))
+
+
+def _union(regions: list[Box], padding: int, shape: tuple[int, ...]) -> Box:
+    height, width = shape[:2]
+    left = max(0, min(box.left for box in regions) - padding)
+    top = max(0, min(box.top for box in regions) - padding)
+    right = min(width, max(box.right for box in regions) + padding)
+    bottom = min(height, max(box.bottom for box in regions) + padding)
+    return Box(Point(left, top), width=right - left, height=bottom - top)
+
+
+def _binarize(gray: np.ndarray, config: OCRPreprocessConfig) -> np.ndarray:
+    # Tesseract expects dark text on a light background.
+    if np.mean(gray) < _MIDDLE_GRAY:
+        gray = cv2.bitwise_not(gray)
+    return cv2.adaptiveThreshold(
+        gray,
+        _MAX_PIXEL,
+        cv2.ADAPTIVE_THRESH_GAUSSIAN_C,
+        cv2.THRESH_BINARY,
+        config.block_size | 1,
+        config.threshold_offset,
+    )
+
+
+def _text_scale(regions: list[Box], config: OCRPreprocessConfig) -> float:
+    if config.target_text_height is None or not regions:
+        return 1.0
+    line_height = float(np.median([box.height for box in regions]))
+    scale = config.target_text_height / line_height
+    return float(np.clip(scale, config.min_scale, config.max_scale))
+
+
+class OCRPreprocessor:
+    """Crop, binarize and rescale images before OCR."""
+
+    def __init__(self, config: OCRPreprocessConfig = OCRPreprocessConfig()):
+        """Init.
+
+        Args:
+            config: Preprocessing settings.
+        """
+        self.config = config
+
+    def process(
+        self, image: np.ndarray, color_format: ColorFormat = ColorFormat.BGR
+    ) -> PreprocessResult:
+        """Preprocess an image.
+
+        Args:
+            image: BGR, RGB or grayscale image.
+            color_format: Channel order of color images.
+
+        Returns:
+            PreprocessResult: Empty image if text detection found nothing.
+        """
+        gray = _to_grayscale(image, color_format)
+        offset = Point(0, 0)
+        regions: list[Box] = []
+
+        if self.config.crop_to_text or self.config.target_text_height is not None:
+            regions = find_text_regions(gray, self.config)
+
+        if self.config.crop_to_text:
+            if not regions:
+                return PreprocessResult(image=gray[0:0, 0:0], offset=offset, scale=1.0)
+            crop = _union(regions, self.config.padding, gray.shape)
+            gray = gray[crop.top : crop.bottom, crop.left : crop.right]
+            offset = crop.top_left
+
+        scale = _text_scale(regions, self.config)
+        if scale != 1.0:
+            gray = cv2.resize(
+                gray,
+                None,
+                fx=scale,
+                fy=scale,
+                interpolation=cv2.INTER_CUBIC if scale > 1.0 else cv2.INTER_AREA,
+            )
+
+        if self.config.binarize:
+            gray = _binarize(gray, self.config)
+
+        return PreprocessResult(
+            image=np.ascontiguousarray(gray),
+            offset=offset,
+            scale=scale,
+            text_regions=tuple(regions),
+        )
@@ -0,0 +1,251 @@
+"""Recognize known text layouts without OCR.
+
+Game dialogs render the same text at the same size every time. Once OCR has
+identified a text region its perceptual signature is learned, later occurrences
+are recognized by comparing signatures which takes microseconds instead of a
+Tesseract run.
+
+A signature is an area averaged thumbnail of the ink of the text region, two
+signatures are compared by the share of ink they have in common. Unlike
+perceptual hashes this still tells apart texts differing in a single word.
+
+Signatures loaded from disk are unverified until OCR confirmed their label once,
+callers confirm or remove them on their first match.
+"""
+
+import base64
+import json
+import logging
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+
+import cv2
+import numpy as np
+from adb_auto_player.models import ConfidenceValue
+
+from .ocr_cache import _to_grayscale
+
+# Width, height of the thumbnail, text regions are wide.
+_SIGNATURE_SIZE = (64, 16)
+_LIGHT_BACKGROUND_MEAN = 127
+_FILE_FORMAT_VERSION = 1
+
+
+@dataclass(frozen=True)
+class SignatureMatch:
+    """Label of the closest learned signature."""
+
+    label: str
+    similarity: ConfidenceValue
+    # False until OCR confirmed the label since the signatures were loaded.
+    verified: bool = True
+
+
+def text_signature(image: np.ndarray) -> np.ndarray:
+    """Compact descriptor of a text region.
+
+    Args:
+        image: Text region, dark text on a light background or vice versa.
+
+    Returns:
+        np.ndarray: uint8 thumbnail of the ink, 1 KiB.
+    """
+    gray = _to_grayscale(image)
+    ink = 255 - gray if gray.mean() > _LIGHT_BACKGROUND_MEAN else gray
+    return cv2.resize(ink, _SIGNATURE_SIZE, interpolation=cv2.INTER_AREA)
+
+
+def _aspect_ratio(image: np.ndarray) -> float:
+    height, width = image.shape[:2]
+    return width / max(height, 1)
+
+
+class TextSignatureStore:
+    """Learned perceptual signatures of text regions mapped to labels."""
+
+    def __init__(
+        self,
+        persist_path: Path | None = None,
+        min_similarity: ConfidenceValue = ConfidenceValue("97%"),
+        ambiguity_margin: float = 0.02,
+        max_aspect_ratio_difference: float = 0.05,
+        max_signatures_per_label: int = 8,
+    ):
+        """Init.
+
+        Args:
+            persist_path: JSON file the signatures are loaded from and saved to.
+            min_similarity: Share of common ink to accept a match. A single
+                different character is around 94%, rendering noise above 98%.
+            ambiguity_margin: A match is rejected if a signature with another
+                label is less than this much less similar.
+            max_aspect_ratio_difference: Maximum relative difference of the width
+                to height ratio, text with another length never matches.
+            max_signatures_per_label: Variants kept per label, e.g. for dialogs
+                containing numbers. The oldest variant is replaced beyond this.
+        """
+        self.persist_path = persist_path
+        self.min_similarity = min_similarity
+        self.ambiguity_margin = ambiguity_margin
+        self.max_aspect_ratio_difference = max_aspect_ratio_difference
+        self.max_signatures_per_label = max_signatures_per_label
+        self._lock = threading.Lock()
+        self._labels: list[str] = []
+        self._aspect_ratios = np.empty(0, dtype=np.float64)
+        self._signatures = np.empty((0, *_SIGNATURE_SIZE[::-1]), dtype=np.uint8)
+        self._unverified: set[str] = set()
+
+        if persist_path is not None:
+            self.load()
+
+    def lookup(self, image: np.ndarray) -> SignatureMatch | None:
+        """Find the label of a text region.
+
+        Args:
+            image: Text region, preprocessed the same way as the learned ones.
+
+        Returns:
+            SignatureMatch | None: None if no signature is close enough or the
+                closest signatures disagree, run OCR in that case.
+        """
+        aspect_ratio = _aspect_ratio(image)
+        signature = text_signature(image)
+        with self._lock:
+            candidates = np.flatnonzero(
+                np.abs(self._aspect_ratios - aspect_ratio)
+                <= self.max_aspect_ratio_difference * aspect_ratio
+            )
+            if not candidates.size:
+                return None
+            similarities = self._similarities(candidates, signature)
+            labels = [self._labels[index] for index in candidates.tolist()]
+
+        order = np.argsort(-similarities, kind="stable")
+        best = int(order[0])
+        best_similarity = float(similarities[best])
+        if best_similarity < self.min_similarity:
+            return None
+        for index in order[1:].tolist():
+            if similarities[index] <= best_similarity - self.ambiguity_margin:
+                break
+            if labels[index] != labels[best]:
+                logging.debug(
+                    f"Ambiguous text signature: {labels[best]!r} or {labels[index]!r}"
+                )
+                return None
+        label = labels[best]
+        return SignatureMatch(
+            label, ConfidenceValue(best_similarity), label not in self._unverified
+        )
+
+    def add(self, image: np.ndarray, label: str) -> None:
+        """Learn the signature of a text region identified by OCR.
+
+        Args:
+            image: Text region, preprocessed the same way as future lookups.
+            label: Identifier of the text, e.g. the matched dialog message.
+        """
+        aspect_ratio = _aspect_ratio(image)
+        signature = text_signature(image)
+        with self._lock:
+            self._unverified.discard(label)
+            indices = [
+                i for i, existing in enumerate(self._labels) if existing == label
+            ]
+            if indices and (self._similarities(indices, signature) >= 1.0).any():
+                # Already known.
+                return
+            if len(indices) >= self.max_signatures_per_label:
+                self._delete(indices[0])
+            self._labels.append(label)
+            self._aspect_ratios = np.append(self._aspect_ratios, aspect_ratio)
+            self._signatures = np.concatenate([self._signatures, signature[None]])
+        self.save()
+
+    def confirm(self, label: str) -> None:
+        """Mark the signatures of a label as verified, e.g. after OCR agreed."""
+        with self._lock:
+            self._unverified.discard(label)
+
+    def remove(self, label: str) -> None:
+        """Forget all signatures of a label, e.g. after a wrong match."""
+        with self._lock:
+            for index in reversed(range(len(self._labels))):
+                if self._labels[index] == label:
+                    self._delete(index)
+            self._unverified.discard(label)
+        self.save()
+
+    def __len__(self) -> int:
+        """Number of learned signatures."""
+        return len(self._labels)
+
+    def load(self) -> None:
+        """Load signatures from persist_path, invalid files are ignored."""
+        if self.persist_path is None or not self.persist_path.is_file():
+            return
+        try:
+            data = json.loads(self.persist_path.read_text(encoding="utf-8"))
+            if data.get("version") != _FILE_FORMAT_VERSION:
+                return
+            signatures = data["signatures"]
+            with self._lock:
+                self._labels = [item["label"] for item in signatures]
+                self._aspect_ratios = np.array(
+                    [item["aspect_ratio"] for item in signatures], dtype=np.float64
+                )
+                self._signatures = np.array(
+                    [
+                        np.frombuffer(
+                            base64.b64decode(item["signature"]), dtype=np.uint8
+                        )
+                        for item in signatures
+                    ],
+                    dtype=np.uint8,
+                ).reshape(-1, *_SIGNATURE_SIZE[::-1])
+                self._unverified = set(self._labels)
+            logging.debug(f"Loaded {len(signatures)} text signatures")
+        except Exception as e:
+            logging.debug(f"Failed to load text signatures {self.persist_path}: {e}")
+
+    def save(self) -> None:
+        """Save signatures to persist_path."""
+        if self.persist_path is None:
+            return
+        with self._lock:
+            data = {
+                "version": _FILE_FORMAT_VERSION,
+                "signatures": [
+                    {
+                        "label": label,
+                        "aspect_ratio": float(aspect_ratio),
+                        "signature": base64.b64encode(signature.tobytes()).decode(),
+                    }
+                    for label, aspect_ratio, signature in zip(
+                        self._labels,
+                        self._aspect_ratios,
+                        self._signatures,
+                        strict=True,
+                    )
+                ],
+            }
+        try:
+            self.persist_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.persist_path.with_suffix(".tmp")
+            tmp_path.write_text(json.dumps(data, indent=2), encoding="utf-8")
+            tmp_path.replace(self.persist_path)
+        except Exception as e:
+            logging.debug(f"Failed to save text signatures {self.persist_path}: {e}")
+
+    def _similarities(self, indices, signature: np.ndarray) -> np.ndarray:
+        """Share of ink in common, 1 - sum(|a - b|) / sum(a + b)."""
+        learned = self._signatures[indices].astype(np.int32)
+        difference = np.abs(learned - signature).sum(axis=(1, 2))
+        total = (learned + signature).sum(axis=(1, 2))
+        return 1.0 - difference / np.maximum(total, 1)
+
+    def _delete(self, index: int) -> None:
+        del self._labels[index]
+        self._aspect_ratios = np.delete(self._aspect_ratios, index)
+        self._signatures = np.delete(self._signatures, index, axis=0)
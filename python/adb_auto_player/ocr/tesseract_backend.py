@@ -4,17 +4,20 @@ import logging
 import os
 import platform
 import subprocess
-from enum import IntEnum
 from functools import lru_cache
 from typing import Any
 
 import numpy as np
 import pytesseract
 from adb_auto_player.models import ConfidenceValue
-from adb_auto_player.models.geometry import Box, Point
+from adb_auto_player.models.geometry import Box
 from adb_auto_player.models.ocr import OCRResult
 from adb_auto_player.settings import ConfigLoader
+from adb_auto_player.util import Metrics
 
+from .ocr_cache import OCRCache
+from .mosaic import DEFAULT_MOSAIC_PADDING, build_mosaic
+from .ocr_document import GroupingLevel, OCRDocument
 from .tesseract_config import TesseractConfig
 from .tesseract_lang import Lang
 
@@ -23,14 +26,6 @@ _NUM_COLORS_IN_RGB = 3
 logging.getLogger("pytesseract").setLevel(logging.ERROR)
 
 
-class _GroupingLevel(IntEnum):
-    """Text grouping levels for OCR detection."""
-
-    BLOCK = 2
-    PARAGRAPH = 3
-    LINE = 4
-
-
 def _patch_subprocess_popen():
     """This is completely insane.
 
@@ -113,15 +108,21 @@ def _initialize_tesseract() -> None:
 class TesseractBackend:
     """Tesseract OCR backend implementation."""
 
-    def __init__(self, config: TesseractConfig = TesseractConfig()):
+    def __init__(
+        self,
+        config: TesseractConfig = TesseractConfig(),
+        cache: OCRCache | None = None,
+    ):
         """Initialize Tesseract backend.
 
         Args:
             config: TesseractConfig instance
+            cache: Optional OCRCache results are looked up in before running OCR
         """
         _initialize_tesseract()
 
         self.config = config
+        self.cache = cache
 
     def extract_text(
         self,
@@ -140,77 +141,36 @@ class TesseractBackend:
         if not config:
             config = self.config
 
-        text = pytesseract.image_to_string(
-            image=image,
-            config=config.config_string,
-            lang=config.lang_string,
-        ).strip()
-
-        return text
+        return self._cached_image_to_string(image, config).strip()
 
-    def detect_text(
+    def recognize(
         self,
         image: np.ndarray,
         config: TesseractConfig | None = None,
-        min_confidence: ConfidenceValue = ConfidenceValue(0.0),
-    ) -> list[OCRResult]:
-        """Detect text and return results with bounding boxes.
+    ) -> OCRDocument:
+        """Run OCR once, words, lines, paragraphs and blocks can be read from it.
 
         Args:
             image: Input RGB image as numpy array
             config: Optional TesseractConfig override
-            min_confidence: Minimum confidence threshold, default no Threshold
 
         Returns:
-            List of OCR results with bounding boxes
+            OCRDocument of the image
         """
         if not config:
             config = self.config
 
-        data = pytesseract.image_to_data(
-            image,
-            config=config.config_string,
-            lang=config.lang_string,
-            output_type=pytesseract.Output.DICT,
+        return OCRDocument.from_tesseract_data(
+            self._cached_image_to_data(image, config)
         )
 
-        results = []
-        n_boxes = len(data["text"])
-
-        for i in range(n_boxes):
-            # Skip empty text and low confidence results
-            text = data["text"][i].strip()
-            confidence = float(data["conf"][i])
-
-            if not text or confidence < min_confidence.tesseract_format:
-                continue
-
-            # Extract bounding box coordinates
-            x = int(data["left"][i])
-            y = int(data["top"][i])
-            width = int(data["width"][i])
-            height = int(data["height"][i])
-
-            try:
-                box = Box(Point(x=x, y=y), width=width, height=height)
-                result = OCRResult(
-                    text=text, confidence=ConfidenceValue(int(100.0)), box=box
-                )
-                results.append(result)
-
-            except ValueError:
-                # Skip invalid boxes
-                continue
-
-        return results
-
-    def detect_text_blocks(
+    def detect_text(
         self,
         image: np.ndarray,
         config: TesseractConfig | None = None,
         min_confidence: ConfidenceValue = ConfidenceValue(0.0),
-    ):
-        """Detect text blocks and return results with bounding boxes.
+    ) -> list[OCRResult]:
+        """Detect text and return results with bounding boxes.
 
         Args:
             image: Input RGB image as numpy array
@@ -218,124 +178,27 @@ class TesseractBackend:
             min_confidence: Minimum confidence threshold, default no Threshold
 
         Returns:
-            List of OCR results with text block bounding boxes
+            List of OCR results with bounding boxes
         """
-        return self._detect_text_grouping(
-            image,
-            config=config,
-            min_confidence=min_confidence,
-            level=_GroupingLevel.BLOCK,
-        )
+        return self.recognize(image, config).words(min_confidence)
 
-    def _detect_text_grouping(
+    def detect_text_blocks(
         self,
         image: np.ndarray,
         config: TesseractConfig | None = None,
         min_confidence: ConfidenceValue = ConfidenceValue(0.0),
-        level: int = _GroupingLevel.BLOCK,
-    ) -> list[OCRResult]:
-        if not config:
-            config = self.config
-
-        data = pytesseract.image_to_data(
-            image,
-            config=config.config_string,
-            lang=config.lang_string,
-            output_type=pytesseract.Output.DICT,
-        )
-
-        # Group by the specified level (block_num, par_num, etc.)
-        blocks: dict[tuple[Any, ...], dict[str, list[Any]]] = {}
-        n_boxes = len(data["text"])
-
-        for i in range(n_boxes):
-            text = data["text"][i].strip()
-            confidence = float(data["conf"][i])
-
-            if not text or confidence < min_confidence.tesseract_format:
-                continue
-
-            # Create grouping key based on level
-            group_key: tuple[Any, ...]
-            if level == _GroupingLevel.BLOCK:
-                group_key = (data["page_num"][i], data["block_num"][i])
-            elif level == _GroupingLevel.PARAGRAPH:
-                group_key = (
-                    data["page_num"][i],
-                    data["block_num"][i],
-                    data["par_num"][i],
-                )
-            elif level == _GroupingLevel.LINE:
-                group_key = (
-                    data["page_num"][i],
-                    data["block_num"][i],
-                    data["par_num"][i],
-                    data["line_num"][i],
-                )
-            else:
-                # Default to block level
-                group_key = (data["page_num"][i], data["block_num"][i])
-
-            if group_key not in blocks:
-                blocks[group_key] = {
-                    "texts": [],
-                    "confidences": [],
-                    "left": [],
-                    "top": [],
-                    "right": [],
-                    "bottom": [],
-                }
-
-            # Collect text and bounding box info
-            blocks[group_key]["texts"].append(text)
-            blocks[group_key]["confidences"].append(confidence / 100.0)
-
-            left = int(data["left"][i])
-            top = int(data["top"][i])
-            width = int(data["width"][i])
-            height = int(data["height"][i])
-
-            blocks[group_key]["left"].append(left)
-            blocks[group_key]["top"].append(top)
-            blocks[group_key]["right"].append(left + width)
-            blocks[group_key]["bottom"].append(top + height)
-
-        # Convert blocks to OCRResult objects
-        results = []
-        for block_data in blocks.values():
-            if not block_data["texts"]:
-                continue
-
-            # Combine all text in the block
-            combined_text = " ".join(block_data["texts"])
-
-            # Calculate average confidence
-            avg_confidence = sum(block_data["confidences"]) / len(
-                block_data["confidences"]
-            )
+    ):
+        """Detect text blocks and return results with bounding boxes.
 
-            # Calculate bounding box that encompasses all words in the block
-            min_x = min(block_data["left"])
-            min_y = min(block_data["top"])
-            max_x = max(block_data["right"])
-            max_y = max(block_data["bottom"])
-
-            width = max_x - min_x
-            height = max_y - min_y
-
-            try:
-                box = Box(Point(x=min_x, y=min_y), width=width, height=height)
-                result = OCRResult(
-                    text=combined_text,
-                    confidence=ConfidenceValue(avg_confidence),
-                    box=box,
-                )
-                results.append(result)
-            except ValueError:
-                # Skip invalid boxes
-                continue
+        Args:
+            image: Input RGB image as numpy array
+            config: Optional TesseractConfig override
+            min_confidence: Minimum confidence threshold, default no Threshold
 
-        return results
+        Returns:
+            List of OCR results with text block bounding boxes
+        """
+        return self.recognize(image, config).blocks(min_confidence)
 
     def detect_text_paragraphs(
         self,
@@ -353,12 +216,7 @@ class TesseractBackend:
         Returns:
             List of OCR results with paragraph bounding boxes
         """
-        return self._detect_text_grouping(
-            image,
-            config=config,
-            min_confidence=min_confidence,
-            level=_GroupingLevel.PARAGRAPH,
-        )
+        return self.recognize(image, config).paragraphs(min_confidence)
 
     def detect_text_lines(
         self,
@@ -376,11 +234,90 @@ class TesseractBackend:
         Returns:
             List of OCR results with line bounding boxes
         """
-        return self._detect_text_grouping(
+        return self.recognize(image, config).lines(min_confidence)
+
+    def detect_text_batch(
+        self,
+        image: np.ndarray,
+        rois: list[Box],
+        config: TesseractConfig | None = None,
+        min_confidence: ConfidenceValue = ConfidenceValue(0.0),
+        *,
+        level: GroupingLevel = GroupingLevel.WORD,
+        padding: int = DEFAULT_MOSAIC_PADDING,
+    ) -> list[list[OCRResult]]:
+        """Detect text in several regions of an image with a single OCR run.
+
+        The regions are stacked into one padded mosaic image, so the fixed cost
+        of a Tesseract invocation is only paid once.
+
+        Args:
+            image: Input RGB image as numpy array
+            rois: Regions of the image to detect text in
+            config: Optional TesseractConfig override, the page segmentation
+                mode has to allow multiple lines of text
+            min_confidence: Minimum confidence threshold, default no Threshold
+            level: Grouping of the results, groups never span multiple regions
+            padding: Space between regions in the mosaic
+
+        Returns:
+            OCR results per region in image coordinates, same order as rois
+        """
+        if not rois:
+            return []
+
+        mosaic = build_mosaic(image, rois, padding)
+        document = self.recognize(mosaic.image, config)
+        return [
+            roi_document.group(level, min_confidence)
+            for roi_document in mosaic.split(document)
+        ]
+
+    def _cached_image_to_string(
+        self, image: np.ndarray, config: TesseractConfig
+    ) -> str:
+        def compute() -> str:
+            with Metrics.timer("ocr_seconds", backend=type(self).__name__):
+                return self._image_to_string(image, config)
+
+        if self.cache is None:
+            return compute()
+        return self.cache.get_or_compute(
+            image, f"string {config.lang_string} {config.config_string}", compute
+        )
+
+    def _cached_image_to_data(
+        self, image: np.ndarray, config: TesseractConfig
+    ) -> dict[str, list[Any]]:
+        def compute() -> dict[str, list[Any]]:
+            with Metrics.timer("ocr_seconds", backend=type(self).__name__):
+                return self._image_to_data(image, config)
+
+        # Raw data is cached so every grouping level and confidence threshold
+        # shares the same entry.
+        if self.cache is None:
+            return compute()
+        return self.cache.get_or_compute(
+            image, f"data {config.lang_string} {config.config_string}", compute
+        )
+
+    def _image_to_string(self, image: np.ndarray, config: TesseractConfig) -> str:
+        """Run OCR and return the recognized text."""
+        return pytesseract.image_to_string(
+            image=image,
+            config=config.config_string,
+            lang=config.lang_string,
+        )
+
+    def _image_to_data(
+        self, image: np.ndarray, config: TesseractConfig
+    ) -> dict[str, list[Any]]:
+        """Run OCR and return the TSV columns, see pytesseract.image_to_data."""
+        return pytesseract.image_to_data(
             image,
-            config=config,
-            min_confidence=min_confidence,
-            level=_GroupingLevel.LINE,
+            config=config.config_string,
+            lang=config.lang_string,
+            output_type=pytesseract.Output.DICT,
         )
 
     def get_backend_info(self) -> dict[str, Any]:
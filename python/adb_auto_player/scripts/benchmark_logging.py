@@ -0,0 +1,183 @@
+"""Benchmark the cost of a logging call for the bot thread.
+
+Compares handlers called synchronously on the logging thread, flushing after
+every record like before, with the same handlers behind a LogPipeline. Terminal
+and text output goes to os.devnull, IPC messages to a multiprocessing Queue.
+
+The bot thread mostly waits for the device, the pipeline thread handles records
+meanwhile. Calls are therefore timed before the pipeline thread starts, the time
+until every record was handled is reported separately.
+
+Usage:
+    python -m adb_auto_player.scripts.benchmark_logging [--records 20000]
+"""
+
+import argparse
+import contextlib
+import logging
+import multiprocessing
+import os
+import statistics
+import sys
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+
+from adb_auto_player.log import LogPipeline
+from adb_auto_player.log.logging_setup import TerminalLogHandler, TextLogHandler
+from adb_auto_player.worker_pool import ProcessLogHandler
+
+
+class _FlushEveryRecord(logging.Handler):
+    """Runs a handler on the logging thread and flushes after every record."""
+
+    def __init__(self, handler: logging.Handler):
+        super().__init__()
+        self.handler = handler
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.handler.handle(record)
+        self.handler.flush()
+
+
+@dataclass(frozen=True)
+class BenchmarkResult:
+    """Cost of one logging call."""
+
+    name: str
+    # Time the logging thread spent per call.
+    call_us: float
+    # Time until every record was handled, per record.
+    total_us: float
+
+    def __str__(self) -> str:
+        """Return a one line summary."""
+        return (
+            f"{self.name}: {self.call_us:.1f} us per call, "
+            f"{self.total_us:.1f} us per record handled"
+        )
+
+
+def run_benchmark(
+    name: str,
+    handler: logging.Handler,
+    records: int,
+    *,
+    drain: Callable[[], None] = lambda: None,
+    pipeline: LogPipeline | None = None,
+    repeat: int = 5,
+) -> BenchmarkResult:
+    """Log records through the handler and measure the caller's time.
+
+    Args:
+        name: Name of the setup in the result.
+        handler: Handler attached to a dedicated logger.
+        records: Logging calls per run.
+        drain: Blocks until all records were handled.
+        pipeline: Pipeline of the handler, started after the calls.
+        repeat: Runs, the median is reported.
+
+    Returns:
+        BenchmarkResult: Median per record costs.
+    """
+    logger = logging.getLogger(f"benchmark_logging.{name}")
+    logger.propagate = False
+    logger.setLevel(logging.DEBUG)
+    logger.addHandler(handler)
+    call_times, total_times = [], []
+    try:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            for index in range(records):
+                logger.info(f"Battle {index} cleared, loading /home/user/file.png")
+            called = time.perf_counter()
+            if pipeline:
+                pipeline.start()
+                pipeline.drain()
+            drain()
+            done = time.perf_counter()
+            if pipeline:
+                pipeline.stop()
+            call_times.append((called - start) / records * 1e6)
+            total_times.append((done - start) / records * 1e6)
+    finally:
+        logger.removeHandler(handler)
+    return BenchmarkResult(
+        name, statistics.median(call_times), statistics.median(total_times)
+    )
+
+
+def _drain_queue(message_queue, records: int) -> Callable[[], None]:
+    def drain() -> None:
+        for _ in range(records):
+            message_queue.get()
+
+    return drain
+
+
+def _main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--records", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    floor = run_benchmark(
+        "logging call without handler work",
+        logging.NullHandler(),
+        args.records,
+        repeat=args.repeat,
+    )
+    results: list[tuple[BenchmarkResult, BenchmarkResult]] = []
+    with (
+        open(os.devnull, "w") as devnull,
+        contextlib.redirect_stdout(devnull),
+    ):
+        for name, handler_class in (
+            ("terminal", TerminalLogHandler),
+            ("text", TextLogHandler),
+        ):
+            before = run_benchmark(
+                f"{name} sync",
+                _FlushEveryRecord(handler_class()),
+                args.records,
+                repeat=args.repeat,
+            )
+            pipeline = LogPipeline(handler_class())
+            after = run_benchmark(
+                f"{name} pipeline",
+                pipeline.handler,
+                args.records,
+                pipeline=pipeline,
+                repeat=args.repeat,
+            )
+            results.append((before, after))
+
+        message_queue = multiprocessing.get_context().Queue()
+        before = run_benchmark(
+            "ipc sync",
+            ProcessLogHandler(message_queue),
+            args.records,
+            drain=_drain_queue(message_queue, args.records),
+            repeat=args.repeat,
+        )
+        pipeline = LogPipeline(ProcessLogHandler(message_queue))
+        after = run_benchmark(
+            "ipc pipeline",
+            pipeline.handler,
+            args.records,
+            drain=_drain_queue(message_queue, args.records),
+            pipeline=pipeline,
+            repeat=args.repeat,
+        )
+        results.append((before, after))
+
+    print(floor)
+    for before, after in results:
+        print(before)
+        print(after)
+        print(f"Logging thread speedup: {before.call_us / after.call_us:.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(_main())
@@ -0,0 +1,201 @@
+"""Benchmark OCR latency and accuracy with and without preprocessing.
+
+The corpus is a directory of images and a labels.json mapping file names to
+the expected text:
+
+    {"skip_battle.png": "Skip this battle?", ...}
+
+Usage:
+    python -m adb_auto_player.scripts.benchmark_ocr_preprocessing <corpus_dir>
+"""
+
+import argparse
+import json
+import re
+import statistics
+import sys
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from difflib import SequenceMatcher
+from pathlib import Path
+
+import cv2
+import numpy as np
+from adb_auto_player.models import ConfidenceValue
+from adb_auto_player.ocr import (
+    PSM,
+    OCRPreprocessConfig,
+    OCRPreprocessor,
+    TesseractBackend,
+    TesseractConfig,
+    TextRegionDetector,
+    create_tesseract_backend,
+)
+from adb_auto_player.util import StringHelper
+
+
+@dataclass(frozen=True)
+class CorpusSample:
+    """Labelled image."""
+
+    name: str
+    image: np.ndarray
+    expected_text: str
+
+
+@dataclass
+class BenchmarkReport:
+    """Latency and accuracy of one pipeline over the corpus."""
+
+    name: str
+    latencies_ms: list[float] = field(default_factory=list)
+    similarities: list[float] = field(default_factory=list)
+    matches: int = 0
+    input_pixels: list[int] = field(default_factory=list)
+
+    @property
+    def samples(self) -> int:
+        """Number of recognized samples."""
+        return len(self.similarities)
+
+    @property
+    def match_rate(self) -> float:
+        """Fraction of samples matched the way popup messages are matched."""
+        return self.matches / self.samples if self.samples else 0.0
+
+    def __str__(self) -> str:
+        """Return a one line summary."""
+        if not self.samples:
+            return f"{self.name}: no samples"
+        return (
+            f"{self.name}: "
+            f"median {statistics.median(self.latencies_ms):.1f} ms, "
+            f"p95 {_percentile(self.latencies_ms, 95):.1f} ms, "
+            f"similarity {statistics.mean(self.similarities):.1%}, "
+            f"matched {self.matches}/{self.samples}, "
+            f"median input {statistics.median(self.input_pixels) / 1000:.0f} kpx"
+        )
+
+
+def _percentile(values: list[float], percentile: float) -> float:
+    return float(np.percentile(values, percentile))
+
+
+def _normalize(text: str) -> str:
+    return re.sub(r"\s+", " ", text).strip().lower()
+
+
+def load_corpus(directory: Path) -> list[CorpusSample]:
+    """Load labelled images.
+
+    Args:
+        directory: Directory containing the images and labels.json.
+
+    Returns:
+        list[CorpusSample]: Samples in labels.json order.
+    """
+    labels = json.loads((directory / "labels.json").read_text(encoding="utf-8"))
+    samples = []
+    for name, expected_text in labels.items():
+        image = cv2.imread((directory / name).as_posix())
+        if image is None:
+            print(f"Skipping unreadable image: {name}")
+            continue
+        samples.append(CorpusSample(name, image, expected_text))
+    return samples
+
+
+def run_benchmark(
+    name: str,
+    backend: TesseractBackend,
+    samples: list[CorpusSample],
+    preprocessor: OCRPreprocessor | None = None,
+    *,
+    repeat: int = 3,
+    timer: Callable[[], float] = time.perf_counter,
+) -> BenchmarkReport:
+    """Recognize every sample and measure preprocessing plus recognition time.
+
+    Args:
+        name: Name of the pipeline in the report.
+        backend: Backend used for recognition, should not use an OCRCache.
+        samples: Labelled images.
+        preprocessor: Applied before recognition, None sends the raw grayscale.
+        repeat: Runs per sample, the fastest one is reported.
+        timer: Clock used for measurements.
+
+    Returns:
+        BenchmarkReport: Results over all samples.
+    """
+    report = BenchmarkReport(name)
+    for sample in samples:
+        best = float("inf")
+        text = ""
+        pixels = 0
+        for _ in range(repeat):
+            start = timer()
+            if preprocessor is None:
+                image = cv2.cvtColor(sample.image, cv2.COLOR_BGR2GRAY)
+            else:
+                image = preprocessor.process(sample.image).image
+            text = backend.extract_text(image) if image.size else ""
+            best = min(best, (timer() - start) * 1000)
+            pixels = image.shape[0] * image.shape[1]
+
+        expected = _normalize(sample.expected_text)
+        recognized = _normalize(text)
+        report.latencies_ms.append(best)
+        report.input_pixels.append(pixels)
+        report.similarities.append(SequenceMatcher(None, recognized, expected).ratio())
+        if StringHelper.fuzzy_substring_match(
+            recognized, expected, ConfidenceValue("80%")
+        ):
+            report.matches += 1
+    return report
+
+
+def _main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("corpus", type=Path, help="Directory with labels.json")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument(
+        "--detector",
+        choices=[detector.value for detector in TextRegionDetector],
+        default=TextRegionDetector.GRADIENT.value,
+    )
+    args = parser.parse_args(argv)
+
+    samples = load_corpus(args.corpus)
+    if not samples:
+        print("Corpus is empty.")
+        return 1
+
+    backend = create_tesseract_backend(
+        TesseractConfig(psm=PSM.SINGLE_BLOCK), use_cache=False
+    )
+    preprocessor = OCRPreprocessor(
+        OCRPreprocessConfig(detector=TextRegionDetector(args.detector))
+    )
+    baseline = run_benchmark("grayscale", backend, samples, repeat=args.repeat)
+    preprocessed = run_benchmark(
+        "preprocessed", backend, samples, preprocessor, repeat=args.repeat
+    )
+
+    print(baseline)
+    print(preprocessed)
+    for sample, before, after in zip(
+        samples, baseline.similarities, preprocessed.similarities
+    ):
+        if after < before:
+            print(f"Regression on {sample.name}: {before:.1%} -> {after:.1%}")
+
+    speedup = statistics.median(baseline.latencies_ms) / max(
+        statistics.median(preprocessed.latencies_ms), 1e-9
+    )
+    print(f"Speedup: {speedup:.2f}x")
+    return 0 if preprocessed.matches >= baseline.matches else 1
+
+
+if __name__ == "__main__":
+    sys.exit(_main())
@@ -2,25 +2,50 @@
 
 import argparse
 import asyncio
+import contextvars
+import functools
 import json
 import logging
+import queue
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
 from contextvars import ContextVar
-from multiprocessing import Process, Queue
+from multiprocessing import Queue
+from multiprocessing.connection import wait as wait_for_objects
+from multiprocessing.process import BaseProcess
 
 from adb_auto_player.cli import ArgparseHelper
-from adb_auto_player.ipc import LogMessage
+from adb_auto_player.ipc import LogMessage, Summary
+from adb_auto_player.image_manipulation import PreviewPublisher
+from adb_auto_player.ipc_util import (
+    EncodedMessage,
+    FrameChannel,
+    GUIOptionsCache,
+    HubTopic,
+    LogChannel,
+    MessageHub,
+)
 from adb_auto_player.log import LogPreset, MemoryLogHandler
 from adb_auto_player.models.commands import Command
 from adb_auto_player.models.decorators import CacheGroup
 from adb_auto_player.registries import LRU_CACHE_REGISTRY
+from adb_auto_player.settings import ConfigLoader
 from adb_auto_player.util import (
     Execute,
     LogMessageFactory,
+    Metrics,
     StringHelper,
     SummaryGenerator,
 )
+from adb_auto_player.worker_pool import (
+    CommandResult,
+    CommandWorker,
+    CommandWorkerPool,
+)
 from fastapi import FastAPI, HTTPException, WebSocket, WebSocketDisconnect
+from fastapi.responses import PlainTextResponse
 from pydantic import BaseModel
 from starlette.requests import Request
 from starlette.websockets import WebSocketState
@@ -29,90 +54,60 @@ current_websocket: ContextVar[WebSocket | None] = ContextVar(
     "current_websocket", default=None
 )
 
+current_log_channel: ContextVar[LogChannel | None] = ContextVar(
+    "current_log_channel", default=None
+)
+
 current_request_handler: ContextVar[MemoryLogHandler | None] = ContextVar(
     "current_request_handler", default=None
 )
 
+# Upper bound of messages taken from the queue and sent to the WebSocket at once.
+MAX_MESSAGE_BATCH_SIZE = 256
 
-class ProcessLogHandler(logging.Handler):
-    """A logging handler that sends LogMessage objects to a queue for ipc."""
+# Threads executing /execute commands, commands for one device run one at a time.
+EXECUTE_COMMAND_THREADS = 4
+# Seconds an /execute command may take including waiting for the device.
+EXECUTE_COMMAND_TIMEOUT = 60.0
 
-    def __init__(self, message_queue):
-        super().__init__()
-        self.message_queue = message_queue
 
-    def emit(self, record):
-        """Convert log record to LogMessage and send to queue."""
-        try:
-            preset: LogPreset | None = getattr(record, "preset", None)
+def _forward_message(message: dict, hub: MessageHub | None = None) -> None:
+    """Send a command message to its WebSocket and to subscribers of the hub.
 
-            log_message: LogMessage = LogMessageFactory.create_log_message(
-                record=record,
-                message=StringHelper.sanitize_path(record.getMessage()),
-                html_class=preset.get_html_class() if preset else None,
-            )
-
-            self.message_queue.put(log_message.to_dict())
-        except Exception as e:
-            print(f"Failed to send log to queue: {e}")
-
-
-def run_command_in_process(
-    command: list[str], commands_dict: dict, message_queue: Queue
-):
-    """Function to run a command in a separate process.
-
-    This function will be executed in the child process.
+    The message is serialized once for all receivers and not at all if there
+    are none.
     """
-    try:
-        logger = logging.getLogger()
-
-        for handler in logger.handlers[:]:
-            logger.removeHandler(handler)
-
-        queue_handler = ProcessLogHandler(message_queue)
-        queue_handler.setLevel(logging.DEBUG)
-        logger.addHandler(queue_handler)
-        logger.setLevel(logging.DEBUG)
-        SummaryGenerator.set_message_queue(message_queue)
-
-        parser = ArgparseHelper.build_argument_parser(
-            commands_dict, exit_on_error=False
-        )
-        args = parser.parse_args(command)
-
-        result = Execute.find_command_and_execute(args.command, commands_dict)
-        if isinstance(result, Exception):
-            logging.error(f"Task ended with Error: {result}")
-        if not result:
-            logging.error(f"Unrecognized command: {command}")
-            message_queue.put(None)
-            return False
-
-        message_queue.put(None)
-        return True
-
-    except argparse.ArgumentError as e:
-        logging.error(f"Unrecognized command: {e}")
-        message_queue.put(None)
-        return False
-    except Exception as e:
-        logging.error(f"Execution error: {e!s}")
-        message_queue.put(None)
-        return False
+    topic = HubTopic.of(message)
+    if topic == HubTopic.PREVIEW_FRAMES:
+        # JPEG data only preview viewers can use.
+        if hub:
+            hub.publish(message["preview_frame"], topic)
+        return
+    if topic == HubTopic.STREAM_STATS:
+        # Only for subscribers, the command's WebSocket expects logs.
+        if hub and hub.has_subscribers(topic):
+            hub.publish(EncodedMessage.from_dict(message), topic)
+        return
+    channel = current_log_channel.get()
+    if channel is None and (hub is None or not hub.has_subscribers(topic)):
+        return
+    encoded = EncodedMessage.from_dict(message)
+    if channel:
+        channel.put(encoded)
+    if hub:
+        hub.publish(encoded, topic)
 
 
 class WebSocketLogHandler(logging.Handler):
-    """A logging handler that sends messages directly via WebSocket."""
+    """A logging handler that sends messages via the WebSocket log channel."""
 
-    def __init__(self):
+    def __init__(self, hub: MessageHub | None = None):
         super().__init__()
-        self._background_tasks = set()
+        self.hub = hub
 
     def emit(self, record):
-        """Send log messages via WebSocket if available."""
-        websocket = current_websocket.get()
-        if websocket and websocket.client_state == WebSocketState.CONNECTED:
+        """Queue log messages of a WebSocket command on its log channel."""
+        if current_log_channel.get():
             try:
                 preset: LogPreset | None = getattr(record, "preset", None)
 
@@ -121,25 +116,10 @@ class WebSocketLogHandler(logging.Handler):
                     message=StringHelper.sanitize_path(record.getMessage()),
                     html_class=preset.get_html_class() if preset else None,
                 )
-
-                task = asyncio.create_task(
-                    self._send_log_message(websocket, log_message)
-                )
-                self._background_tasks.add(task)
-                task.add_done_callback(self._background_tasks.discard)
+                _forward_message(log_message.to_dict(), self.hub)
             except Exception as e:
                 print(f"Failed to send log via WebSocket: {e}")
 
-    @staticmethod
-    async def _send_log_message(websocket: WebSocket, log_message: LogMessage):
-        """Send log message via WebSocket."""
-        try:
-            if websocket.client_state == WebSocketState.CONNECTED:
-                message_data = log_message.to_dict()
-                await websocket.send_text(json.dumps(message_data))
-        except Exception as e:
-            print(f"Error sending WebSocket message: {e}")
-
 
 class ContextAwareHandler(logging.Handler):
     """A logging handler that routes messages to the current request's handler."""
@@ -189,15 +169,33 @@ class FastAPIServer:
         self,
         commands: dict[str, list[Command]],
     ):
-        self.app = FastAPI(title="ADB Auto Player Server")
+        self.app = FastAPI(title="ADB Auto Player Server", lifespan=self._lifespan)
         self.commands = commands
-        self.websocket_handler = WebSocketLogHandler()
+        self.worker_pool = CommandWorkerPool(commands)
+        self.message_hub = MessageHub()
+        self._preview_viewers = 0
+        self.websocket_handler = WebSocketLogHandler(self.message_hub)
+        self._command_executor = ThreadPoolExecutor(
+            max_workers=EXECUTE_COMMAND_THREADS, thread_name_prefix="ExecuteCommand"
+        )
+        self._device_locks: dict[str, threading.Lock] = {}
+        self._device_locks_lock = threading.Lock()
 
         self._setup_logging()
         self._setup_middleware()
         self._setup_http_routes()
         self._setup_websocket_routes()
 
+    @asynccontextmanager
+    async def _lifespan(self, app: FastAPI):
+        """Start warm workers with the server."""
+        await asyncio.to_thread(self.worker_pool.start)
+        try:
+            yield
+        finally:
+            self.worker_pool.shutdown()
+            self._command_executor.shutdown(wait=False, cancel_futures=True)
+
     @staticmethod
     async def _shutdown_server(error_message: str):
         """Gracefully shut down the server due to critical error."""
@@ -264,68 +262,116 @@ class FastAPIServer:
                 current_request_handler.set(None)
 
     @staticmethod
-    async def _read_message_queue(message_queue: Queue, shutdown_event: asyncio.Event):
-        """Read json messages from the queue and forward them to WebSocket."""
-        while not shutdown_event.is_set():
+    def _drain_message_queue(message_queue: Queue, timeout: float) -> list:
+        """Block until a message arrives then take everything already queued.
+
+        Returns:
+            list: Up to MAX_MESSAGE_BATCH_SIZE messages, empty on timeout. None
+                marks the end of the command and is always the last message.
+        """
+        try:
+            batch = [message_queue.get(timeout=timeout)]
+        except queue.Empty:
+            return []
+        while batch[-1] is not None and len(batch) < MAX_MESSAGE_BATCH_SIZE:
             try:
-                await asyncio.sleep(0.01)
+                batch.append(message_queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
 
-                if not message_queue.empty():
-                    try:
-                        log_data = message_queue.get_nowait()
-
-                        if log_data is None:
-                            break
-
-                        websocket = current_websocket.get()
-                        if (
-                            websocket
-                            and websocket.client_state == WebSocketState.CONNECTED
-                        ):
-                            try:
-                                await asyncio.wait_for(
-                                    websocket.send_text(json.dumps(log_data)),
-                                    timeout=1.0,
-                                )
-                            except Exception as e:
-                                logging.warning(f"WebSocket send failed: {e}")
-                                break
+    @staticmethod
+    def _start_message_queue_reader(
+        message_queue: Queue,
+        process_exited: threading.Event,
+        batches: asyncio.Queue,
+    ) -> threading.Thread:
+        """Read the queue on a thread and hand batches over to the event loop.
+
+        The thread ends after the end of command marker or once the process
+        exited and the queue is drained, a final None batch is put in both cases.
+        """
+        loop = asyncio.get_running_loop()
 
-                    except Exception as e:
-                        logging.error(f"Error processing log message: {e}")
+        def put(batch: list | None) -> bool:
+            try:
+                loop.call_soon_threadsafe(batches.put_nowait, batch)
+                return True
+            except RuntimeError:
+                # Event loop closed.
+                return False
+
+        def read() -> None:
+            while True:
+                exited = process_exited.is_set()
+                batch = FastAPIServer._drain_message_queue(
+                    message_queue, timeout=0.1 if exited else 0.5
+                )
+                end_of_command = bool(batch) and batch[-1] is None
+                if end_of_command:
+                    batch.pop()
+                if batch and not put(batch):
+                    return
+                if end_of_command or (exited and not batch):
+                    put(None)
+                    return
+
+        thread = threading.Thread(target=read, name="MessageQueueReader", daemon=True)
+        thread.start()
+        return thread
 
-            except asyncio.CancelledError:
-                break
-            except Exception as e:
-                logging.error(f"Error in log queue reader: {e}")
-                await asyncio.sleep(0.1)
+    @staticmethod
+    async def _read_message_queue(
+        message_queue: Queue,
+        process_exited: threading.Event,
+        hub: MessageHub | None = None,
+    ):
+        """Forward json messages from the queue to the WebSocket and the hub.
+
+        Summary deltas are assembled into the summary of the command.
+        """
+        summary_entries: dict = {}
+        batches: asyncio.Queue[list | None] = asyncio.Queue()
+        FastAPIServer._start_message_queue_reader(
+            message_queue, process_exited, batches
+        )
+        while (batch := await batches.get()) is not None:
+            for message in batch:
+                if "metrics" in message:
+                    Metrics.merge(message["metrics"])
+                elif SummaryGenerator.DELTA_KEY in message:
+                    SummaryGenerator.apply_delta(
+                        summary_entries, message[SummaryGenerator.DELTA_KEY]
+                    )
+                    summary = SummaryGenerator.format_summary(summary_entries)
+                    if summary:
+                        _forward_message(Summary(summary).to_dict(), hub)
+                else:
+                    _forward_message(message, hub)
 
     async def _execute_command_background(self, command: list[str]) -> None:
-        """Execute command in background process."""
-        process = None
+        """Execute command in a worker process."""
+        worker: CommandWorker | None = None
+        result: CommandResult | None = None
         log_reader_task = None
-        message_queue: Queue = Queue()
+        command_finished = threading.Event()
 
         try:
-            shutdown_event = asyncio.Event()
-
-            process = Process(
-                target=run_command_in_process,
-                args=(command, self.commands, message_queue),
-            )
-            process.start()
+            # Starting a process when no warm worker is ready blocks.
+            worker = await asyncio.to_thread(self.worker_pool.acquire)
+            worker.submit(command)
 
             log_reader_task = asyncio.create_task(
-                self._read_message_queue(message_queue, shutdown_event)
+                self._read_message_queue(
+                    worker.message_queue, command_finished, self.message_hub
+                )
             )
 
-            while process.is_alive():
-                try:
-                    await asyncio.wait_for(asyncio.sleep(0.1), timeout=0.1)
-                except TimeoutError:
-                    continue
-
-            shutdown_event.set()
+            # Returns when the command finished or the process exited.
+            result = await asyncio.to_thread(worker.wait)
+            command_finished.set()
+            if result and result.metrics:
+                Metrics.merge(result.metrics)
 
             if log_reader_task and not log_reader_task.done():
                 try:
@@ -343,34 +389,41 @@ class FastAPIServer:
         except Exception as e:
             logging.error(f"Error in command execution: {e}")
         finally:
-            await FastAPIServer._cleanup_process_and_tasks(
-                process,
-                log_reader_task,
-                message_queue,
+            reader_finished = log_reader_task is not None and (
+                log_reader_task.done() and not log_reader_task.cancelled()
             )
+            if worker and result and reader_finished:
+                await asyncio.to_thread(self.worker_pool.release, worker, result)
+            elif worker:
+                # Stopping a command terminates its worker.
+                await FastAPIServer._cleanup_process_and_tasks(
+                    worker.process,
+                    log_reader_task,
+                    worker.message_queue,
+                    command_finished,
+                )
+                await asyncio.to_thread(self.worker_pool.discard, worker)
+            command_finished.set()
 
     @staticmethod
     async def _cleanup_process_and_tasks(
-        process: Process | None,
+        process: BaseProcess | None,
         log_reader_task: asyncio.Task | None,
         message_queue: Queue,
+        process_exited: threading.Event | None = None,
     ):
-        """Comprehensive cleanup of process and associated tasks."""
-        if log_reader_task and not log_reader_task.done():
-            log_reader_task.cancel()
-            try:
-                await asyncio.wait_for(log_reader_task, timeout=1.0)
-            except (TimeoutError, asyncio.CancelledError):
-                pass
+        """Comprehensive cleanup of process and associated tasks.
 
+        The process is terminated first, the reader forwards what it sent while
+        exiting, e.g. the last summary updates.
+        """
         if process and process.is_alive():
             try:
                 process.terminate()
 
-                for _ in range(10):
-                    if not process.is_alive():
-                        break
-                    await asyncio.sleep(0.1)
+                await asyncio.to_thread(
+                    wait_for_objects, [process.sentinel], timeout=1.0
+                )
 
                 if process.is_alive():
                     process.kill()
@@ -383,6 +436,14 @@ class FastAPIServer:
             except Exception as e:
                 logging.error(f"Error during process cleanup: {e}")
 
+        if process_exited:
+            process_exited.set()
+        if log_reader_task and not log_reader_task.done():
+            try:
+                await asyncio.wait_for(log_reader_task, timeout=1.0)
+            except (TimeoutError, asyncio.CancelledError):
+                log_reader_task.cancel()
+
         if message_queue:
             try:
                 while not message_queue.empty():
@@ -398,6 +459,9 @@ class FastAPIServer:
             """WebSocket endpoint for real-time command execution and logging."""
             await websocket.accept()
             current_websocket.set(websocket)
+            log_channel = LogChannel(websocket.send_text)
+            current_log_channel.set(log_channel)
+            log_channel_task = asyncio.create_task(log_channel.run())
 
             # Track the current task for this specific WebSocket connection
             current_task = None
@@ -417,6 +481,8 @@ class FastAPIServer:
             def on_command_done(task: asyncio.Task):
                 async def close_ws():
                     try:
+                        log_channel.close()
+                        await log_channel_task
                         await websocket.close(reason="Task completed")
                     except Exception as e:
                         logging.error(f"Error closing websocket: {e}")
@@ -465,6 +531,9 @@ class FastAPIServer:
                 logging.error(f"WebSocket error: {e}")
 
             await stop_current_task()
+            log_channel.close()
+            await log_channel_task
+            current_log_channel.set(None)
             current_websocket.set(None)
 
             try:
@@ -473,6 +542,92 @@ class FastAPIServer:
             except Exception as e:
                 logging.error(f"Error closing WebSocket: {e}")
 
+        @self.app.websocket("/ws/subscribe")
+        async def subscribe_endpoint(websocket: WebSocket, topics: str | None = None):
+            """Observe messages of running commands without executing any.
+
+            Args:
+                websocket: Connection receiving the messages.
+                topics: Comma separated HubTopic values, logs, summaries and
+                    stream_stats by default.
+            """
+            try:
+                selected = (
+                    {HubTopic(topic.strip()) for topic in topics.split(",")}
+                    if topics
+                    else {HubTopic.LOGS, HubTopic.SUMMARIES, HubTopic.STREAM_STATS}
+                )
+            except ValueError:
+                await websocket.close(code=1008, reason=f"Unknown topics: {topics}")
+                return
+            if HubTopic.PREVIEW_FRAMES in selected:
+                await websocket.close(code=1008, reason="Use /ws/preview for frames")
+                return
+
+            await websocket.accept()
+            await self._serve_subscriber(
+                websocket, LogChannel(websocket.send_text), selected
+            )
+
+        @self.app.websocket("/ws/preview")
+        async def preview_endpoint(websocket: WebSocket, fps: float = 5.0):
+            """Live preview of the running command as binary JPEG frames.
+
+            Frames are only encoded while a viewer is connected, see
+            PreviewPublisher.
+
+            Args:
+                websocket: Connection receiving the frames.
+                fps: Frames per second at most, capped by PreviewPublisher.max_fps.
+            """
+            await websocket.accept()
+            channel = FrameChannel(
+                websocket.send_bytes,
+                max_fps=max(0.1, min(fps, PreviewPublisher.max_fps)),
+            )
+            self._preview_viewers += 1
+            self.worker_pool.preview_requested.set()
+            try:
+                await self._serve_subscriber(
+                    websocket, channel, {HubTopic.PREVIEW_FRAMES}
+                )
+            finally:
+                self._preview_viewers -= 1
+                if self._preview_viewers == 0:
+                    self.worker_pool.preview_requested.clear()
+
+    async def _serve_subscriber(
+        self,
+        websocket: WebSocket,
+        channel: LogChannel | FrameChannel,
+        topics: set[HubTopic],
+    ) -> None:
+        """Send hub messages to an accepted WebSocket until it disconnects."""
+        channel_task = asyncio.create_task(channel.run())
+        self.message_hub.subscribe(channel, topics)
+
+        async def wait_for_disconnect() -> None:
+            while (await websocket.receive())["type"] != "websocket.disconnect":
+                pass
+
+        disconnect_task = asyncio.create_task(wait_for_disconnect())
+        try:
+            # The channel stops early if the subscriber cannot keep up.
+            await asyncio.wait(
+                {disconnect_task, channel_task},
+                return_when=asyncio.FIRST_COMPLETED,
+            )
+        finally:
+            self.message_hub.unsubscribe(channel)
+            disconnect_task.cancel()
+            channel.close()
+            await channel_task
+            try:
+                if websocket.client_state == WebSocketState.CONNECTED:
+                    await websocket.close()
+            except Exception as e:
+                logging.debug(f"Error closing subscriber WebSocket: {e}")
+
     def _setup_http_routes(self):
         """Setup TCP routes."""
 
@@ -485,14 +640,7 @@ class FastAPIServer:
             handler.clear()
 
             try:
-                parser = ArgparseHelper.build_argument_parser(
-                    self.commands, exit_on_error=False
-                )
-
-                command = request.command
-                args = parser.parse_args(command)
-
-                result = Execute.find_command_and_execute(args.command, self.commands)
+                result = await self._execute_command_in_thread(request.command)
                 if isinstance(result, Exception):
                     logging.error(f"Task ended with Error: {result}")
                 if result:
@@ -501,6 +649,10 @@ class FastAPIServer:
                 raise HTTPException(
                     status_code=404, detail=f"Unrecognized command: {request.command}"
                 )
+            except TimeoutError:
+                raise HTTPException(
+                    status_code=504, detail=f"Command timed out: {request.command}"
+                )
             except PermissionError as e:
                 await self._shutdown_server(f"PermissionError: {e}")
             except FileNotFoundError as e:
@@ -511,6 +663,13 @@ class FastAPIServer:
                 status_code=404, detail=f"Unrecognized command: {request.command}"
             )
 
+        @self.app.get("/metrics", response_class=PlainTextResponse)
+        async def metrics():
+            """Metrics of the server and its workers in Prometheus text format."""
+            return PlainTextResponse(
+                Metrics.render(), media_type="text/plain; version=0.0.4"
+            )
+
         @self.app.get("/health", response_model=OKResponse)
         async def health_check():
             """Health check."""
@@ -522,14 +681,75 @@ class FastAPIServer:
             self._clear_cache(CacheGroup.GENERAL_SETTINGS)
             self._clear_cache(CacheGroup.GAME_SETTINGS)
             self._clear_cache(CacheGroup.ADB)
+            await asyncio.to_thread(self.worker_pool.recycle_idle)
             return OKResponse()
 
         @self.app.post("/game-settings-updated", response_model=OKResponse)
         async def game_settings_updated():
             """Handle game settings update."""
             self._clear_cache(CacheGroup.GAME_SETTINGS)
+            GUIOptionsCache().invalidate()
+            await asyncio.to_thread(self.worker_pool.recycle_idle)
             return OKResponse()
 
+    def _device_lock(self) -> threading.Lock:
+        """Lock serializing commands for the configured device."""
+        try:
+            device_id = ConfigLoader.general_settings().device.id
+        except Exception:
+            device_id = ""
+        with self._device_locks_lock:
+            return self._device_locks.setdefault(device_id, threading.Lock())
+
+    def _execute_command_sync(
+        self, command: list[str], timeout: float
+    ) -> bool | Exception:
+        """Parse and execute a command while holding the device lock.
+
+        Raises:
+            argparse.ArgumentError: Unknown command or arguments.
+            TimeoutError: Another command kept the device busy for timeout seconds.
+
+        Returns:
+            bool | Exception: See Execute.find_command_and_execute.
+        """
+        parser = ArgparseHelper.build_argument_parser(
+            self.commands, exit_on_error=False
+        )
+        args = parser.parse_args(command)
+
+        lock = self._device_lock()
+        if not lock.acquire(timeout=timeout):
+            raise TimeoutError(f"Device busy, command was not started: {command}")
+        try:
+            return Execute.find_command_and_execute(args.command, self.commands)
+        finally:
+            lock.release()
+
+    async def _execute_command_in_thread(
+        self, command: list[str], timeout: float = EXECUTE_COMMAND_TIMEOUT
+    ) -> bool | Exception:
+        """Execute a command on the thread pool, keeping the event loop free.
+
+        The context is copied so logs still reach current_request_handler.
+
+        Raises:
+            argparse.ArgumentError: Unknown command or arguments.
+            TimeoutError: The command did not finish within timeout seconds, it
+                keeps running in the background.
+
+        Returns:
+            bool | Exception: See Execute.find_command_and_execute.
+        """
+        context = contextvars.copy_context()
+        future = asyncio.get_running_loop().run_in_executor(
+            self._command_executor,
+            functools.partial(
+                context.run, self._execute_command_sync, command, timeout
+            ),
+        )
+        return await asyncio.wait_for(future, timeout=timeout)
+
     @staticmethod
     def _clear_cache(group: CacheGroup) -> None:
         """Clear cache for a specific group."""
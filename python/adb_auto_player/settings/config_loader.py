@@ -61,6 +61,15 @@ class ConfigLoader:
         working_dir = ConfigLoader.working_dir()
         return working_dir if ".config" in games_dir.parts else games_dir.parent / "binaries"
 
+    @staticmethod
+    @lru_cache(maxsize=1)
+    def cache_dir() -> Path:
+        """Return the directory for data learned at runtime."""
+        cache_dir_override = os.getenv("ADB_AUTO_PLAYER_CACHE_DIR")
+        if cache_dir_override:
+            return Path(cache_dir_override).expanduser()
+        return ConfigLoader.working_dir() / "cache"
+
     @staticmethod
     @register_cache(CacheGroup.GENERAL_SETTINGS)
     @lru_cache(maxsize=1)
@@ -7,18 +7,24 @@ Util modules should aim to not have dependencies on internal packages besides
 - registries
 """
 
+from .approximate_matcher import ApproximateMatch, ApproximateMatcher
 from .dev_helper import DevHelper
 from .execute import Execute
 from .log_message_factory import LogMessageFactory
+from .metrics import Metrics, MetricsSnapshot
 from .string_helper import StringHelper
 from .summary_generator import SummaryGenerator
 from .traceback_helper import TracebackHelper
 from .type_helper import TypeHelper
 
 __all__ = [
+    "ApproximateMatch",
+    "ApproximateMatcher",
     "DevHelper",
     "Execute",
     "LogMessageFactory",
+    "Metrics",
+    "MetricsSnapshot",
     "StringHelper",
     "SummaryGenerator",
     "TracebackHelper",
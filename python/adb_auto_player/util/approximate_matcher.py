@@ -0,0 +1,163 @@
+"""Approximate substring search for many patterns at once."""
+
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass
+from difflib import SequenceMatcher
+
+import numpy as np
+from adb_auto_player.models import ConfidenceValue
+
+# ConfidenceValue comparisons are tolerant, the prefilter must never be stricter.
+_TOLERANCE = 1e-9
+
+
+@dataclass(frozen=True)
+class ApproximateMatch[T]:
+    """Pattern found in a text."""
+
+    value: T
+    pattern: str
+    similarity: float
+    # Start of the best matching window in the normalized text.
+    start: int
+
+
+class _CompiledPattern[T]:
+    def __init__(
+        self,
+        pattern: str,
+        value: T,
+        normalize: Callable[[str], str] | None,
+    ):
+        self.pattern = pattern
+        self.value = value
+        self.normalize = normalize
+        self.lower = pattern.lower()
+        self.length = len(self.lower)
+        characters, counts = np.unique(
+            np.frombuffer(self.lower.encode("utf-32-le"), dtype=np.uint32),
+            return_counts=True,
+        )
+        self.characters = characters
+        self.counts = counts
+
+
+class ApproximateMatcher[T]:
+    """Find which of several patterns occurs approximately in a text.
+
+    Matches are decided exactly like StringHelper.fuzzy_substring_match: a
+    pattern matches if any window of the text with the same length as the pattern
+    has a difflib similarity ratio of at least the threshold.
+
+    The ratio is 2 * M / (2 * len(pattern)) where M is the number of matching
+    characters, which can never exceed the number of characters window and
+    pattern have in common. That bound is computed for all windows of all
+    patterns with vectorized prefix sums, SequenceMatcher only runs on the few
+    windows passing it.
+    """
+
+    def __init__(
+        self,
+        patterns: Sequence[tuple[str, T]],
+        similarity_threshold: ConfidenceValue = ConfidenceValue("80%"),
+        normalizers: Sequence[Callable[[str], str] | None] | None = None,
+    ):
+        """Compile the patterns.
+
+        Args:
+            patterns: Pattern and associated value, earlier patterns win if
+                several match.
+            similarity_threshold: Minimum similarity ratio.
+            normalizers: Optional function per pattern applied to the text
+                before searching that pattern.
+        """
+        if normalizers is None:
+            normalizers = [None] * len(patterns)
+        self.similarity_threshold = similarity_threshold
+        self._patterns = [
+            _CompiledPattern(pattern, value, normalize)
+            for (pattern, value), normalize in zip(patterns, normalizers, strict=True)
+        ]
+
+    def find(self, text: str) -> ApproximateMatch[T] | None:
+        """Return the first pattern occurring in the text.
+
+        Args:
+            text: Text to search in, e.g. OCR output.
+
+        Returns:
+            ApproximateMatch | None: Best window of the first matching pattern.
+        """
+        for match in self._iter_matches(text, first_only=True):
+            return match
+        return None
+
+    def find_all(self, text: str) -> list[ApproximateMatch[T]]:
+        """Return all patterns occurring in the text in pattern order."""
+        return list(self._iter_matches(text, first_only=False))
+
+    def _iter_matches(self, text: str, first_only: bool):
+        prepared: dict[Callable[[str], str] | None, tuple[str, np.ndarray]] = {}
+        for pattern in self._patterns:
+            if pattern.normalize not in prepared:
+                normalized = (
+                    pattern.normalize(text) if pattern.normalize else text
+                ).lower()
+                prepared[pattern.normalize] = (
+                    normalized,
+                    np.frombuffer(normalized.encode("utf-32-le"), dtype=np.uint32),
+                )
+            normalized, codes = prepared[pattern.normalize]
+
+            match = self._search(pattern, normalized, codes, first_only)
+            if match is not None:
+                yield match
+                if first_only:
+                    return
+
+    def _search(
+        self,
+        pattern: _CompiledPattern[T],
+        text: str,
+        codes: np.ndarray,
+        first_only: bool,
+    ) -> ApproximateMatch[T] | None:
+        m = pattern.length
+        if m > len(text):
+            return None
+        if m == 0:
+            return ApproximateMatch(pattern.value, pattern.pattern, 1.0, 0)
+
+        candidates = self._candidate_windows(pattern, codes)
+        best: ApproximateMatch[T] | None = None
+        # SequenceMatcher caches information about the second sequence, the
+        # pattern is set once and only the windows change.
+        sequence_matcher = SequenceMatcher(None, "", pattern.lower)
+        for start in candidates.tolist():
+            sequence_matcher.set_seq1(text[start : start + m])
+            similarity = sequence_matcher.ratio()
+            if similarity >= self.similarity_threshold and (
+                best is None or similarity > best.similarity
+            ):
+                best = ApproximateMatch(
+                    pattern.value, pattern.pattern, similarity, start
+                )
+                if first_only and similarity == 1.0:
+                    break
+        return best
+
+    def _candidate_windows(
+        self, pattern: _CompiledPattern[T], codes: np.ndarray
+    ) -> np.ndarray:
+        """Windows whose character overlap with the pattern allows a match."""
+        m = pattern.length
+        required = (self.similarity_threshold.value - _TOLERANCE) * m
+        # (n, k) one hot of pattern characters, prefix sums give window counts.
+        one_hot = codes[:, None] == pattern.characters[None, :]
+        if np.minimum(one_hot.sum(axis=0), pattern.counts).sum() < required:
+            return np.empty(0, dtype=np.int64)
+        prefix = np.zeros((len(codes) + 1, len(pattern.characters)), dtype=np.int32)
+        np.cumsum(one_hot, axis=0, out=prefix[1:])
+        window_counts = prefix[m:] - prefix[:-m]
+        overlap = np.minimum(window_counts, pattern.counts).sum(axis=1)
+        return np.flatnonzero(overlap >= required)
@@ -80,7 +80,11 @@ class Execute:
                 try:
                     callable_function(instance, **kwargs)
                 finally:
-                    if hasattr(instance, "stop_stream") and callable(
+                    if hasattr(instance, "close") and callable(
+                        getattr(instance, "close")
+                    ):
+                        instance.close()
+                    elif hasattr(instance, "stop_stream") and callable(
                         getattr(instance, "stop_stream")
                     ):
                         instance.stop_stream()
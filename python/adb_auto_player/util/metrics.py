@@ -0,0 +1,248 @@
+"""Counters, gauges and histograms of the automation runtime.
+
+Recording only touches dicts owned by the calling thread, no lock is taken and
+histogram buckets are preallocated. Command worker processes send snapshots to
+the server, which adds them to its own metrics and renders everything in the
+Prometheus text format.
+"""
+
+import bisect
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import ClassVar
+
+import psutil
+from adb_auto_player.registries import LRU_CACHE_REGISTRY
+
+_PREFIX = "adb_auto_player_"
+
+# Upper bounds in seconds, latencies from 1 ms to 10 s.
+DEFAULT_BUCKETS: tuple[float, ...] = (
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+_Labels = tuple[tuple[str, str], ...]
+_Key = tuple[str, _Labels]
+
+
+class _ThreadMetrics:
+    """Metrics recorded by one thread."""
+
+    __slots__ = ("counters", "histograms")
+
+    def __init__(self) -> None:
+        self.counters: dict[_Key, float] = {}
+        # Count per bucket including +Inf, followed by sum and count.
+        self.histograms: dict[_Key, list[float]] = {}
+
+
+@dataclass
+class MetricsSnapshot:
+    """Cumulative metrics of one process."""
+
+    pid: int
+    counters: dict[_Key, float] = field(default_factory=dict)
+    histograms: dict[_Key, list[float]] = field(default_factory=dict)
+    gauges: dict[_Key, float] = field(default_factory=dict)
+
+
+class _Timer:
+    __slots__ = ("key", "started_at")
+
+    def __init__(self, key: _Key) -> None:
+        self.key = key
+        self.started_at = 0.0
+
+    def __enter__(self) -> "_Timer":
+        self.started_at = time.perf_counter()
+        return self
+
+    def __exit__(self, *_) -> None:
+        Metrics._observe(self.key, time.perf_counter() - self.started_at)
+
+
+def _key(name: str, labels: dict[str, object]) -> _Key:
+    if not labels:
+        return name, ()
+    return name, tuple(sorted((label, str(value)) for label, value in labels.items()))
+
+
+class Metrics:
+    """Process wide metrics.
+
+    Names are given without prefix and unit conventions are up to the caller,
+    e.g. screenshot_seconds for a histogram or wait_timeouts_total for a counter.
+    """
+
+    _local: ClassVar[threading.local] = threading.local()
+    _threads: ClassVar[list[_ThreadMetrics]] = []
+    _threads_lock: ClassVar[threading.Lock] = threading.Lock()
+    _gauges: ClassVar[dict[_Key, float]] = {}
+    # Latest snapshot of every worker process.
+    _processes: ClassVar[dict[int, MetricsSnapshot]] = {}
+
+    @classmethod
+    def increment(cls, name: str, value: float = 1, **labels: object) -> None:
+        """Increase a counter."""
+        counters = cls._thread_metrics().counters
+        key = _key(name, labels)
+        counters[key] = counters.get(key, 0) + value
+
+    @classmethod
+    def observe(cls, name: str, value: float, **labels: object) -> None:
+        """Record a value, usually seconds, in a histogram."""
+        cls._observe(_key(name, labels), value)
+
+    @classmethod
+    def timer(cls, name: str, **labels: object) -> _Timer:
+        """Context manager recording its duration in seconds in a histogram."""
+        return _Timer(_key(name, labels))
+
+    @classmethod
+    def set_gauge(cls, name: str, value: float, **labels: object) -> None:
+        """Set a value that can go up and down."""
+        cls._gauges[_key(name, labels)] = value
+
+    @classmethod
+    def snapshot(cls) -> MetricsSnapshot:
+        """Metrics of this process recorded so far, including cache statistics."""
+        snapshot = MetricsSnapshot(pid=os.getpid(), gauges=dict(cls._gauges))
+        with cls._threads_lock:
+            threads = list(cls._threads)
+        for thread in threads:
+            for key, value in list(thread.counters.items()):
+                snapshot.counters[key] = snapshot.counters.get(key, 0) + value
+            for key, buckets in list(thread.histograms.items()):
+                if merged := snapshot.histograms.get(key):
+                    snapshot.histograms[key] = [a + b for a, b in zip(merged, buckets)]
+                else:
+                    snapshot.histograms[key] = list(buckets)
+
+        functions = {id(f): f for group in LRU_CACHE_REGISTRY.values() for f in group}
+        for function in functions.values():
+            if not hasattr(function, "cache_info"):
+                continue
+            info = function.cache_info()
+            labels = (("function", function.__qualname__),)
+            snapshot.counters[("cache_hits_total", labels)] = info.hits
+            snapshot.counters[("cache_misses_total", labels)] = info.misses
+
+        snapshot.gauges[("process_memory_bytes", (("pid", str(snapshot.pid)),))] = (
+            psutil.Process().memory_info().rss
+        )
+        return snapshot
+
+    @classmethod
+    def merge(cls, snapshot: MetricsSnapshot) -> None:
+        """Add the snapshot of a worker process, replacing its previous one."""
+        cls._processes[snapshot.pid] = snapshot
+
+    @classmethod
+    def render(cls) -> str:
+        """Metrics of this and all worker processes in Prometheus text format.
+
+        Counters and histograms are summed over processes, gauges of exited
+        processes are left out.
+        """
+        total = cls.snapshot()
+        for snapshot in list(cls._processes.values()):
+            for key, value in snapshot.counters.items():
+                total.counters[key] = total.counters.get(key, 0) + value
+            for key, buckets in snapshot.histograms.items():
+                if merged := total.histograms.get(key):
+                    total.histograms[key] = [a + b for a, b in zip(merged, buckets)]
+                else:
+                    total.histograms[key] = list(buckets)
+            if psutil.pid_exists(snapshot.pid):
+                total.gauges.update(snapshot.gauges)
+
+        lines: list[str] = []
+        for metric_type, values in (
+            ("counter", total.counters),
+            ("gauge", total.gauges),
+        ):
+            for name, group in _group_by_name(values):
+                lines.append(f"# TYPE {_PREFIX}{name} {metric_type}")
+                lines.extend(_sample(name, labels, value) for labels, value in group)
+        for name, group in _group_by_name(total.histograms):
+            lines.append(f"# TYPE {_PREFIX}{name} histogram")
+            for labels, buckets in group:
+                cumulative = 0.0
+                for bound, count in zip((*DEFAULT_BUCKETS, "+Inf"), buckets):
+                    cumulative += count
+                    bucket_labels = (*labels, ("le", f"{bound}"))
+                    lines.append(_sample(f"{name}_bucket", bucket_labels, cumulative))
+                lines.append(_sample(f"{name}_sum", labels, buckets[-2]))
+                lines.append(_sample(f"{name}_count", labels, buckets[-1]))
+        return "\n".join(lines) + "\n"
+
+    @classmethod
+    def reset(cls) -> None:
+        """Forget everything recorded, a forked process starts from zero."""
+        cls._local = threading.local()
+        cls._threads = []
+        cls._threads_lock = threading.Lock()
+        cls._gauges = {}
+        cls._processes = {}
+
+    @classmethod
+    def _observe(cls, key: _Key, value: float) -> None:
+        histograms = cls._thread_metrics().histograms
+        buckets = histograms.get(key)
+        if buckets is None:
+            buckets = histograms[key] = [0.0] * (len(DEFAULT_BUCKETS) + 3)
+        buckets[bisect.bisect_left(DEFAULT_BUCKETS, value)] += 1
+        buckets[-2] += value
+        buckets[-1] += 1
+
+    @classmethod
+    def _thread_metrics(cls) -> _ThreadMetrics:
+        try:
+            return cls._local.metrics
+        except AttributeError:
+            metrics = cls._local.metrics = _ThreadMetrics()
+            with cls._threads_lock:
+                cls._threads.append(metrics)
+            return metrics
+
+
+def _group_by_name[T](
+    values: dict[_Key, T],
+) -> list[tuple[str, list[tuple[_Labels, T]]]]:
+    grouped: dict[str, list[tuple[_Labels, T]]] = {}
+    for (name, labels), value in sorted(values.items()):
+        grouped.setdefault(name, []).append((labels, value))
+    return list(grouped.items())
+
+
+def _sample(name: str, labels: _Labels, value: float) -> str:
+    value = float(value)
+    formatted = str(int(value)) if value.is_integer() else repr(value)
+    return f"{_PREFIX}{name}{_format_labels(labels)} {formatted}"
+
+
+def _format_labels(labels: _Labels) -> str:
+    if not labels:
+        return ""
+    escaped = (
+        (name, value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"))
+        for name, value in labels
+    )
+    return "{" + ",".join(f'{name}="{value}"' for name, value in escaped) + "}"
+
+
+os.register_at_fork(after_in_child=Metrics.reset)
@@ -2,10 +2,40 @@
 
 import os
 import re
-from difflib import SequenceMatcher
+from functools import lru_cache
 
 from adb_auto_player.models import ConfidenceValue
 
+from .approximate_matcher import ApproximateMatcher
+
+
+@lru_cache(maxsize=256)
+def _single_pattern_matcher(
+    pattern: str, similarity_threshold: ConfidenceValue
+) -> ApproximateMatcher[None]:
+    return ApproximateMatcher([(pattern, None)], similarity_threshold)
+
+
+@lru_cache(maxsize=4)
+def _sanitize_patterns(home_dir: str) -> tuple[tuple[re.Pattern, str], ...]:
+    """Compiled username patterns of a home dir, for StringHelper.sanitize_path."""
+    if "\\" in home_dir:  # Windows path
+        username: str = home_dir.rsplit("\\", maxsplit=1)[-1]
+        return (
+            (
+                re.compile(re.escape(f":\\Users\\{username}")),
+                r":\\Users\\$env:USERNAME",
+            ),
+            (
+                re.compile(re.escape(f":\\\\Users\\\\{username}")),
+                r":\\\\Users\\\\$env:USERNAME",
+            ),
+        )
+
+    # Unix path
+    username = home_dir.rsplit("/", maxsplit=1)[-1]
+    return ((re.compile(f"/home/{username}"), "/home/$USER"),)
+
 
 class StringHelper:
     """String manipulation helper methods."""
@@ -63,21 +93,10 @@ class StringHelper:
         Returns:
             bool: True if fuzzy match found, False otherwise
         """
-        text_lower = text.lower()
-        pattern_lower = pattern.lower()
-
-        # If pattern is longer than text, no match possible
-        if len(pattern_lower) > len(text_lower):
-            return False
-
-        # Check all possible substrings of text with the same length as pattern
-        for i in range(len(text_lower) - len(pattern_lower) + 1):
-            substring = text_lower[i : i + len(pattern_lower)]
-            similarity = SequenceMatcher(None, substring, pattern_lower).ratio()
-            if similarity >= similarity_threshold:
-                return True
-
-        return False
+        return (
+            _single_pattern_matcher(pattern, similarity_threshold).find(text)
+            is not None
+        )
 
     @staticmethod
     def snake_to_pascal(s: str):
@@ -96,21 +115,7 @@ class StringHelper:
         Returns:
             str: The sanitized log message with environment variable placeholders
         """
-        home_dir: str = os.path.expanduser("~")
-
-        if "\\" in home_dir:  # Windows path
-            username: str = home_dir.split("\\")[-1]
-            pattern: str = re.escape(f":\\Users\\{username}")
-            replacement = r":\\Users\\$env:USERNAME"
-            log_message = re.sub(pattern, replacement, log_message)
-            pattern = re.escape(f":\\\\Users\\\\{username}")
-            replacement = r":\\\\Users\\\\$env:USERNAME"
-            log_message = re.sub(pattern, replacement, log_message)
-
-        else:  # Unix path
-            username = home_dir.split("/")[-1]
-            pattern = f"/home/{username}"
-            replacement = "/home/$USER"
-            log_message = re.sub(pattern, replacement, log_message)
+        for pattern, replacement in _sanitize_patterns(os.path.expanduser("~")):
+            log_message = pattern.sub(replacement, log_message)
 
         return log_message
@@ -1,17 +1,29 @@
 """Module responsible for generating and managing summary counts of phrases."""
 
+import os
+import threading
+import time
 from multiprocessing import Queue
 
-from adb_auto_player.ipc import Summary
-
 _ValueType = int | str | float
+_Entries = dict[str, dict[str, _ValueType]]
 
 
 class SummaryGenerator:
-    """Singleton class to maintain and update counts for given phrases."""
+    """Singleton class to maintain and update counts for given phrases.
+
+    Updates only change the in-memory entries. With a message queue set, a
+    background thread sends the items changed since the last send at most every
+    flush_interval seconds, the main process assembles the summary message.
+    """
+
+    # Key of the messages carrying changed items to the main process.
+    DELTA_KEY = "summary_delta"
 
     _instance = None
     _message_queue = None
+    # Seconds between two deltas sent to the main process at least.
+    flush_interval: float = 0.5
 
     def __new__(cls):
         """Create or return the singleton instance of SummaryGenerator.
@@ -30,7 +42,16 @@ class SummaryGenerator:
         _json_handler_present will be set when the JsonLogHandler is initialized.
         """
         if not hasattr(self, "entries"):
-            self.entries: dict[str, dict[str, _ValueType]] = {}
+            self.entries: _Entries = {}
+            self._init_flush_state()
+
+    def _init_flush_state(self) -> None:
+        self._pending: _Entries = {}
+        self._lock = threading.Lock()
+        # Held while a delta is taken and sent so deltas arrive in order.
+        self._flush_lock = threading.Lock()
+        self._changed = threading.Event()
+        self._flusher: threading.Thread | None = None
 
     @classmethod
     def set_message_queue(cls, message_queue: Queue) -> None:
@@ -41,7 +62,13 @@ class SummaryGenerator:
         Args:
             message_queue: Queue for sending messages to the main process
         """
-        cls()._message_queue = message_queue
+        instance = cls()
+        instance._message_queue = message_queue
+        if instance._flusher is None or not instance._flusher.is_alive():
+            instance._flusher = threading.Thread(
+                target=instance._run_flusher, name="SummaryFlusher", daemon=True
+            )
+            instance._flusher.start()
 
     @classmethod
     def increment(cls, section_header: str, item: str, count: int = 1) -> None:
@@ -57,18 +84,18 @@ class SummaryGenerator:
         """
         instance = cls()
 
-        if section_header not in instance.entries:
-            instance.entries[section_header] = {}
-
-        value = instance.entries[section_header].get(item, 0)
-        if not isinstance(value, int):
-            raise TypeError(
-                f"Can't increment non-integer value for '{item}' "
-                f"under '{section_header}'. "
-                f"Current value: {value} (type: {type(value).__name__})"
-            )
-        instance.entries[section_header][item] = value + count
-        instance._flush_summary()
+        with instance._lock:
+            section = instance.entries.setdefault(section_header, {})
+            value = section.get(item, 0)
+            if not isinstance(value, int):
+                raise TypeError(
+                    f"Can't increment non-integer value for '{item}' "
+                    f"under '{section_header}'. "
+                    f"Current value: {value} (type: {type(value).__name__})"
+                )
+            section[item] = value + count
+            instance._pending.setdefault(section_header, {})[item] = value + count
+        instance._changed.set()
 
     @classmethod
     def set(cls, section_header: str, item: str, value: _ValueType) -> None:
@@ -81,25 +108,44 @@ class SummaryGenerator:
         """
         instance = cls()
 
-        if section_header not in instance.entries:
-            instance.entries[section_header] = {}
-
-        instance.entries[section_header][item] = value
-        instance._flush_summary()
+        with instance._lock:
+            instance.entries.setdefault(section_header, {})[item] = value
+            instance._pending.setdefault(section_header, {})[item] = value
+        instance._changed.set()
 
-    def _flush_summary(self) -> None:
-        """Send summary via log queue or STDOUT depending on availability."""
-        message = self.get_summary_message()
-        if not message:
-            return
+    @classmethod
+    def flush(cls) -> None:
+        """Send the items changed since the last delta right away.
 
-        if self._message_queue:
+        Call before the command ends, the background thread may not get to it.
+        """
+        instance = cls()
+        with instance._flush_lock:
+            with instance._lock:
+                pending, instance._pending = instance._pending, {}
+                instance._changed.clear()
+            if not pending or not instance._message_queue:
+                return
             try:
-                summary_data = Summary(message).to_dict()
-                self._message_queue.put(summary_data)
+                instance._message_queue.put({cls.DELTA_KEY: pending})
             except Exception as e:
                 print(f"Failed to send summary via queue: {e}")
 
+    @classmethod
+    def reset(cls) -> None:
+        """Forget all entries, e.g. before a worker executes the next command."""
+        instance = cls()
+        with instance._lock:
+            instance.entries = {}
+            instance._pending = {}
+
+    def _run_flusher(self) -> None:
+        while True:
+            self._changed.wait()
+            # Updates arriving meanwhile are sent along.
+            time.sleep(self.flush_interval)
+            self.flush()
+
     def get_summary_message(self) -> str | None:
         """Generate a formatted summary message from the current entries.
 
@@ -107,15 +153,41 @@ class SummaryGenerator:
             str: Formatted summary message with sections and items
             None: If no entries exist
         """
-        if not self.entries:
+        with self._lock:
+            return self.format_summary(self.entries)
+
+    @staticmethod
+    def apply_delta(entries: _Entries, delta: _Entries) -> None:
+        """Update entries assembled from deltas in place."""
+        for header, items in delta.items():
+            entries.setdefault(header, {}).update(items)
+
+    @staticmethod
+    def format_summary(entries: _Entries) -> str | None:
+        """Format entries as summary message.
+
+        Returns:
+            str: Formatted summary message with sections and items
+            None: If no entries exist
+        """
+        if not entries:
             return None
 
         lines = ["=== SUMMARY ==="]
-        for i, (header, phrases) in enumerate(self.entries.items()):
+        for i, (header, phrases) in enumerate(entries.items()):
             lines.append(header)
             for phrase, count in phrases.items():
                 lines.append(f"  {phrase}: {count}")
-            if i < len(self.entries) - 1:
+            if i < len(entries) - 1:
                 lines.append("")
 
         return "\n".join(lines)
+
+
+def _after_fork_in_child() -> None:
+    # Locks may have been held and the flusher does not exist in the child.
+    if SummaryGenerator._instance is not None:
+        SummaryGenerator._instance._init_flush_state()
+
+
+os.register_at_fork(after_in_child=_after_fork_in_child)
@@ -0,0 +1,424 @@
+"""Warm worker processes executing commands for the server.
+
+Starting a process per command re-imports the package, rebuilds the argument
+parser, reconnects to ADB and decodes templates before any work starts. Workers
+of the pool do that once in advance and then execute commands sent over a pipe.
+"""
+
+import argparse
+import logging
+import multiprocessing
+import os
+import signal
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from multiprocessing.connection import Connection
+from multiprocessing.connection import wait as wait_for_objects
+from multiprocessing.process import BaseProcess
+from multiprocessing.queues import Queue
+from multiprocessing.synchronize import Event
+
+import psutil
+from adb_auto_player.cli import ArgparseHelper
+from adb_auto_player.device.adb import AdbClientHelper, AdbController, DeviceStream
+from adb_auto_player.image_manipulation import IO, PreviewPublisher
+from adb_auto_player.ipc import LogMessage
+from adb_auto_player.log import LogPipeline, LogPreset
+from adb_auto_player.models.commands import Command
+from adb_auto_player.settings import ConfigLoader
+from adb_auto_player.util import (
+    Execute,
+    LogMessageFactory,
+    Metrics,
+    MetricsSnapshot,
+    StringHelper,
+    SummaryGenerator,
+)
+
+# Seconds between metrics snapshots sent while a command runs.
+METRICS_INTERVAL = 5.0
+# Seconds between stats of the device streams sent while a command runs.
+STREAM_STATS_INTERVAL = 1.0
+
+
+class ProcessLogHandler(logging.Handler):
+    """A logging handler that sends LogMessage objects to a queue for ipc."""
+
+    def __init__(self, message_queue):
+        super().__init__()
+        self.message_queue = message_queue
+
+    def emit(self, record):
+        """Convert log record to LogMessage and send to queue."""
+        try:
+            preset: LogPreset | None = getattr(record, "preset", None)
+
+            log_message: LogMessage = LogMessageFactory.create_log_message(
+                record=record,
+                message=StringHelper.sanitize_path(record.getMessage()),
+                html_class=preset.get_html_class() if preset else None,
+            )
+
+            self.message_queue.put(log_message.to_dict())
+        except Exception as e:
+            print(f"Failed to send log to queue: {e}")
+
+
+def run_command_in_process(
+    command: list[str], commands_dict: dict, message_queue: Queue
+) -> bool:
+    """Function to run a command in a separate process.
+
+    This function will be executed in the child process.
+
+    Returns:
+        bool: False if the command is unknown or ended with an error.
+    """
+    queue_handler = ProcessLogHandler(message_queue)
+    queue_handler.setLevel(logging.DEBUG)
+    log_pipeline = LogPipeline(queue_handler)
+    logger = logging.getLogger()
+    try:
+        for handler in logger.handlers[:]:
+            logger.removeHandler(handler)
+
+        log_pipeline.start()
+        logger.addHandler(log_pipeline.handler)
+        logger.setLevel(logging.DEBUG)
+        # Workers are reused, the summary starts empty for every command.
+        SummaryGenerator.reset()
+        SummaryGenerator.set_message_queue(message_queue)
+
+        parser = ArgparseHelper.build_argument_parser(
+            commands_dict, exit_on_error=False
+        )
+        args = parser.parse_args(command)
+
+        result = Execute.find_command_and_execute(args.command, commands_dict)
+        if isinstance(result, Exception):
+            logging.error(f"Task ended with Error: {result}")
+            return False
+        if not result:
+            logging.error(f"Unrecognized command: {command}")
+            return False
+
+        return True
+
+    except argparse.ArgumentError as e:
+        logging.error(f"Unrecognized command: {e}")
+        return False
+    except Exception as e:
+        logging.error(f"Execution error: {e!s}")
+        return False
+    finally:
+        # Workers are reused, threads and shells of the device must not outlive
+        # the command.
+        AdbController.close_all()
+        # Log messages have to arrive before the end marker.
+        logger.removeHandler(log_pipeline.handler)
+        log_pipeline.stop()
+        SummaryGenerator.flush()
+        message_queue.put(None)
+
+
+@dataclass(frozen=True)
+class CommandResult:
+    """Outcome of a command executed by a worker."""
+
+    success: bool
+    # Resident memory of the worker after the command in bytes.
+    memory_rss: int
+    metrics: MetricsSnapshot | None = None
+
+
+def _warm_up(commands: dict[str, list[Command]]) -> None:
+    """Do the work every command needs before the first command arrives."""
+    try:
+        ArgparseHelper.build_argument_parser(commands, exit_on_error=False)
+        # Templates are used at scale factor 1.0 on supported resolutions.
+        for template in ConfigLoader.games_dir().glob("*/templates/**/*.png"):
+            IO.load_image(template)
+        AdbClientHelper.get_adb_client()
+    except Exception as e:
+        logging.debug(f"Worker warm up failed: {e}")
+
+
+def _publish_metrics(message_queue: Queue, command_running: threading.Event) -> None:
+    """Send metrics of long-running commands, the server merges them."""
+    while True:
+        time.sleep(METRICS_INTERVAL)
+        if command_running.is_set():
+            try:
+                message_queue.put({"metrics": Metrics.snapshot()})
+            except Exception as e:
+                logging.debug(f"Cannot send metrics: {e}")
+
+
+def _publish_stream_stats(
+    message_queue: Queue, command_running: threading.Event
+) -> None:
+    """Send fps and dropped frames of running device streams."""
+    while True:
+        time.sleep(STREAM_STATS_INTERVAL)
+        if not command_running.is_set():
+            continue
+        for stream in DeviceStream.running_streams():
+            try:
+                message_queue.put(stream.stats().to_dict())
+            except Exception as e:
+                logging.debug(f"Cannot send stream stats: {e}")
+
+
+def _flush_on_sigterm(message_queue: Queue) -> None:
+    """Send pending summary updates before the worker is terminated.
+
+    Stopping a command terminates its worker, the summary updates of the last
+    flush_interval would be lost. Signals go to any thread not blocking them, so
+    SIGTERM is blocked in all threads of the worker and taken here.
+    """
+    signal.sigwait({signal.SIGTERM})
+    SummaryGenerator.flush()
+    # The command ends here, log records still in the pipeline are lost.
+    message_queue.put(None)
+    # Everything queued so far still reaches the server.
+    message_queue.close()
+    message_queue.join_thread()
+    os._exit(128 + signal.SIGTERM)
+
+
+def _worker_main(
+    commands: dict[str, list[Command]],
+    connection: Connection,
+    message_queue: Queue,
+    preview_requested: Event,
+) -> None:
+    # Windows terminates processes without a signal.
+    if hasattr(signal, "pthread_sigmask"):
+        # Threads started from here on inherit the mask.
+        signal.pthread_sigmask(signal.SIG_BLOCK, {signal.SIGTERM})
+        threading.Thread(
+            target=_flush_on_sigterm,
+            args=(message_queue,),
+            name="SigtermHandler",
+            daemon=True,
+        ).start()
+    _warm_up(commands)
+    PreviewPublisher.configure(message_queue, preview_requested)
+    command_running = threading.Event()
+    threading.Thread(
+        target=_publish_metrics,
+        args=(message_queue, command_running),
+        name="MetricsPublisher",
+        daemon=True,
+    ).start()
+    threading.Thread(
+        target=_publish_stream_stats,
+        args=(message_queue, command_running),
+        name="StreamStatsPublisher",
+        daemon=True,
+    ).start()
+    memory = psutil.Process()
+    while True:
+        try:
+            command = connection.recv()
+        except (EOFError, OSError):
+            return
+        if command is None:
+            return
+        command_running.set()
+        success = run_command_in_process(command, commands, message_queue)
+        command_running.clear()
+        connection.send(
+            CommandResult(success, memory.memory_info().rss, Metrics.snapshot())
+        )
+
+
+class CommandWorker:
+    """Worker process accepting commands over a pipe."""
+
+    def __init__(self, commands: dict[str, list[Command]], preview_requested: Event):
+        """Start the worker process.
+
+        Args:
+            commands: Commands the worker can execute.
+            preview_requested: Set while a live preview is watched.
+        """
+        context = multiprocessing.get_context()
+        self.message_queue: Queue = context.Queue()
+        self.commands_run = 0
+        self._connection, child_connection = context.Pipe()
+        self.process: BaseProcess = context.Process(
+            target=_worker_main,
+            args=(commands, child_connection, self.message_queue, preview_requested),
+            name="CommandWorker",
+        )
+        self.process.start()
+        child_connection.close()
+
+    def is_alive(self) -> bool:
+        """Whether the worker process is running."""
+        return self.process.is_alive()
+
+    def submit(self, command: list[str]) -> None:
+        """Execute a command, messages are put into message_queue.
+
+        Raises:
+            OSError: The worker process is gone.
+        """
+        self.commands_run += 1
+        self._connection.send(command)
+
+    def wait(self, timeout: float | None = None) -> CommandResult | None:
+        """Wait until the submitted command finished.
+
+        Args:
+            timeout: Seconds to wait, None waits forever.
+
+        Returns:
+            CommandResult | None: None on timeout or if the process exited.
+        """
+        ready = wait_for_objects([self._connection, self.process.sentinel], timeout)
+        if self._connection not in ready:
+            return None
+        try:
+            return self._connection.recv()
+        except (EOFError, OSError):
+            return None
+
+    def shutdown(self) -> None:
+        """Let the worker exit once it finished the current command."""
+        try:
+            self._connection.send(None)
+        except OSError:
+            pass
+        self._connection.close()
+
+    def terminate(self) -> None:
+        """Terminate the worker process immediately."""
+        if self.process.is_alive():
+            self.process.terminate()
+        self._connection.close()
+
+
+class CommandWorkerPool:
+    """Keeps warm workers ready for the next command.
+
+    Workers are used for one command at a time and returned afterwards. Workers
+    whose command failed, which use too much memory or executed many commands
+    are replaced by fresh ones. Stopping a command terminates its worker.
+
+    Methods starting processes block, call them off the event loop.
+    """
+
+    def __init__(
+        self,
+        commands: dict[str, list[Command]],
+        size: int = 1,
+        max_memory_mb: int = 1024,
+        max_commands_per_worker: int = 25,
+    ):
+        """Init.
+
+        Args:
+            commands: Commands the workers can execute.
+            size: Workers kept warm, workers executing a command count
+                towards it.
+            max_memory_mb: Workers using more memory after a command are
+                replaced.
+            max_commands_per_worker: Workers are replaced after this many
+                commands, state like running threads can leak between commands.
+        """
+        self.commands = commands
+        self.size = size
+        self.max_memory_mb = max_memory_mb
+        self.max_commands_per_worker = max_commands_per_worker
+        self._lock = threading.Lock()
+        # Workers only encode preview frames while this is set.
+        self.preview_requested: Event = multiprocessing.get_context().Event()
+        self._idle: deque[CommandWorker] = deque()
+        # Workers executing a command, they count towards size.
+        self._busy = 0
+        self._running = False
+
+    def start(self) -> None:
+        """Start the idle workers."""
+        self._running = True
+        self._replenish()
+
+    def acquire(self) -> CommandWorker:
+        """Take a warm worker or start a new one if none is ready."""
+        worker = None
+        with self._lock:
+            while self._idle and worker is None:
+                candidate = self._idle.popleft()
+                if candidate.is_alive():
+                    worker = candidate
+                else:
+                    candidate.terminate()
+            self._busy += 1
+        if worker is None:
+            logging.debug("No warm worker ready, starting a new one")
+            worker = CommandWorker(self.commands, self.preview_requested)
+        return worker
+
+    def release(self, worker: CommandWorker, result: CommandResult | None) -> None:
+        """Return a worker after its command finished.
+
+        Args:
+            worker: Worker returned by acquire.
+            result: Result of the command, None if it did not finish.
+        """
+        if result is None or not self._is_reusable(worker, result):
+            self.discard(worker)
+            return
+        with self._lock:
+            self._busy -= 1
+            if self._running and len(self._idle) + self._busy < self.size:
+                self._idle.append(worker)
+                return
+        worker.shutdown()
+
+    def discard(self, worker: CommandWorker) -> None:
+        """Terminate a worker returned by acquire and start a replacement."""
+        worker.terminate()
+        with self._lock:
+            self._busy -= 1
+        self._replenish()
+
+    def recycle_idle(self) -> None:
+        """Replace idle workers, e.g. when settings they cached changed."""
+        with self._lock:
+            idle = list(self._idle)
+            self._idle.clear()
+        for worker in idle:
+            worker.shutdown()
+        self._replenish()
+
+    def shutdown(self) -> None:
+        """Stop all idle workers, running commands are not affected."""
+        self._running = False
+        with self._lock:
+            idle = list(self._idle)
+            self._idle.clear()
+        for worker in idle:
+            worker.shutdown()
+
+    def _is_reusable(self, worker: CommandWorker, result: CommandResult) -> bool:
+        if not result.success:
+            logging.debug("Replacing worker after failed command")
+            return False
+        if result.memory_rss > self.max_memory_mb * 1024 * 1024:
+            logging.debug(
+                f"Replacing worker using {result.memory_rss // (1024 * 1024)} MB"
+            )
+            return False
+        return worker.commands_run < self.max_commands_per_worker
+
+    def _replenish(self) -> None:
+        with self._lock:
+            if not self._running:
+                return
+            while len(self._idle) + self._busy < self.size:
+                self._idle.append(CommandWorker(self.commands, self.preview_requested))
@@ -0,0 +1,16 @@
+"""Shared pytest fixtures."""
+
+import pytest
+from adb_auto_player.settings import ConfigLoader
+
+
+@pytest.fixture(autouse=True, scope="session")
+def cache_dir(tmp_path_factory: pytest.TempPathFactory):
+    """Keep data learned at runtime out of the real cache dir."""
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.setenv(
+            "ADB_AUTO_PLAYER_CACHE_DIR", str(tmp_path_factory.mktemp("cache"))
+        )
+        ConfigLoader.cache_dir.cache_clear()
+        yield ConfigLoader.cache_dir()
+    ConfigLoader.cache_dir.cache_clear()
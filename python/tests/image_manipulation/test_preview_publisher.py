@@ -0,0 +1,54 @@
+import multiprocessing
+import queue
+import unittest
+
+import cv2
+import numpy as np
+from adb_auto_player.image_manipulation import ColorFormat, PreviewPublisher
+from adb_auto_player.models.geometry import Box, Point
+
+
+class TestPreviewPublisher(unittest.TestCase):
+    """Test PreviewPublisher."""
+
+    def test_encode_downscales_and_converts(self):
+        """Frames are downscaled to max_size and returned as JPEG in BGR."""
+        frame = np.zeros((1920, 1080, 3), dtype=np.uint8)
+        frame[:, :, 0] = 255
+
+        data = PreviewPublisher.encode(frame, ColorFormat.RGB)
+
+        self.assertIsNotNone(data)
+        image = cv2.imdecode(np.frombuffer(data, np.uint8), cv2.IMREAD_COLOR)  # type: ignore[arg-type]
+        self.assertEqual(image.shape[:2], (960, 540))
+        blue, _, red = image[480, 270]
+        self.assertGreater(red, 200)
+        self.assertLess(blue, 50)
+
+    def test_encode_draws_boxes(self):
+        """Match boxes are drawn at the downscaled position."""
+        frame = np.zeros((1920, 1080, 3), dtype=np.uint8)
+        box = Box(Point(100, 200), 400, 300)
+
+        data = PreviewPublisher.encode(frame, ColorFormat.BGR, [box])
+
+        image = cv2.imdecode(np.frombuffer(data, np.uint8), cv2.IMREAD_COLOR)  # type: ignore[arg-type]
+        self.assertGreater(int(image[100, 150, 1]), 150)
+        self.assertLess(int(image[175, 150, 1]), 50)
+
+    def test_frames_only_published_when_requested(self):
+        """Offered frames are ignored until a preview is requested."""
+        message_queue = multiprocessing.Queue()
+        requested = multiprocessing.Event()
+        PreviewPublisher.configure(message_queue, requested)
+        frame = np.zeros((100, 100, 3), dtype=np.uint8)
+
+        PreviewPublisher.offer(frame, ColorFormat.BGR)
+        with self.assertRaises(queue.Empty):
+            message_queue.get(timeout=0.3)
+
+        requested.set()
+        self.addCleanup(requested.clear)
+        PreviewPublisher.offer(frame, ColorFormat.BGR)
+        message = message_queue.get(timeout=5)
+        self.assertTrue(message["preview_frame"].startswith(b"\xff\xd8"))
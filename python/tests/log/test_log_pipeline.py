@@ -0,0 +1,85 @@
+import io
+import logging
+import threading
+import unittest
+from contextlib import redirect_stdout
+
+from adb_auto_player.log import LogPipeline
+from adb_auto_player.log.logging_setup import TextLogHandler
+
+
+class _RecordingHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.messages: list[str] = []
+        self.threads: set[str] = set()
+        self.flushes = 0
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.messages.append(record.getMessage())
+        self.threads.add(threading.current_thread().name)
+
+    def flush(self) -> None:
+        self.flushes += 1
+
+
+class TestLogPipeline(unittest.TestCase):
+    """Test LogPipeline."""
+
+    def setUp(self):
+        self.logger = logging.getLogger("tests.log_pipeline")
+        self.logger.propagate = False
+        self.logger.setLevel(logging.DEBUG)
+        self.recorder = _RecordingHandler()
+        self.pipeline = LogPipeline(self.recorder)
+        self.logger.addHandler(self.pipeline.handler)
+        self.addCleanup(self.logger.removeHandler, self.pipeline.handler)
+        self.addCleanup(self.pipeline.stop)
+
+    def test_records_are_handled_in_order_on_pipeline_thread(self):
+        """Handlers run on another thread and see every record in order."""
+        self.pipeline.start()
+        for index in range(100):
+            self.logger.info(f"{index}")
+        self.pipeline.drain()
+
+        self.assertEqual(self.recorder.messages, [str(i) for i in range(100)])
+        self.assertNotIn(threading.current_thread().name, self.recorder.threads)
+        self.assertGreaterEqual(self.recorder.flushes, 1)
+
+    def test_message_is_rendered_when_logged(self):
+        """Arguments changed after the call do not change the message."""
+        items = ["a"]
+        self.logger.info("Items: %s", items)
+        items.append("b")
+        self.pipeline.start()
+        self.pipeline.stop()
+
+        self.assertEqual(self.recorder.messages, ["Items: ['a']"])
+
+    def test_stop_handles_remaining_records(self):
+        """Records logged before stop are not lost."""
+        self.pipeline.start()
+        for index in range(100):
+            self.logger.info(f"{index}")
+        self.pipeline.stop()
+
+        self.assertEqual(len(self.recorder.messages), 100)
+
+    def test_text_output_is_flushed_once_drained(self):
+        """Text lines are written by the pipeline thread."""
+        pipeline = LogPipeline(TextLogHandler())
+        self.logger.addHandler(pipeline.handler)
+        self.addCleanup(self.logger.removeHandler, pipeline.handler)
+        output = io.StringIO()
+        with redirect_stdout(output):
+            pipeline.start()
+            self.logger.warning("/home/$USER/file.txt")
+            pipeline.stop()
+
+        self.assertIn("[WARNING]", output.getvalue())
+        self.assertTrue(output.getvalue().endswith("/home/$USER/file.txt\n"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,114 @@
+import unittest
+from unittest.mock import patch
+
+import numpy as np
+from adb_auto_player.models.geometry import Box, Point
+from adb_auto_player.ocr import GroupingLevel, TesseractBackend, build_mosaic
+
+ROIS = [
+    Box(Point(100, 50), width=60, height=20),
+    Box(Point(10, 300), width=120, height=30),
+]
+
+
+def _screen() -> np.ndarray:
+    screen = np.zeros((400, 200, 3), dtype=np.uint8)
+    screen[50:70, 100:160] = 200
+    screen[300:330, 10:130] = 100
+    return screen
+
+
+def _word(text, conf, box, line=(1, 1, 1, 1)):
+    left, top, width, height = box
+    return {
+        "text": text,
+        "conf": conf,
+        "left": left,
+        "top": top,
+        "width": width,
+        "height": height,
+        "page_num": line[0],
+        "block_num": line[1],
+        "par_num": line[2],
+        "line_num": line[3],
+    }
+
+
+def _data(*words):
+    return {key: [word[key] for word in words] for key in words[0]}
+
+
+class TestMosaic(unittest.TestCase):
+    """Test build_mosaic."""
+
+    def test_layout(self):
+        """Regions are stacked vertically with padding."""
+        mosaic = build_mosaic(_screen(), ROIS, padding=10)
+
+        self.assertEqual(mosaic.image.shape, (10 + 20 + 10 + 30 + 10, 140, 3))
+        self.assertEqual(mosaic.origins, (Point(10, 10), Point(10, 40)))
+        np.testing.assert_array_equal(mosaic.image[10:30, 10:70], 200)
+        np.testing.assert_array_equal(mosaic.image[40:70, 10:130], 100)
+        # padding uses the background of the region
+        np.testing.assert_array_equal(mosaic.image[0, 0], [200, 200, 200])
+
+    def test_grayscale(self):
+        """Grayscale images stay grayscale."""
+        gray = _screen()[:, :, 0]
+        self.assertEqual(build_mosaic(gray, ROIS).image.ndim, 2)
+
+    def test_invalid_regions(self):
+        """Regions have to be within the image."""
+        with self.assertRaises(ValueError):
+            build_mosaic(_screen(), [])
+        with self.assertRaises(ValueError):
+            build_mosaic(_screen(), [Box(Point(190, 0), width=20, height=10)])
+
+
+class TestDetectTextBatch(unittest.TestCase):
+    """Test TesseractBackend.detect_text_batch."""
+
+    @patch("adb_auto_player.ocr.tesseract_backend._initialize_tesseract")
+    def test_results_are_mapped_to_rois(self, _):
+        """One OCR run, results per region in screen coordinates."""
+        # Mosaic with padding 10: roi 0 at (10, 10), roi 1 at (10, 40).
+        data = _data(
+            _word("12/30", 95, (12, 12, 50, 16), line=(1, 1, 1, 1)),
+            _word("Challenge", 90, (14, 45, 60, 20), line=(1, 1, 1, 2)),
+            _word("Attempts", 80, (78, 45, 60, 20), line=(1, 1, 1, 2)),
+            _word("noise", 10, (0, 0, 5, 5), line=(1, 1, 1, 3)),
+        )
+        backend = TesseractBackend()
+        with patch.object(
+            TesseractBackend, "_image_to_data", return_value=data
+        ) as image_to_data:
+            words = backend.detect_text_batch(_screen(), ROIS, padding=10)
+            lines = backend.detect_text_batch(
+                _screen(), ROIS, padding=10, level=GroupingLevel.BLOCK
+            )
+
+        self.assertEqual(image_to_data.call_count, 2)
+        self.assertEqual(
+            [[w.text for w in roi] for roi in words],
+            [
+                ["12/30"],
+                ["Challenge", "Attempts"],
+            ],
+        )
+        self.assertEqual(words[0][0].box, Box(Point(102, 52), 50, 16))
+        self.assertEqual(words[1][0].box.top_left, Point(14, 305))
+        # Attempts is clipped to the right edge of its region.
+        self.assertEqual(words[1][1].box.right, 130)
+        # One block in the mosaic is split per region.
+        self.assertEqual(
+            [[b.text for b in roi] for roi in lines],
+            [
+                ["12/30"],
+                ["Challenge Attempts"],
+            ],
+        )
+
+    @patch("adb_auto_player.ocr.tesseract_backend._initialize_tesseract")
+    def test_no_rois(self, _):
+        """Nothing to recognize."""
+        self.assertEqual(TesseractBackend().detect_text_batch(_screen(), []), [])
@@ -0,0 +1,97 @@
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import Mock
+
+import cv2
+import numpy as np
+from adb_auto_player.ocr import (
+    NumberSource,
+    NumericReader,
+    OCRDocument,
+)
+from adb_auto_player.ocr.numeric_reader import segment_glyphs
+
+DIGITS = "0123456789"
+
+
+def _number_image(text: str) -> np.ndarray:
+    """Light digits on a dark HUD background."""
+    image = np.full((40, 30 * len(text) + 20, 3), (60, 40, 30), dtype=np.uint8)
+    cv2.putText(image, text, (10, 30), cv2.FONT_HERSHEY_DUPLEX, 1.0, (250, 250, 250), 2)
+    return image
+
+
+def _trained_reader(**kwargs) -> NumericReader:
+    reader = NumericReader(**kwargs)
+    assert reader.learn(_number_image(DIGITS), DIGITS)
+    return reader
+
+
+class TestNumericReader(unittest.TestCase):
+    """Test NumericReader."""
+
+    def test_segment_glyphs(self):
+        """Digits are separated by column projection."""
+        glyphs = segment_glyphs(_number_image("1337"))
+        self.assertEqual(len(glyphs), 4)
+        self.assertTrue(all(glyph.dtype == bool for glyph in glyphs))
+
+    def test_read(self):
+        """Numbers composed of learned glyphs are read with high confidence."""
+        reader = _trained_reader()
+        for number in (0, 7, 42, 1337, 90817):
+            with self.subTest(number=number):
+                reading = reader.read(_number_image(str(number)))
+                self.assertIsNotNone(reading)
+                assert reading is not None
+                self.assertEqual(reading.value, number)
+                self.assertEqual(reading.source, NumberSource.GLYPHS)
+                self.assertGreaterEqual(reading.confidence.value, 0.95)
+
+    def test_learn_mismatch(self):
+        """Samples with a wrong glyph count are rejected."""
+        reader = NumericReader()
+        self.assertFalse(reader.learn(_number_image("12"), "123"))
+        self.assertEqual(reader.labels, [])
+        self.assertIsNone(reader.read(_number_image("12")))
+
+    def test_fallback_below_threshold(self):
+        """Unknown glyphs are read by Tesseract."""
+        fallback = Mock()
+        fallback.recognize.return_value = OCRDocument.from_tesseract_data(
+            {
+                "text": ["5/7"],
+                "conf": [88.0],
+                "left": [0],
+                "top": [0],
+                "width": [10],
+                "height": [10],
+                "page_num": [1],
+                "block_num": [1],
+                "par_num": [1],
+                "line_num": [1],
+            }
+        )
+        reader = _trained_reader(fallback=fallback)
+
+        reading = reader.read(_number_image("5/7"))
+
+        fallback.recognize.assert_called_once()
+        assert reading is not None
+        self.assertEqual(reading.value, 57)
+        self.assertEqual(reading.source, NumberSource.TESSERACT)
+        self.assertAlmostEqual(reading.confidence.value, 0.88)
+
+    def test_save_and_load(self):
+        """Templates can be stored per game."""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "afk_journey" / "digits.npz"
+            _trained_reader().save(path)
+            reader = NumericReader()
+            reader.load(path)
+
+        self.assertEqual(reader.labels, list(DIGITS))
+        reading = reader.read(_number_image("2024"))
+        assert reading is not None
+        self.assertEqual(reading.value, 2024)
@@ -0,0 +1,119 @@
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+import numpy as np
+from adb_auto_player.ocr import OCRCache, TesseractBackend, TesseractConfig
+
+
+def _image(seed: int, shape: tuple[int, ...] = (40, 120, 3)) -> np.ndarray:
+    return np.random.default_rng(seed).integers(0, 256, shape, dtype=np.uint8)
+
+
+class TestOCRCache(unittest.TestCase):
+    """Test OCRCache."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.cache = OCRCache(max_entries=3)
+
+    def test_hit_skips_compute(self):
+        """Identical image and config are only computed once."""
+        compute = Mock(return_value="Skip this battle?")
+        image = _image(1)
+
+        self.assertEqual(
+            self.cache.get_or_compute(image, "cfg", compute), "Skip this battle?"
+        )
+        self.assertEqual(
+            self.cache.get_or_compute(image.copy(), "cfg", compute),
+            "Skip this battle?",
+        )
+
+        compute.assert_called_once()
+        self.assertEqual(self.cache.stats.hits, 1)
+        self.assertEqual(self.cache.stats.misses, 1)
+        self.assertEqual(self.cache.stats.hit_rate, 0.5)
+
+    def test_config_is_part_of_key(self):
+        """Different configs do not share results."""
+        image = _image(1)
+        self.cache.get_or_compute(image, "psm 6", lambda: "a")
+        self.assertEqual(self.cache.get_or_compute(image, "psm 7", lambda: "b"), "b")
+
+    def test_lru_eviction(self):
+        """Memory is bounded, least recently used entries are evicted."""
+        images = [_image(i) for i in range(4)]
+        for i, image in enumerate(images[:3]):
+            self.cache.get_or_compute(image, "cfg", lambda i=i: i)
+        # touch first entry so the second one is evicted
+        self.cache.get_or_compute(images[0], "cfg", lambda: -1)
+        self.cache.get_or_compute(images[3], "cfg", lambda: 3)
+
+        self.assertEqual(len(self.cache), 3)
+        self.assertEqual(self.cache.get_or_compute(images[0], "cfg", lambda: -1), 0)
+        self.assertEqual(self.cache.get_or_compute(images[1], "cfg", lambda: -1), -1)
+
+    def test_near_duplicate_mode(self):
+        """Small pixel differences hit when near duplicates are allowed."""
+        image = np.zeros((40, 120), dtype=np.uint8)
+        image[10:30, 10:110:8] = 255
+        noisy = image.copy()
+        noisy[0, 0] = 3
+
+        self.cache.get_or_compute(image, "cfg", lambda: "text")
+        self.assertEqual(self.cache.get_or_compute(noisy, "cfg", lambda: "x"), "x")
+
+        near_cache = OCRCache(near_duplicate_max_distance=4)
+        near_cache.get_or_compute(image, "cfg", lambda: "text")
+        self.assertEqual(near_cache.get_or_compute(noisy, "cfg", lambda: "x"), "text")
+        self.assertEqual(near_cache.stats.near_duplicate_hits, 1)
+        # different content is not a near duplicate
+        self.assertEqual(
+            near_cache.get_or_compute(_image(2, (40, 120)), "cfg", lambda: "y"), "y"
+        )
+
+    def test_persistence(self):
+        """Entries survive across cache instances."""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "ocr_cache.json"
+            image = _image(1)
+            with patch("adb_auto_player.ocr.ocr_cache.atexit"):
+                cache = OCRCache(persist_path=path)
+                cache.get_or_compute(image, "cfg", lambda: {"text": ["a"]})
+                cache.save()
+
+                loaded = OCRCache(persist_path=path)
+            self.assertEqual(
+                loaded.get_or_compute(image, "cfg", lambda: None), {"text": ["a"]}
+            )
+
+    @patch("adb_auto_player.ocr.tesseract_backend._initialize_tesseract")
+    def test_backend_shares_entry_across_grouping_levels(self, _):
+        """Raw data is cached, lines and blocks reuse the same OCR run."""
+        data = {
+            "text": ["Hello"],
+            "conf": ["95"],
+            "left": [1],
+            "top": [2],
+            "width": [30],
+            "height": [10],
+            "page_num": [1],
+            "block_num": [1],
+            "par_num": [1],
+            "line_num": [1],
+        }
+        backend = TesseractBackend(TesseractConfig(), cache=self.cache)
+        with patch.object(
+            TesseractBackend, "_image_to_data", return_value=data
+        ) as image_to_data:
+            image = _image(1)
+            blocks = backend.detect_text_blocks(image)
+            lines = backend.detect_text_lines(image)
+            words = backend.detect_text(image)
+
+        image_to_data.assert_called_once()
+        self.assertEqual(blocks[0].text, "Hello")
+        self.assertEqual(lines[0].text, "Hello")
+        self.assertEqual(words[0].text, "Hello")
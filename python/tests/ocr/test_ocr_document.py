@@ -0,0 +1,96 @@
+import unittest
+from unittest.mock import patch
+
+import numpy as np
+from adb_auto_player.models import ConfidenceValue
+from adb_auto_player.ocr import GroupingLevel, OCRDocument, TesseractBackend
+
+# Output of pytesseract.image_to_data with two blocks, the first one has two lines.
+DATA = {
+    "level": [1, 2, 3, 4, 5, 5, 4, 5, 2, 3, 4, 5, 5],
+    "page_num": [1] * 13,
+    "block_num": [0, 1, 1, 1, 1, 1, 1, 1, 2, 2, 2, 2, 2],
+    "par_num": [0, 0, 1, 1, 1, 1, 1, 1, 0, 1, 1, 1, 1],
+    "line_num": [0, 0, 0, 1, 1, 1, 2, 2, 0, 0, 1, 1, 1],
+    "word_num": [0, 0, 0, 0, 1, 2, 0, 1, 0, 0, 0, 1, 2],
+    "left": [0, 10, 10, 10, 10, 70, 10, 10, 200, 200, 200, 200, 260],
+    "top": [0, 10, 10, 10, 10, 12, 50, 50, 300, 300, 300, 300, 300],
+    "width": [800, 120, 120, 120, 50, 60, 40, 40, 100, 100, 100, 50, 40],
+    "height": [600, 70, 70, 30, 30, 28, 30, 30, 20, 20, 20, 20, 20],
+    "conf": ["-1", "-1", "-1", "-1", 96, 90, 40, 80, -1, -1, -1, 95, 85],
+    "text": ["", "", "", "", "Skip", "battle?", "", "Yes", "", "", "", "Cancel", " "],
+}
+
+
+class TestOCRDocument(unittest.TestCase):
+    """Test OCRDocument."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.document = OCRDocument.from_tesseract_data(DATA)
+
+    def test_only_words_are_kept(self):
+        """Structural rows and whitespace are dropped."""
+        self.assertEqual(len(self.document), 4)
+        self.assertEqual(self.document.boxes.shape, (4, 4))
+        self.assertEqual(self.document.hierarchy.shape, (4, 4))
+
+    def test_words(self):
+        """Words keep their own boxes."""
+        words = self.document.words()
+        self.assertEqual([w.text for w in words], ["Skip", "battle?", "Yes", "Cancel"])
+        self.assertEqual(words[1].box.top_left.x, 70)
+        self.assertEqual(
+            [w.text for w in self.document.words(ConfidenceValue(85))],
+            ["Skip", "battle?", "Cancel"],
+        )
+
+    def test_lines(self):
+        """Lines join words and merge boxes."""
+        lines = self.document.lines()
+        self.assertEqual(
+            [line.text for line in lines], ["Skip battle?", "Yes", "Cancel"]
+        )
+        box = lines[0].box
+        self.assertEqual((box.top_left.x, box.top_left.y), (10, 10))
+        self.assertEqual((box.width, box.height), (120, 30))
+        self.assertAlmostEqual(lines[0].confidence.value, 0.93)
+
+    def test_blocks(self):
+        """Blocks are returned in reading order."""
+        self.assertEqual(
+            [block.text for block in self.document.blocks()],
+            ["Skip battle? Yes", "Cancel"],
+        )
+        self.assertEqual(
+            [block.text for block in self.document.blocks(ConfidenceValue(90))],
+            ["Skip battle?", "Cancel"],
+        )
+        self.assertEqual(
+            [p.text for p in self.document.group(GroupingLevel.PARAGRAPH)],
+            ["Skip battle? Yes", "Cancel"],
+        )
+
+    def test_text(self):
+        """Lines are separated by newlines."""
+        self.assertEqual(self.document.text, "Skip battle?\nYes\nCancel")
+
+    def test_empty(self):
+        """No words, no results."""
+        document = OCRDocument.from_tesseract_data({key: [] for key in DATA})
+        self.assertEqual(document.blocks(), [])
+        self.assertEqual(document.words(), [])
+
+    @patch("adb_auto_player.ocr.tesseract_backend._initialize_tesseract")
+    def test_backend_recognizes_once(self, _):
+        """Several granularities from one document only run OCR once."""
+        backend = TesseractBackend()
+        with patch.object(
+            TesseractBackend, "_image_to_data", return_value=DATA
+        ) as image_to_data:
+            document = backend.recognize(np.zeros((600, 800, 3), dtype=np.uint8))
+            document.words()
+            document.lines()
+            document.blocks()
+
+        image_to_data.assert_called_once()
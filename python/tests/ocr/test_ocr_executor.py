@@ -0,0 +1,123 @@
+import threading
+import unittest
+from concurrent.futures import Future, ThreadPoolExecutor
+from unittest.mock import patch
+
+import numpy as np
+from adb_auto_player.ocr import OCRDocument, OCRExecutor, TesseractConfig, wait_first
+
+EMPTY_DATA = {
+    key: []
+    for key in (
+        "text",
+        "conf",
+        "left",
+        "top",
+        "width",
+        "height",
+        "page_num",
+        "block_num",
+        "par_num",
+        "line_num",
+    )
+}
+
+
+class TestOCRExecutor(unittest.TestCase):
+    """Test OCRExecutor with a thread pool in place of worker processes."""
+
+    def setUp(self):
+        """Block the single worker until released."""
+        self.release = threading.Event()
+        self.started = threading.Event()
+        self.calls: list[int] = []
+
+        def recognize(image, config):
+            self.calls.append(int(image[0, 0]))
+            self.started.set()
+            self.release.wait(5)
+            return OCRDocument.from_tesseract_data(EMPTY_DATA)
+
+        patcher = patch(
+            "adb_auto_player.ocr.ocr_executor._recognize", side_effect=recognize
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.executor = OCRExecutor(
+            max_workers=1, max_pending=3, executor=ThreadPoolExecutor(1)
+        )
+        self.addCleanup(self.executor.shutdown)
+        self.addCleanup(self.release.set)
+
+    @staticmethod
+    def _image(value: int) -> np.ndarray:
+        return np.full((10, 10), value, dtype=np.uint8)
+
+    def test_submit_returns_document(self):
+        """Results are delivered through the future."""
+        self.release.set()
+        future = self.executor.submit_ocr(self._image(1), TesseractConfig())
+        self.assertIsInstance(future.result(5), OCRDocument)
+        self.assertEqual(self.executor.pending, 0)
+
+    def test_queue_is_bounded(self):
+        """The oldest queued request is cancelled once the queue is full."""
+        running = self.executor.submit_ocr(self._image(1))
+        self.assertTrue(self.started.wait(5))
+        queued = [self.executor.submit_ocr(self._image(i)) for i in (2, 3)]
+        newest = self.executor.submit_ocr(self._image(4))
+
+        self.assertTrue(queued[0].cancelled())
+        self.assertFalse(running.cancelled())
+        self.release.set()
+        newest.result(5)
+        self.assertEqual(self.calls, [1, 3, 4])
+
+    def test_requests_wait_for_free_worker(self):
+        """Queued requests only reach the pool once a worker is free."""
+        with patch.object(
+            self.executor._executor,
+            "submit",
+            wraps=self.executor._executor.submit,
+        ) as submit:
+            running = self.executor.submit_ocr(self._image(1))
+            self.assertTrue(self.started.wait(5))
+            queued = self.executor.submit_ocr(self._image(2))
+            self.assertEqual(submit.call_count, 1)
+            self.assertEqual(self.executor.pending, 2)
+
+            self.assertTrue(queued.cancel())
+            self.release.set()
+            running.result(5)
+        self.assertEqual(self.calls, [1])
+        self.assertEqual(self.executor.pending, 0)
+
+    def test_cancel_stale(self):
+        """Queued requests of an old screen are cancelled, running ones finish."""
+        running = self.executor.submit_ocr(self._image(1), tag="old")
+        self.assertTrue(self.started.wait(5))
+        stale = self.executor.submit_ocr(self._image(2), tag="old")
+        current = self.executor.submit_ocr(self._image(3), tag="new")
+
+        self.assertEqual(self.executor.cancel_stale("old"), 1)
+        self.assertTrue(stale.cancelled())
+        self.release.set()
+        running.result(5)
+        current.result(5)
+        self.assertEqual(self.calls, [1, 3])
+
+
+class TestWaitFirst(unittest.TestCase):
+    """Test wait_first."""
+
+    def test_wait_first(self):
+        """The first done future is returned, None on timeout."""
+        slow: Future = Future()
+        fast: Future = Future()
+        self.assertIsNone(wait_first([slow, fast], timeout=0.01))
+
+        threading.Timer(0.01, fast.set_result, args=("done",)).start()
+        self.assertIs(wait_first([slow, fast], timeout=5), fast)
+
+        slow.set_result("also done")
+        self.assertIs(wait_first([slow, fast]), slow)
@@ -0,0 +1,135 @@
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import Mock
+
+import cv2
+import numpy as np
+from adb_auto_player.models import ConfidenceValue
+from adb_auto_player.models.geometry import Box, Point
+from adb_auto_player.models.ocr import OCRResult
+from adb_auto_player.ocr import (
+    OCRPreprocessConfig,
+    OCRPreprocessor,
+    PreprocessResult,
+    TextRegionDetector,
+    find_text_regions,
+)
+from adb_auto_player.scripts.benchmark_ocr_preprocessing import (
+    load_corpus,
+    run_benchmark,
+)
+
+POPUP = (
+    Path(__file__).parent
+    / "test_tesseract_backend"
+    / "data"
+    / "popup_no_hero_placed_talent_buff_tile.png"
+)
+
+
+def _text_image() -> np.ndarray:
+    """Two lines of dark text on a light 800x400 BGR background."""
+    image = np.full((400, 800, 3), 235, dtype=np.uint8)
+    for y, text in ((180, "Skip this battle?"), (230, "Challenge Attempts: 3")):
+        cv2.putText(image, text, (250, y), cv2.FONT_HERSHEY_SIMPLEX, 0.8, (40,) * 3, 2)
+    return image
+
+
+class TestOCRPreprocessor(unittest.TestCase):
+    """Test OCRPreprocessor."""
+
+    def test_crops_to_text(self):
+        """Output is much smaller than the input and contains the text."""
+        result = OCRPreprocessor(OCRPreprocessConfig(target_text_height=None)).process(
+            _text_image()
+        )
+
+        self.assertTrue(result.has_text)
+        self.assertEqual(result.scale, 1.0)
+        self.assertLess(result.image.size, 800 * 400 / 4)
+        self.assertTrue(230 <= result.offset.x <= 250)
+        self.assertTrue(140 <= result.offset.y <= 170)
+
+    def test_binarized_dark_text_on_white(self):
+        """Only black and white remain, background is white."""
+        result = OCRPreprocessor().process(_text_image())
+        self.assertEqual(set(np.unique(result.image)), {0, 255})
+        self.assertGreater(np.mean(result.image), 127)
+
+        inverted = OCRPreprocessor().process(255 - _text_image())
+        self.assertGreater(np.mean(inverted.image), 127)
+
+    def test_rescale_to_target_text_height(self):
+        """Small text is scaled up."""
+        result = OCRPreprocessor(
+            OCRPreprocessConfig(target_text_height=60, max_scale=3.0)
+        ).process(_text_image())
+        self.assertGreater(result.scale, 1.0)
+
+    def test_blank_image(self):
+        """Nothing to recognize on a blank image."""
+        result = OCRPreprocessor().process(np.full((200, 400), 200, dtype=np.uint8))
+        self.assertFalse(result.has_text)
+
+    def test_detectors_find_popup_text(self):
+        """Both detectors locate the popup text on a real screenshot."""
+        screenshot = cv2.imread(POPUP.as_posix())
+        body = cv2.cvtColor(screenshot[672:1124], cv2.COLOR_BGR2GRAY)
+        for detector in TextRegionDetector:
+            with self.subTest(detector=detector):
+                regions = find_text_regions(
+                    body, OCRPreprocessConfig(detector=detector)
+                )
+                self.assertTrue(regions)
+                result = OCRPreprocessor(
+                    OCRPreprocessConfig(detector=detector)
+                ).process(body)
+                # "No hero is placed ..." starts at x=165 in the screenshot.
+                self.assertLessEqual(result.offset.x, 165)
+                self.assertLess(result.image.shape[1] / result.scale, body.shape[1])
+
+    def test_to_source(self):
+        """Boxes are mapped back to source coordinates."""
+        result = PreprocessResult(
+            image=np.zeros((1, 1), dtype=np.uint8), offset=Point(100, 50), scale=2.0
+        )
+        mapped = result.to_source(
+            OCRResult("a", ConfidenceValue(1.0), Box(Point(20, 10), 40, 20))
+        )
+        self.assertEqual(mapped.box, Box(Point(110, 55), 20, 10))
+
+
+class TestBenchmarkHarness(unittest.TestCase):
+    """Test the preprocessing benchmark without Tesseract."""
+
+    def test_benchmark_reports_latency_and_accuracy(self):
+        """Corpus is loaded and both metrics are reported."""
+        with tempfile.TemporaryDirectory() as tmp:
+            directory = Path(tmp)
+            cv2.imwrite((directory / "skip.png").as_posix(), _text_image())
+            (directory / "labels.json").write_text(
+                json.dumps({"skip.png": "Skip this battle?", "missing.png": "x"})
+            )
+            samples = load_corpus(directory)
+
+        self.assertEqual(len(samples), 1)
+
+        backend = Mock()
+        backend.extract_text.return_value = "Skip this battIe?\nChallenge"
+        clock = iter(range(100))
+        report = run_benchmark(
+            "preprocessed",
+            backend,
+            samples,
+            OCRPreprocessor(),
+            repeat=2,
+            timer=lambda: next(clock) / 1000,
+        )
+
+        self.assertEqual(backend.extract_text.call_count, 2)
+        self.assertEqual(report.latencies_ms, [1.0])
+        self.assertEqual(report.matches, 1)
+        self.assertLess(report.similarities[0], 1.0)
+        self.assertIn("matched 1/1", str(report))
@@ -0,0 +1,102 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+import cv2
+import numpy as np
+from adb_auto_player.ocr import TextSignatureStore
+
+
+def _text_image(text: str, noise_seed: int | None = None) -> np.ndarray:
+    """Binarized dialog text as produced by OCRPreprocessor."""
+    image = np.full((48, 24 * len(text) + 16), 255, dtype=np.uint8)
+    cv2.putText(image, text, (8, 34), cv2.FONT_HERSHEY_SIMPLEX, 1.0, 0, 2)
+    if noise_seed is not None:
+        rng = np.random.default_rng(noise_seed)
+        flips = rng.random(image.shape) < 0.002
+        image[flips] = 255 - image[flips]
+    return image
+
+
+class TestTextSignatureStore(unittest.TestCase):
+    """Test TextSignatureStore."""
+
+    def test_lookup_learned_text(self):
+        """Learned text is recognized, also with some rendering noise."""
+        store = TextSignatureStore()
+        store.add(_text_image("Skip this battle?"), "skip")
+        store.add(_text_image("Exit the game"), "exit")
+
+        for seed in (None, 1, 2):
+            with self.subTest(seed=seed):
+                match = store.lookup(_text_image("Skip this battle?", seed))
+                assert match is not None
+                self.assertEqual(match.label, "skip")
+                self.assertGreaterEqual(match.similarity.value, 0.97)
+
+    def test_unknown_text(self):
+        """Unknown text falls back to OCR."""
+        store = TextSignatureStore()
+        self.assertIsNone(store.lookup(_text_image("Skip this battle?")))
+        store.add(_text_image("Skip this battle?"), "skip")
+        self.assertIsNone(store.lookup(_text_image("Skip this fight?!")))
+        self.assertIsNone(store.lookup(_text_image("Heading to World now")))
+
+    def test_ambiguous_signatures(self):
+        """Close signatures with different labels are not trusted."""
+        store = TextSignatureStore()
+        store.add(_text_image("Skip this battle?"), "skip")
+        store.add(_text_image("Skip this battle?", 1), "other")
+        self.assertIsNone(store.lookup(_text_image("Skip this battle?")))
+
+        store.remove("other")
+        match = store.lookup(_text_image("Skip this battle?"))
+        assert match is not None
+        self.assertEqual(match.label, "skip")
+
+    def test_variants_per_label(self):
+        """Duplicates are ignored and variants per label are bounded."""
+        store = TextSignatureStore(max_signatures_per_label=2)
+        store.add(_text_image("Attempts: 1"), "attempts")
+        store.add(_text_image("Attempts: 1"), "attempts")
+        self.assertEqual(len(store), 1)
+        for digit in "234":
+            store.add(_text_image(f"Attempts: {digit}"), "attempts")
+        self.assertEqual(len(store), 2)
+
+    def test_persistence(self):
+        """Signatures are saved on learning and loaded on init."""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "popup_signatures" / "game-1.0.json"
+            TextSignatureStore(path).add(_text_image("Exit the game"), "exit")
+
+            store = TextSignatureStore(path)
+            self.assertEqual(len(store), 1)
+            match = store.lookup(_text_image("Exit the game"))
+            assert match is not None
+            self.assertEqual(match.label, "exit")
+            self.assertEqual(match.similarity, 1.0)
+
+    def test_loaded_signatures_are_unverified(self):
+        """Loaded labels need a confirmation, wrong ones can be removed."""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "game-1.0.json"
+            store = TextSignatureStore(path)
+            store.add(_text_image("Exit the game"), "exit")
+            store.add(_text_image("Attempts: 1"), "attempts")
+            match = store.lookup(_text_image("Exit the game"))
+            assert match is not None
+            self.assertTrue(match.verified)
+
+            store = TextSignatureStore(path)
+            match = store.lookup(_text_image("Exit the game"))
+            assert match is not None
+            self.assertFalse(match.verified)
+
+            store.confirm("exit")
+            store.remove("attempts")
+            match = store.lookup(_text_image("Exit the game"))
+            assert match is not None
+            self.assertTrue(match.verified)
+            self.assertIsNone(store.lookup(_text_image("Attempts: 1")))
+            self.assertEqual(len(TextSignatureStore(path)), 1)
@@ -0,0 +1,99 @@
+import unittest
+from unittest.mock import patch
+
+import numpy as np
+from adb_auto_player.models import ConfidenceValue
+from adb_auto_player.ocr import (
+    NativeTesseractBackend,
+    TesseractBackend,
+    TesseractConfig,
+    create_tesseract_backend,
+    is_native_tesseract_available,
+)
+from adb_auto_player.ocr.native_tesseract_backend import (
+    _as_tesseract_image,
+    _get_engine,
+    parse_tsv,
+)
+from PIL import Image, ImageDraw, ImageFont
+
+TSV = (
+    "1\t1\t0\t0\t0\t0\t0\t0\t400\t100\t-1\t\n"
+    "2\t1\t1\t0\t0\t0\t10\t20\t120\t30\t-1\t\n"
+    "5\t1\t1\t1\t1\t1\t10\t20\t50\t30\t96.5\tHello\n"
+    "5\t1\t1\t1\t1\t2\t70\t20\t60\t30\t91.0\tWorld\n"
+)
+
+
+class TestNativeTesseractBackendHelpers(unittest.TestCase):
+    """Tests not requiring libtesseract."""
+
+    def test_parse_tsv_matches_pytesseract_format(self):
+        """Columns and types match pytesseract.image_to_data output."""
+        data = parse_tsv(TSV)
+
+        self.assertEqual(data["level"], [1, 2, 5, 5])
+        self.assertEqual(data["text"], ["", "", "Hello", "World"])
+        self.assertEqual(data["conf"], [-1.0, -1.0, 96.5, 91.0])
+        self.assertEqual(data["left"][3], 70)
+
+    def test_parsed_tsv_is_grouped_by_backend(self):
+        """Grouping logic of TesseractBackend is reused."""
+        with patch.object(
+            NativeTesseractBackend, "_image_to_data", return_value=parse_tsv(TSV)
+        ):
+            backend = NativeTesseractBackend.__new__(NativeTesseractBackend)
+            backend.config = TesseractConfig()
+            backend.cache = None
+            blocks = backend.detect_text_blocks(
+                np.zeros((100, 400, 3), dtype=np.uint8),
+                min_confidence=ConfidenceValue("92%"),
+            )
+
+        self.assertEqual(len(blocks), 1)
+        self.assertEqual(blocks[0].text, "Hello")
+
+    def test_as_tesseract_image(self):
+        """Buffers are passed as contiguous uint8 without conversion."""
+        rgb = np.zeros((10, 20, 3), dtype=np.uint8)
+        self.assertIs(_as_tesseract_image(rgb), rgb)
+
+        view = np.zeros((10, 40, 3), dtype=np.uint8)[:, ::2]
+        self.assertTrue(_as_tesseract_image(view).flags.c_contiguous)
+        self.assertEqual(_as_tesseract_image(np.zeros((5, 5, 1))).shape, (5, 5))
+        with self.assertRaises(ValueError):
+            _as_tesseract_image(np.zeros((5, 5, 2), dtype=np.uint8))
+
+    @patch(
+        "adb_auto_player.ocr.native_tesseract_backend.is_native_tesseract_available",
+        return_value=False,
+    )
+    @patch("adb_auto_player.ocr.tesseract_backend._initialize_tesseract")
+    def test_create_falls_back_to_pytesseract(self, *_):
+        """Without libtesseract the pytesseract backend is used."""
+        backend = create_tesseract_backend(TesseractConfig())
+        self.assertIs(type(backend), TesseractBackend)
+
+
+@unittest.skipUnless(is_native_tesseract_available(), "libtesseract not available")
+class TestNativeTesseractBackend(unittest.TestCase):
+    """Tests against libtesseract."""
+
+    @staticmethod
+    def _text_image(text: str) -> np.ndarray:
+        img = Image.new("RGB", (400, 100), "white")
+        draw = ImageDraw.Draw(img)
+        draw.text((20, 30), text, fill="black", font=ImageFont.load_default(32))
+        return np.array(img)
+
+    def test_extract_text(self):
+        """Text is recognized from a numpy buffer."""
+        backend = NativeTesseractBackend()
+        self.assertIn("Hello", backend.extract_text(self._text_image("Hello World")))
+
+    def test_engine_is_reused(self):
+        """One engine per config is kept for the session."""
+        _get_engine.cache_clear()
+        NativeTesseractBackend()
+        NativeTesseractBackend()
+        self.assertEqual(_get_engine.cache_info().currsize, 1)
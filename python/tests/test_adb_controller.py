@@ -0,0 +1,151 @@
+import unittest
+from unittest.mock import Mock, patch
+
+from adb_auto_player.device.adb import AdbController
+from adb_auto_player.exceptions import GenericAdbError
+from adb_auto_player.models.device import DeviceSnapshot, DisplayInfo, Orientation
+from adb_auto_player.models.geometry import Point
+
+PORTRAIT = DisplayInfo(width=1080, height=1920, orientation=Orientation.PORTRAIT)
+LANDSCAPE = DisplayInfo(width=1920, height=1080, orientation=Orientation.LANDSCAPE)
+
+
+def snapshot(display_info: DisplayInfo) -> DeviceSnapshot:
+    """Snapshot of an emulator running a game."""
+    return DeviceSnapshot(
+        display_info=display_info,
+        running_app="com.example.game",
+        is_emulator=True,
+    )
+
+
+class TestAdbController(unittest.TestCase):
+    """Test AdbController against a fake device."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        with patch(
+            "adb_auto_player.device.adb.adb_controller.AdbDeviceWrapper"
+        ) as wrapper:
+            wrapper.create_from_settings.return_value = Mock(serial="emulator-5554")
+            self.controller = AdbController(use_evdev_touch_input=False)
+        self.addCleanup(self.controller.close)
+        self.controller.state_monitor.session = Mock()
+        self.controller.shell_session = Mock()
+        self.controller.state_monitor.update(snapshot(PORTRAIT))
+
+    def test_display_info_follows_state_monitor(self):
+        """Orientation changes seen by the monitor reach get_display_info."""
+        self.assertEqual(self.controller.get_display_info(), PORTRAIT)
+
+        self.controller.state_monitor.update(snapshot(LANDSCAPE))
+
+        self.assertEqual(self.controller.get_display_info(), LANDSCAPE)
+
+    def test_close_releases_threads_and_shells(self):
+        """Closing stops the monitor and dispatcher and closes every shell."""
+        self.controller.state_monitor.start()
+        self.controller.input_dispatcher.submit(lambda: None).result(timeout=5)
+
+        self.controller.close()
+
+        self.assertIsNone(self.controller.state_monitor._worker)
+        self.assertIsNone(self.controller.input_dispatcher._worker)
+        self.controller.state_monitor.session.close.assert_called_once()
+        self.controller.shell_session.close.assert_called_once()
+        self.assertNotIn(self.controller, AdbController._open_controllers)
+
+    def test_context_manager_closes(self):
+        """Controllers used with `with` are closed on exit."""
+        with self.controller as controller:
+            controller.state_monitor.start()
+
+        self.assertIsNone(self.controller.state_monitor._worker)
+        self.controller.shell_session.close.assert_called_once()
+        self.assertNotIn(self.controller, AdbController._open_controllers)
+
+    def test_close_all(self):
+        """Every open controller of the process is closed."""
+        self.controller.state_monitor.start()
+        self.assertIn(self.controller, AdbController._open_controllers)
+
+        AdbController.close_all()
+
+        self.assertIsNone(self.controller.state_monitor._worker)
+        self.assertNotIn(self.controller, AdbController._open_controllers)
+
+    def test_touch_input_resolved_again_on_display_change(self):
+        """Touches are mapped with the display info after a rotation."""
+        self.controller.use_evdev_touch_input = True
+        first, second = Mock(), Mock()
+        with patch(
+            "adb_auto_player.device.adb.adb_controller.EvdevTouchInput"
+        ) as touch_input:
+            touch_input.create.side_effect = [first, second]
+            self.controller.tap(Point(10, 10))
+            self.controller.state_monitor.update(snapshot(LANDSCAPE))
+            self.controller.tap(Point(10, 10))
+
+        self.assertEqual(
+            [c.args[1] for c in touch_input.create.call_args_list],
+            [PORTRAIT, LANDSCAPE],
+        )
+        first.close.assert_called_once()
+        second.tap.assert_called_once_with(Point(10, 10))
+
+    def test_touch_outside_display_is_skipped(self):
+        """Tap, hold and swipe outside of the display warn and touch nothing."""
+        self.controller.use_evdev_touch_input = True
+        with (
+            patch(
+                "adb_auto_player.device.adb.adb_controller.EvdevTouchInput"
+            ) as touch_input,
+            self.assertLogs(level="WARNING") as logs,
+        ):
+            self.controller.tap(Point(1080, 10))
+            self.controller.hold(Point(10, 1920))
+            self.controller.swipe(Point(10, 10), Point(10, 1920))
+
+        self.assertEqual(len(logs.records), 3)
+        touch_input.create.assert_not_called()
+        self.controller.d.tap.assert_not_called()
+        self.controller.d.swipe.assert_not_called()
+
+    def test_transport_errors_fall_back_to_input(self):
+        """Failed sendevent taps are repeated with input."""
+        self.controller.use_evdev_touch_input = True
+        with patch(
+            "adb_auto_player.device.adb.adb_controller.EvdevTouchInput"
+        ) as touch_input:
+            touch_input.create.return_value.tap.side_effect = GenericAdbError("failed")
+            self.controller.tap(Point(10, 10))
+            self.controller.tap(Point(10, 10))
+
+        self.assertEqual(touch_input.create.call_count, 2)
+        self.assertEqual(self.controller.d.tap.call_count, 2)
+
+    def test_touch_input_disabled_after_repeated_failures(self):
+        """Evdev is not resolved again once it failed too often in a row."""
+        self.controller.use_evdev_touch_input = True
+        with patch(
+            "adb_auto_player.device.adb.adb_controller.EvdevTouchInput"
+        ) as touch_input:
+            touch_input.create.return_value.tap.side_effect = ConnectionError()
+            for _ in range(AdbController.max_touch_input_failures + 2):
+                self.controller.tap(Point(10, 10))
+
+        self.assertEqual(
+            touch_input.create.call_count, AdbController.max_touch_input_failures
+        )
+
+    def test_value_errors_propagate(self):
+        """Errors other than transport errors do not trigger the fallback."""
+        self.controller.use_evdev_touch_input = True
+        with patch(
+            "adb_auto_player.device.adb.adb_controller.EvdevTouchInput"
+        ) as touch_input:
+            touch_input.create.return_value.tap.side_effect = ValueError()
+            with self.assertRaises(ValueError):
+                self.controller.tap(Point(10, 10))
+
+        self.controller.d.tap.assert_not_called()
@@ -0,0 +1,114 @@
+import unittest
+from unittest.mock import Mock
+
+from adb_auto_player.device.adb.device_probe import (
+    PROBE_SECTIONS,
+    build_probe_script,
+    parse_display_size,
+    parse_orientation,
+    probe_device,
+    split_probe_output,
+)
+from adb_auto_player.exceptions import GenericAdbUnrecoverableError
+from adb_auto_player.models.device import Orientation
+
+MARKER = "__ADB_AUTO_PLAYER_PROBE__"
+
+
+def probe_output(**sections: str) -> str:
+    """Render probe output the way the device shell would."""
+    return "\n".join(
+        f"{MARKER} {name}\n{sections.get(name, '')}".rstrip("\n")
+        for name in PROBE_SECTIONS
+    )
+
+
+class TestDeviceProbe(unittest.TestCase):
+    """Test the batched device probe."""
+
+    def test_script_contains_every_section(self):
+        """All commands run in a single script."""
+        script = build_probe_script()
+        for name, command in PROBE_SECTIONS.items():
+            self.assertIn(f"echo {MARKER} {name}; {command}", script)
+
+    def test_split_probe_output(self):
+        """Sections are split by marker, empty sections are kept."""
+        sections = split_probe_output(
+            probe_output(
+                wm_size="Physical size: 1080x1920\nOverride size: 720x1280",
+                running_app="com.example.game",
+            )
+        )
+        self.assertEqual(set(sections), set(PROBE_SECTIONS))
+        self.assertEqual(
+            sections["wm_size"], "Physical size: 1080x1920\nOverride size: 720x1280"
+        )
+        self.assertEqual(sections["surface_orientation"], "")
+        self.assertEqual(sections["running_app"], "com.example.game")
+
+    def test_parse_display_size(self):
+        """Override size takes precedence over physical size."""
+        self.assertEqual(
+            parse_display_size("Physical size: 1080x1920\nOverride size: 720x1280"),
+            (720, 1280),
+        )
+        self.assertEqual(parse_display_size("Physical size: 1080x1920"), (1080, 1920))
+        with self.assertRaises(GenericAdbUnrecoverableError):
+            parse_display_size("")
+        with self.assertRaises(GenericAdbUnrecoverableError):
+            parse_display_size("Physical size: abc")
+
+    def test_parse_orientation_fallbacks(self):
+        """Later checks are only used if earlier ones are inconclusive."""
+        self.assertEqual(
+            parse_orientation(
+                {
+                    "surface_orientation": "SurfaceOrientation: 1",
+                    "current_rotation": "mCurrentRotation=ROTATION_0",
+                }
+            ),
+            Orientation.LANDSCAPE,
+        )
+        self.assertEqual(
+            parse_orientation({"current_rotation": "mCurrentRotation=ROTATION_0"}),
+            Orientation.PORTRAIT,
+        )
+        self.assertEqual(
+            parse_orientation({"display_orientation": "orientation=3"}),
+            Orientation.LANDSCAPE,
+        )
+        with self.assertRaises(GenericAdbUnrecoverableError):
+            parse_orientation({})
+
+    def test_probe_device_single_round_trip(self):
+        """Everything is resolved from one shell command."""
+        session = Mock()
+        session.run.return_value = probe_output(
+            wm_size="Physical size: 1080x1920",
+            surface_orientation="      SurfaceOrientation: 1",
+            build_props="[ro.build.version.release]: [9]\n[ro.Build.x]: [1]",
+            running_app="com.example.game\ncom.example.launcher",
+        )
+
+        snapshot = probe_device(session)
+
+        session.run.assert_called_once_with(build_probe_script())
+        self.assertEqual(snapshot.display_info.dimensions, (1920, 1080))
+        self.assertEqual(snapshot.display_info.orientation, Orientation.LANDSCAPE)
+        self.assertEqual(snapshot.running_app, "com.example.game")
+        self.assertTrue(snapshot.is_emulator)
+
+    def test_probe_device_phone_without_running_app(self):
+        """Missing sections map to sensible defaults."""
+        session = Mock()
+        session.run.return_value = probe_output(
+            wm_size="Physical size: 1080x1920",
+            surface_orientation="SurfaceOrientation: 0",
+        )
+
+        snapshot = probe_device(session)
+
+        self.assertEqual(snapshot.display_info.dimensions, (1080, 1920))
+        self.assertIsNone(snapshot.running_app)
+        self.assertFalse(snapshot.is_emulator)
@@ -0,0 +1,163 @@
+import time
+import unittest
+from unittest.mock import Mock
+
+from adb_auto_player.device.adb import DeviceStateMonitor
+from adb_auto_player.device.adb.device_probe import RUNNING_APP_COMMAND
+from adb_auto_player.device.adb.device_state_monitor import MONITOR_SECTIONS
+from adb_auto_player.exceptions import GenericAdbUnrecoverableError
+from adb_auto_player.models.device import DeviceSnapshot, DisplayInfo, Orientation
+
+MARKER = "__ADB_AUTO_PLAYER_PROBE__"
+PORTRAIT = DisplayInfo(width=1080, height=1920, orientation=Orientation.PORTRAIT)
+
+
+def monitor_output(running_app: str, orientation: int = 0) -> str:
+    """Render output of the monitor sections."""
+    sections = {
+        "wm_size": "Physical size: 1080x1920",
+        "surface_orientation": f"SurfaceOrientation: {orientation}",
+        "running_app": running_app,
+    }
+    return "\n".join(f"{MARKER} {name}\n{sections[name]}" for name in MONITOR_SECTIONS)
+
+
+class TestDeviceStateMonitor(unittest.TestCase):
+    """Test DeviceStateMonitor against a fake shell session."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.session = Mock()
+        self.session.run.return_value = monitor_output("com.example.game")
+        self.session.run_unsafe.return_value = monitor_output("com.example.game")
+        self.monitor = DeviceStateMonitor(self.session, interval=0.05, max_age=60)
+        self.monitor.update(
+            DeviceSnapshot(
+                display_info=PORTRAIT,
+                running_app="com.example.launcher",
+                is_emulator=True,
+            )
+        )
+
+    def tearDown(self):
+        """Stop the background thread."""
+        self.monitor.stop()
+
+    def query_running_app_only(self, running_app: str) -> None:
+        """Answer RUNNING_APP_COMMAND, every other script fails."""
+
+        def run(script: str) -> str:
+            if script != RUNNING_APP_COMMAND:
+                raise AssertionError(f"Unexpected script: {script}")
+            return running_app
+
+        self.session.run.side_effect = run
+
+    def test_cached_value_within_max_age(self):
+        """Hot loops do not query the device."""
+        for _ in range(10):
+            self.assertEqual(self.monitor.get_running_app(), "com.example.launcher")
+        self.session.run.assert_not_called()
+
+    def test_force_refresh(self):
+        """Callers can request a fresh snapshot, captured by the full probe."""
+        snapshot = self.monitor.get_snapshot(force_refresh=True)
+        self.assertEqual(snapshot.running_app, "com.example.game")
+        self.session.run.assert_called_once()
+        self.assertIn("getprop", self.session.run.call_args.args[0])
+
+    def test_max_age(self):
+        """Values older than max_age are refreshed."""
+        self.query_running_app_only("com.example.game")
+        time.sleep(0.01)
+        self.assertEqual(self.monitor.get_running_app(max_age=0), "com.example.game")
+        self.assertEqual(self.monitor.get_running_app(), "com.example.game")
+        self.assertEqual(self.session.run.call_count, 1)
+
+    def test_running_app_does_not_query_display(self):
+        """App detection works on devices whose orientation is unknown."""
+        self.query_running_app_only("com.example.game")
+        self.assertEqual(
+            self.monitor.get_running_app(force_refresh=True), "com.example.game"
+        )
+        self.session.run.assert_called_once_with(RUNNING_APP_COMMAND)
+        self.assertEqual(self.monitor.get_snapshot().display_info, PORTRAIT)
+
+    def test_invalidate(self):
+        """Invalidated values are refreshed on the next access."""
+        self.query_running_app_only("com.example.game")
+        self.monitor.invalidate()
+        self.assertEqual(self.monitor.get_running_app(), "com.example.game")
+        self.assertEqual(self.monitor.get_running_app(), "com.example.game")
+        self.assertEqual(self.session.run.call_count, 1)
+
+    def test_orientation_change_is_tracked(self):
+        """Display info follows rotation, inconclusive checks raise."""
+        self.session.run.return_value = monitor_output("com.example.game", 1)
+        snapshot = self.monitor.get_snapshot(force_refresh=True)
+        self.assertEqual(snapshot.display_info.orientation, Orientation.LANDSCAPE)
+        self.assertEqual(snapshot.display_info.dimensions, (1920, 1080))
+
+        self.session.run.return_value = f"{MARKER} running_app\ncom.example.game"
+        with self.assertRaises(GenericAdbUnrecoverableError):
+            self.monitor.get_snapshot(force_refresh=True)
+        self.assertEqual(self.monitor.get_snapshot(), snapshot)
+
+    def test_invalidate_uses_orientation_fallbacks(self):
+        """A changed display size is picked up without SurfaceOrientation."""
+        self.session.run.return_value = (
+            f"{MARKER} wm_size\nPhysical size: 1440x2560\n"
+            f"{MARKER} current_rotation\nmCurrentRotation=ROTATION_0\n"
+            f"{MARKER} running_app\ncom.example.game"
+        )
+        self.monitor.invalidate()
+
+        snapshot = self.monitor.get_snapshot()
+
+        self.assertEqual(snapshot.display_info.dimensions, (1440, 2560))
+        self.assertIn("mCurrentRotation", self.session.run.call_args.args[0])
+
+    def test_background_refresh(self):
+        """The background thread refreshes without retry."""
+        self.monitor.start()
+        deadline = time.monotonic() + 5
+        while self.monitor.get_running_app() != "com.example.game":
+            self.assertLess(time.monotonic(), deadline)
+            time.sleep(0.01)
+        self.session.run.assert_not_called()
+        self.assertNotIn("getprop", self.session.run_unsafe.call_args.args[0])
+        # emulator detection is carried over from the initial probe
+        self.assertTrue(self.monitor.get_snapshot().is_emulator)
+
+    def test_background_refresh_falls_back_to_full_probe(self):
+        """Inconclusive monitor sections are not answered with old display info."""
+        scripts = []
+
+        def run_unsafe(script: str) -> str:
+            scripts.append(script)
+            return (
+                f"{MARKER} wm_size\nPhysical size: 1440x2560\n"
+                f"{MARKER} display_orientation\norientation=0\n"
+                f"{MARKER} running_app\ncom.example.game"
+            )
+
+        self.session.run_unsafe.side_effect = run_unsafe
+        self.monitor.start()
+        deadline = time.monotonic() + 5
+        while self.monitor.get_running_app() != "com.example.game":
+            self.assertLess(time.monotonic(), deadline)
+            time.sleep(0.01)
+        self.monitor.stop()
+
+        self.assertEqual(
+            self.monitor.get_snapshot().display_info.dimensions, (1440, 2560)
+        )
+        self.assertNotIn("getprop", scripts[0])
+        self.assertTrue(all("getprop" in script for script in scripts[1:]))
+
+    def test_background_errors_keep_snapshot(self):
+        """Failed background refreshes do not discard the cached snapshot."""
+        self.session.run_unsafe.side_effect = ConnectionResetError()
+        self.monitor.start()
+        time.sleep(0.2)
+        self.assertEqual(self.monitor.get_running_app(), "com.example.launcher")
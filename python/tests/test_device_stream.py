@@ -178,6 +178,32 @@ class TestIntegrationWithRealDecoding(unittest.TestCase):
 
                 stream.stop()
 
+    def test_stream_stats(self):
+        """Frames nobody read before the next one arrived count as dropped."""
+        mock_device = Mock()
+        mock_device.d.serial = "emulator-5554"
+        mock_device.d.shell.return_value = MockAdbConnection(
+            self._create_video_with_dimensions(160, 120, 15)
+        )
+        mock_device.is_controlling_emulator = False
+        stream = DeviceStream(mock_device, fps=5)
+        stream.start()
+        self.addCleanup(stream.stop)
+        self.assertIn(stream, DeviceStream.running_streams())
+
+        # The decoder holds back the last frames of the connection.
+        timeout = time.time() + 10
+        while stream.frame_number < 10 and time.time() < timeout:
+            time.sleep(0.05)
+        stats = stream.stats()
+
+        self.assertEqual(stats.device, "emulator-5554")
+        self.assertGreaterEqual(stats.frames_total, 10)
+        self.assertEqual(stats.dropped_frames, stats.frames_total - 1)
+        self.assertGreater(stats.fps, 0)
+        stream.stop()
+        self.assertNotIn(stream, DeviceStream.running_streams())
+
     def _create_video_with_dimensions(
         self, width: int, height: int, frame_count: int
     ) -> bytes:
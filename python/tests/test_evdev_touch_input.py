@@ -0,0 +1,227 @@
+import re
+import unittest
+from unittest.mock import Mock
+
+from adb_auto_player.device.adb.evdev_touch_input import (
+    ABS_MT_POSITION_X,
+    ABS_MT_POSITION_Y,
+    ABS_MT_TRACKING_ID,
+    BTN_TOUCH,
+    EV_ABS,
+    EV_KEY,
+    EV_SYN,
+    EvdevTouchInput,
+    parse_touchscreen,
+)
+from adb_auto_player.exceptions import GenericAdbError
+from adb_auto_player.models.device import DisplayInfo, Orientation
+from adb_auto_player.models.geometry import Point, PointOutsideDisplay
+
+GETEVENT_OUTPUT = """add device 1: /dev/input/event3
+  bus:      0000
+  vendor    0000
+  product   0000
+  version   0000
+  name:     "Power Button"
+  location: ""
+  id:       ""
+  version:  1.0.1
+  events:
+    KEY (0001): KEY_POWER
+  input props:
+    <none>
+add device 2: /dev/input/event1
+  bus:      0006
+  vendor    0000
+  product   0000
+  version   0000
+  name:     "virtio_input_multi_touch_0"
+  location: "virtio18/input0"
+  id:       ""
+  version:  1.0.1
+  events:
+    KEY (0001): BTN_TOUCH
+    ABS (0003): ABS_MT_SLOT           : value 0, min 0, max 9, fuzz 0, flat 0
+                ABS_MT_TOUCH_MAJOR    : value 0, min 0, max 2147483647, fuzz 0
+                ABS_MT_POSITION_X     : value 0, min 0, max 2159, fuzz 0, flat 0
+                ABS_MT_POSITION_Y     : value 0, min 0, max 3839, fuzz 0, flat 0
+                ABS_MT_TRACKING_ID    : value 0, min 0, max 65535, fuzz 0, flat 0
+                ABS_MT_PRESSURE       : value 0, min 0, max 255, fuzz 0, flat 0
+  input props:
+    INPUT_PROP_DIRECT
+"""
+
+FRAME_PATTERN = re.compile(r"\{ (.*)\n\} </dev/null 2>&1; echo (\S+) \$\?\n", re.S)
+PORTRAIT = DisplayInfo(width=1080, height=1920, orientation=Orientation.PORTRAIT)
+
+
+class FakeShellConnection:
+    """Fake persistent shell that records sendevent calls."""
+
+    def __init__(self, exit_code: int = 0):
+        self.conn = Mock()
+        self.scripts: list[str] = []
+        self.exit_code = exit_code
+        self._output = b""
+        self.closed = False
+
+    def send(self, data: bytes) -> int:
+        match = FRAME_PATTERN.fullmatch(data.decode())
+        assert match is not None
+        script, sentinel = match.groups()
+        self.scripts.append(script)
+        self._output += f"{sentinel} {self.exit_code}\n".encode()
+        return len(data)
+
+    def recv(self, n: int) -> bytes:
+        chunk, self._output = self._output[:n], self._output[n:]
+        return chunk
+
+    def close(self) -> None:
+        self.closed = True
+
+    @property
+    def events(self) -> list[tuple[str, int, int, int]]:
+        events = []
+        for script in self.scripts:
+            for command in script.split(" && "):
+                parts = command.split()
+                if parts[0] == "sendevent":
+                    events.append(
+                        (parts[1], int(parts[2]), int(parts[3]), int(parts[4]))
+                    )
+        return events
+
+
+class FakeDevice:
+    """Fake AdbDeviceWrapper."""
+
+    def __init__(self, connection: FakeShellConnection):
+        self.d = self
+        self.connection = connection
+        self.shell_calls: list[str] = []
+
+    def shell(self, cmdargs: str, stream: bool = False, **kwargs):
+        self.shell_calls.append(cmdargs)
+        if stream:
+            return self.connection
+        if cmdargs == "getevent -pl":
+            return GETEVENT_OUTPUT
+        return ""
+
+
+class TestEvdevTouchInput(unittest.TestCase):
+    """Test EvdevTouchInput against a fake device shell."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.connection = FakeShellConnection()
+        self.device = FakeDevice(self.connection)
+
+    def test_parse_touchscreen(self):
+        """Touchscreen and axis ranges are discovered."""
+        touchscreen = parse_touchscreen(GETEVENT_OUTPUT)
+        assert touchscreen is not None
+        self.assertEqual(touchscreen.path, "/dev/input/event1")
+        self.assertEqual(touchscreen.x_max, 2159)
+        self.assertEqual(touchscreen.y_max, 3839)
+        self.assertTrue(touchscreen.has_slot)
+        self.assertTrue(touchscreen.has_pressure)
+        self.assertTrue(touchscreen.has_btn_touch)
+
+    def test_parse_touchscreen_none(self):
+        """No touchscreen in output."""
+        self.assertIsNone(
+            parse_touchscreen(GETEVENT_OUTPUT.split("add device 2", 1)[0])
+        )
+        self.assertIsNone(parse_touchscreen(""))
+
+    def test_create_orientation_mismatch(self):
+        """Rotated displays fall back to input."""
+        landscape = DisplayInfo(
+            width=1920, height=1080, orientation=Orientation.LANDSCAPE
+        )
+        self.assertIsNone(EvdevTouchInput.create(self.device, landscape))  # type: ignore
+
+    def test_tap_events(self):
+        """A tap is a scaled touch down followed by a touch up in one round trip."""
+        touch_input = EvdevTouchInput.create(self.device, PORTRAIT)  # type: ignore
+        assert touch_input is not None
+
+        touch_input.tap(Point(540, 960))
+
+        self.assertEqual(len(self.connection.scripts), 1)
+        events = [(t, c, v) for _, t, c, v in self.connection.events]
+        self.assertIn((EV_ABS, ABS_MT_POSITION_X, 1080), events)
+        self.assertIn((EV_ABS, ABS_MT_POSITION_Y, 1920), events)
+        self.assertEqual(
+            events[-3:],
+            [
+                (EV_ABS, ABS_MT_TRACKING_ID, -1),
+                (EV_KEY, BTN_TOUCH, 0),
+                (EV_SYN, 0, 0),
+            ],
+        )
+        self.assertTrue(
+            all(path == "/dev/input/event1" for path, *_ in self.connection.events)
+        )
+
+    def test_single_persistent_shell(self):
+        """Subsequent taps reuse the same shell."""
+        touch_input = EvdevTouchInput.create(self.device, PORTRAIT)  # type: ignore
+        assert touch_input is not None
+
+        for _ in range(5):
+            touch_input.tap(Point(100, 100))
+
+        self.assertEqual(self.device.shell_calls, ["getevent -pl", "sh"])
+        self.assertEqual(len(self.connection.scripts), 5)
+
+    def test_hold_and_swipe(self):
+        """Holds sleep between down and up, swipes move along the path."""
+        touch_input = EvdevTouchInput.create(self.device, PORTRAIT)  # type: ignore
+        assert touch_input is not None
+
+        touch_input.hold(Point(10, 10), duration=0.5)
+        self.assertIn("sleep 0.500", self.connection.scripts[-1])
+
+        touch_input.swipe(Point(540, 1500), Point(540, 500), duration=0.1)
+        y_positions = [
+            value
+            for _, ev_type, code, value in self.connection.events
+            if ev_type == EV_ABS and code == ABS_MT_POSITION_Y
+        ]
+        self.assertEqual(y_positions[1], 3000)
+        self.assertEqual(y_positions[-1], 1000)
+        self.assertEqual(y_positions[2:], sorted(y_positions[2:], reverse=True))
+
+    def test_tap_outside_display(self):
+        """Points outside the display do not inject events."""
+        touch_input = EvdevTouchInput.create(self.device, PORTRAIT)  # type: ignore
+        assert touch_input is not None
+
+        touch_input.tap(PointOutsideDisplay())
+
+        self.assertEqual(self.connection.scripts, [":"])
+
+    def test_touch_outside_display_raises(self):
+        """Tap, hold and swipe reject coordinates outside of the display alike."""
+        touch_input = EvdevTouchInput.create(self.device, PORTRAIT)  # type: ignore
+        assert touch_input is not None
+
+        with self.assertRaises(ValueError):
+            touch_input.tap(Point(1080, 10))
+        with self.assertRaises(ValueError):
+            touch_input.hold(Point(10, 1920), 0.1)
+        with self.assertRaises(ValueError):
+            touch_input.swipe(Point(10, 10), Point(10, 1920), 0.1)
+        self.assertEqual(self.connection.scripts, [])
+
+    def test_sendevent_failure(self):
+        """Non-zero exit codes raise so the caller can fall back to input."""
+        self.connection.exit_code = 1
+        touch_input = EvdevTouchInput.create(self.device, PORTRAIT)  # type: ignore
+        assert touch_input is not None
+
+        with self.assertRaises(GenericAdbError):
+            touch_input.tap(Point(1, 1))
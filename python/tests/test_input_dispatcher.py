@@ -0,0 +1,144 @@
+import itertools
+import threading
+import time
+import unittest
+
+from adb_auto_player.device.adb import InputDispatcher
+
+
+class TestInputDispatcher(unittest.TestCase):
+    """Test InputDispatcher."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.dispatcher = InputDispatcher(min_interval=0)
+
+    def tearDown(self):
+        """Stop the worker."""
+        self.dispatcher.stop()
+
+    def test_actions_execute_in_order_on_single_worker(self):
+        """Actions run sequentially on one long-lived worker thread."""
+        calls: list[int] = []
+        threads: set[int] = set()
+
+        def action(i: int) -> int:
+            threads.add(threading.get_ident())
+            calls.append(i)
+            return i
+
+        futures = [self.dispatcher.submit(action, i) for i in range(20)]
+
+        self.assertEqual([f.result(timeout=5) for f in futures], list(range(20)))
+        self.assertEqual(calls, list(range(20)))
+        self.assertEqual(len(threads), 1)
+        self.assertNotIn(threading.get_ident(), threads)
+
+    def test_pending_actions_with_same_key_are_coalesced(self):
+        """Submitting a duplicate of a pending action returns the pending future."""
+        release = threading.Event()
+        calls: list[str] = []
+
+        blocker = self.dispatcher.submit(release.wait)
+        first = self.dispatcher.submit(calls.append, "tap", coalesce_key="tap")
+        second = self.dispatcher.submit(calls.append, "tap", coalesce_key="tap")
+        other = self.dispatcher.submit(calls.append, "other", coalesce_key="other")
+
+        self.assertIs(first, second)
+        release.set()
+        blocker.result(timeout=5)
+        other.result(timeout=5)
+
+        self.assertEqual(calls, ["tap", "other"])
+
+    def test_coalescing_only_applies_to_pending_actions(self):
+        """Once an action was dispatched the same key is queued again."""
+        calls: list[str] = []
+
+        self.dispatcher.submit(calls.append, "tap", coalesce_key="tap").result(
+            timeout=5
+        )
+        self.dispatcher.submit(calls.append, "tap", coalesce_key="tap").result(
+            timeout=5
+        )
+
+        self.assertEqual(calls, ["tap", "tap"])
+
+    def test_exception_is_set_on_future(self):
+        """Errors raised by an action are propagated through the future."""
+
+        def fail() -> None:
+            raise ValueError("tap failed")
+
+        future = self.dispatcher.submit(fail)
+
+        with self.assertRaises(ValueError):
+            future.result(timeout=5)
+        # worker survives failing actions
+        self.assertEqual(self.dispatcher.submit(lambda: 1).result(timeout=5), 1)
+
+    def test_detached_failures_are_logged_as_warning(self):
+        """Failures of actions nobody waits for reach the user."""
+
+        def fail() -> None:
+            raise ValueError("tap failed")
+
+        with self.assertLogs(level="WARNING") as logs:
+            future = self.dispatcher.submit(fail, detached=True)
+            self.dispatcher.wait_idle(timeout=5)
+
+        self.assertIsInstance(future.exception(), ValueError)
+        self.assertIn("tap failed", logs.output[0])
+        self.assertIsNotNone(logs.records[0].exc_info)
+
+    def test_rate_limit(self):
+        """Actions are spaced by at least min_interval."""
+        self.dispatcher.min_interval = 0.05
+        timestamps: list[float] = []
+
+        futures = [
+            self.dispatcher.submit(lambda: timestamps.append(time.perf_counter()))
+            for _ in range(4)
+        ]
+        for future in futures:
+            future.result(timeout=5)
+
+        deltas = [b - a for a, b in itertools.pairwise(timestamps)]
+        self.assertTrue(all(delta >= 0.045 for delta in deltas), deltas)
+
+    def test_wait_idle(self):
+        """wait_idle returns once all queued actions have been executed."""
+        calls: list[int] = []
+        for i in range(5):
+            self.dispatcher.submit(calls.append, i)
+
+        self.assertTrue(self.dispatcher.wait_idle(timeout=5))
+        self.assertEqual(calls, list(range(5)))
+
+    def test_bounded_queue_applies_backpressure(self):
+        """Submit blocks while the queue is full."""
+        dispatcher = InputDispatcher(min_interval=0, max_queue_size=1)
+        release = threading.Event()
+        started = threading.Event()
+
+        def block() -> None:
+            started.set()
+            release.wait()
+
+        dispatcher.submit(block)
+        started.wait(timeout=5)
+        dispatcher.submit(lambda: None)  # fills the queue
+
+        submitted = threading.Event()
+
+        def submit() -> None:
+            dispatcher.submit(lambda: None)
+            submitted.set()
+
+        submitter = threading.Thread(target=submit, daemon=True)
+        submitter.start()
+
+        self.assertFalse(submitted.wait(timeout=0.2))
+        release.set()
+        self.assertTrue(submitted.wait(timeout=5))
+        dispatcher.stop()
@@ -0,0 +1,85 @@
+import threading
+import unittest
+from unittest.mock import Mock
+
+import numpy as np
+from adb_auto_player.exceptions import AutoPlayerWarningError
+from adb_auto_player.games.afk_journey.popup_message_handler import PopupMessage
+from adb_auto_player.games.afk_journey.popup_watcher import (
+    PopupWatcher,
+    PopupWatcherMode,
+)
+
+POPUP = PopupMessage(text="Skip this battle?")
+
+
+class FakeHandler:
+    """Screen showing a popup on the given frames."""
+
+    def __init__(self, popup_frames: set[int], frame_count: int = 8):
+        self.popup_frames = popup_frames
+        self.frame_count = frame_count
+        self.done = threading.Event()
+        self._identify_popup = Mock(return_value=POPUP)
+        self._confirm_popup = Mock(return_value=POPUP)
+
+    def wait_for_new_screenshot(self, after: int, timeout: float | None = None):
+        if after >= self.frame_count:
+            self.done.set()
+            self.done.wait(timeout)
+            return None
+        return after + 1, np.full((4, 4, 3), after + 1, dtype=np.uint8)
+
+    def _preprocess_screenshot_for_popup(self, screenshot: np.ndarray):
+        if int(screenshot[0, 0, 0]) in self.popup_frames:
+            return Mock()
+        return None
+
+
+class TestPopupWatcher(unittest.TestCase):
+    """Test PopupWatcher."""
+
+    def _run(self, handler: FakeHandler, mode: PopupWatcherMode) -> PopupWatcher:
+        watcher = PopupWatcher(handler, mode, min_interval=0)  # type: ignore[arg-type]
+        watcher.start()
+        self.assertTrue(handler.done.wait(5))
+        watcher.stop()
+        return watcher
+
+    def test_notify_classifies_once_per_popup(self):
+        """A popup open on several frames is classified and published once."""
+        handler = FakeHandler(popup_frames={2, 3, 4, 7})
+        watcher = self._run(handler, PopupWatcherMode.NOTIFY)
+
+        self.assertEqual(handler._identify_popup.call_count, 2)
+        handler._confirm_popup.assert_not_called()
+        events = watcher.drain_events()
+        self.assertEqual([event.popup for event in events], [POPUP, POPUP])
+        self.assertFalse(any(event.handled for event in events))
+
+    def test_handle_confirms_popups(self):
+        """Confirmed popups are reported to the routine."""
+        handler = FakeHandler(popup_frames={2, 3})
+        watcher = self._run(handler, PopupWatcherMode.HANDLE)
+
+        self.assertEqual(handler._confirm_popup.call_count, 2)
+        self.assertTrue(watcher.consume_handled())
+        self.assertFalse(watcher.consume_handled())
+
+    def test_handle_forwards_exceptions(self):
+        """Exceptions of confirmed popups are raised on the routine thread."""
+        handler = FakeHandler(popup_frames={2})
+        handler._confirm_popup.side_effect = AutoPlayerWarningError("reset")
+        watcher = self._run(handler, PopupWatcherMode.HANDLE)
+
+        with self.assertRaises(AutoPlayerWarningError):
+            watcher.consume_handled()
+
+    def test_events_are_bounded(self):
+        """The oldest event is dropped once max_events is reached."""
+        watcher = PopupWatcher(Mock(), max_events=2)
+        for detected_at in range(3):
+            watcher._publish(Mock(popup=POPUP, handled=False, detected_at=detected_at))
+        self.assertEqual(
+            [event.detected_at for event in watcher.drain_events()], [1, 2]
+        )
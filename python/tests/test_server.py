@@ -0,0 +1,259 @@
+import asyncio
+import json
+import logging
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from multiprocessing import Queue
+
+from adb_auto_player.ipc_util import HubTopic, LogChannel, MessageHub
+from adb_auto_player.models.commands import Command
+from adb_auto_player.server import FastAPIServer, current_log_channel
+from fastapi import WebSocketDisconnect
+from fastapi.testclient import TestClient
+
+command_started = threading.Event()
+command_released = threading.Event()
+
+
+def _blocking_command() -> None:
+    logging.info("started")
+    command_started.set()
+    command_released.wait(5)
+
+
+class FakeWebSocket:
+    """Records sent text frames."""
+
+    def __init__(self):
+        self.sent: list[str] = []
+
+    async def send_text(self, text: str) -> None:
+        self.sent.append(text)
+
+
+class TestMessagePump(unittest.IsolatedAsyncioTestCase):
+    """Test forwarding of worker process messages."""
+
+    async def test_messages_are_forwarded_until_end_marker(self):
+        """All queued messages arrive in order, the end marker stops the reader."""
+        websocket = FakeWebSocket()
+        channel = LogChannel(websocket.send_text)
+        current_log_channel.set(channel)
+        channel_task = asyncio.create_task(channel.run())
+        message_queue: Queue = Queue()
+        for index in range(1000):
+            message_queue.put({"index": index})
+        message_queue.put(None)
+
+        await asyncio.wait_for(
+            FastAPIServer._read_message_queue(message_queue, threading.Event()),
+            timeout=5,
+        )
+        channel.close()
+        await channel_task
+
+        received = [
+            message["index"] for text in websocket.sent for message in json.loads(text)
+        ]
+        self.assertEqual(received, list(range(1000)))
+        self.assertLess(len(websocket.sent), 1000)
+
+    async def test_summary_deltas_are_assembled(self):
+        """Summary deltas of a command are forwarded as its full summary."""
+        websocket = FakeWebSocket()
+        channel = LogChannel(websocket.send_text)
+        current_log_channel.set(channel)
+        channel_task = asyncio.create_task(channel.run())
+        message_queue: Queue = Queue()
+        message_queue.put({"summary_delta": {"Game": {"Cleared": 1, "Stage": "1-1"}}})
+        message_queue.put({"summary_delta": {"Game": {"Cleared": 2}}})
+        message_queue.put(None)
+
+        await asyncio.wait_for(
+            FastAPIServer._read_message_queue(message_queue, threading.Event()),
+            timeout=5,
+        )
+        channel.close()
+        await channel_task
+
+        summaries = [
+            message["summary_message"]
+            for text in websocket.sent
+            for message in json.loads(text)
+        ]
+        self.assertEqual(
+            summaries[-1], "=== SUMMARY ===\nGame\n  Cleared: 2\n  Stage: 1-1"
+        )
+
+    async def test_stream_stats_only_reach_subscribers(self):
+        """Stream stats go to hub subscribers, not to the command's WebSocket."""
+        command_socket, subscriber_socket = FakeWebSocket(), FakeWebSocket()
+        channel = LogChannel(command_socket.send_text)
+        subscriber = LogChannel(subscriber_socket.send_text)
+        current_log_channel.set(channel)
+        hub = MessageHub()
+        hub.subscribe(subscriber, [HubTopic.STREAM_STATS])
+        tasks = [asyncio.create_task(c.run()) for c in (channel, subscriber)]
+        message_queue: Queue = Queue()
+        message_queue.put({"stream_stats": {"fps": 30.0, "dropped_frames": 2}})
+        message_queue.put(None)
+
+        await asyncio.wait_for(
+            FastAPIServer._read_message_queue(message_queue, threading.Event(), hub),
+            timeout=5,
+        )
+        channel.close()
+        subscriber.close()
+        await asyncio.gather(*tasks)
+
+        self.assertEqual(command_socket.sent, [])
+        self.assertEqual(
+            [json.loads(text) for text in subscriber_socket.sent],
+            [{"stream_stats": {"fps": 30.0, "dropped_frames": 2}}],
+        )
+
+    async def test_reader_stops_after_process_exit(self):
+        """Without end marker the reader stops once the process exited."""
+        current_log_channel.set(None)
+        process_exited = threading.Event()
+        reader = asyncio.create_task(
+            FastAPIServer._read_message_queue(Queue(), process_exited)
+        )
+        await asyncio.sleep(0.1)
+        self.assertFalse(reader.done())
+
+        process_exited.set()
+        await asyncio.wait_for(reader, timeout=5)
+
+    def test_drain_message_queue(self):
+        """Messages are taken in bulk up to the end marker."""
+        message_queue: Queue = Queue()
+        for message in ("a", "b", None, "c"):
+            message_queue.put(message)
+        # Wait until the queue feeder thread flushed everything.
+        first = message_queue.get(timeout=5)
+        threading.Event().wait(0.1)
+
+        batch = FastAPIServer._drain_message_queue(message_queue, timeout=1)
+        self.assertEqual([first, *batch], ["a", "b", None])
+        self.assertEqual(
+            FastAPIServer._drain_message_queue(message_queue, timeout=1), ["c"]
+        )
+        self.assertEqual(
+            FastAPIServer._drain_message_queue(message_queue, timeout=0.01), []
+        )
+
+
+class TestEndpoints(unittest.TestCase):
+    """Test HTTP and WebSocket endpoints."""
+
+    def setUp(self):
+        logger = logging.getLogger()
+        handlers, level = logger.handlers[:], logger.level
+        self.addCleanup(setattr, logger, "handlers", handlers)
+        self.addCleanup(logger.setLevel, level)
+        command_started.clear()
+        command_released.clear()
+        commands = {"Test": [Command(name="Block", action=_blocking_command)]}
+        self.server = FastAPIServer(commands)
+        self.server.worker_pool.size = 0
+        self.client = TestClient(self.server.app)
+        self.client.__enter__()
+        self.addCleanup(self.client.__exit__, None, None, None)
+
+    def test_event_loop_stays_responsive(self):
+        """Requests are served while a command runs, its logs are returned."""
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            pending = executor.submit(
+                self.client.post, "/execute", json={"command": ["Block"]}
+            )
+            self.assertTrue(command_started.wait(5))
+            self.assertEqual(self.client.get("/health").status_code, 200)
+            self.assertFalse(pending.done())
+            command_released.set()
+            response = pending.result(timeout=5)
+
+        self.assertEqual(response.status_code, 200)
+        messages = [message["message"] for message in response.json()["messages"]]
+        self.assertEqual(messages, ["started"])
+
+    def test_unknown_command(self):
+        """Unknown commands are rejected."""
+        response = self.client.post("/execute", json={"command": ["Unknown"]})
+        self.assertEqual(response.status_code, 404)
+
+    def test_subscribers_receive_their_topics(self):
+        """Observers get command messages of the topics they subscribed to."""
+        hub = self.server.message_hub
+        with (
+            self.client.websocket_connect("/ws/subscribe?topics=summaries") as first,
+            self.client.websocket_connect("/ws/subscribe") as second,
+        ):
+            for _ in range(50):
+                if hub.has_subscribers(HubTopic.SUMMARIES) and hub.has_subscribers(
+                    HubTopic.LOGS
+                ):
+                    break
+                threading.Event().wait(0.1)
+            message_queue: Queue = Queue()
+            message_queue.put({"level": "INFO", "message": "log"})
+            message_queue.put({"summary_message": "summary"})
+            message_queue.put(None)
+            asyncio.run(
+                FastAPIServer._read_message_queue(message_queue, threading.Event(), hub)
+            )
+
+            self.assertEqual(first.receive_json(), {"summary_message": "summary"})
+            received = []
+            while len(received) < 2:
+                frame = second.receive_json()
+                received.extend(frame if isinstance(frame, list) else [frame])
+            self.assertEqual(
+                received,
+                [{"level": "INFO", "message": "log"}, {"summary_message": "summary"}],
+            )
+
+    def test_metrics(self):
+        """Metrics are served in the Prometheus text format."""
+        response = self.client.get("/metrics")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.headers["content-type"].startswith("text/plain"))
+        self.assertIn(
+            "# TYPE adb_auto_player_process_memory_bytes gauge", response.text
+        )
+
+    def test_unknown_topic(self):
+        """Subscriptions to unknown topics are refused."""
+        with (
+            self.assertRaises(WebSocketDisconnect),
+            self.client.websocket_connect("/ws/subscribe?topics=unknown"),
+        ):
+            pass
+
+    def test_preview_frames(self):
+        """Viewers get frames as binary messages while previews are requested."""
+        requested = self.server.worker_pool.preview_requested
+        with self.client.websocket_connect("/ws/preview?fps=30") as viewer:
+            for _ in range(50):
+                if self.server.message_hub.has_subscribers(HubTopic.PREVIEW_FRAMES):
+                    break
+                threading.Event().wait(0.1)
+            self.assertTrue(requested.is_set())
+            message_queue: Queue = Queue()
+            message_queue.put({"preview_frame": b"frame"})
+            message_queue.put(None)
+            asyncio.run(
+                FastAPIServer._read_message_queue(
+                    message_queue, threading.Event(), self.server.message_hub
+                )
+            )
+
+            self.assertEqual(viewer.receive_bytes(), b"frame")
+
+        for _ in range(50):
+            if not requested.is_set():
+                break
+            threading.Event().wait(0.1)
+        self.assertFalse(requested.is_set())
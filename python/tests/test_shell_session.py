@@ -0,0 +1,112 @@
+import re
+import unittest
+from unittest.mock import Mock, patch
+
+from adb_auto_player.device.adb import ShellSession
+from adb_auto_player.exceptions import GenericAdbUnrecoverableError
+from adbutils import AdbDevice, AdbTimeout
+
+FRAME_PATTERN = re.compile(r"\{ (.*)\n\} </dev/null 2>&1; echo (\S+) \$\?\n", re.S)
+
+
+class FakeShellConnection:
+    """Fake persistent sh answering framed commands from a lookup table."""
+
+    def __init__(self, responses: dict[str, tuple[str, int]], chunk_size: int = 7):
+        self.conn = Mock()
+        self.responses = responses
+        self.chunk_size = chunk_size
+        self.commands: list[str] = []
+        self.closed = False
+        self._output = b""
+
+    def send(self, data: bytes) -> int:
+        match = FRAME_PATTERN.fullmatch(data.decode())
+        assert match is not None
+        command, sentinel = match.groups()
+        self.commands.append(command)
+        output, exit_code = self.responses.get(command, ("", 0))
+        self._output += f"{output}\n{sentinel} {exit_code}\n".encode()
+        return len(data)
+
+    def recv(self, n: int) -> bytes:
+        n = min(n, self.chunk_size)
+        chunk, self._output = self._output[:n], self._output[n:]
+        return chunk
+
+    def close(self) -> None:
+        self.closed = True
+
+
+class TestShellSession(unittest.TestCase):
+    """Test ShellSession against a fake device shell."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.responses = {
+            "wm size": ("Physical size: 1080x1920", 0),
+            "dumpsys input | grep 'SurfaceOrientation'": ("", 1),
+            "getprop | grep Build": ("[ro.build]: [1]\n[ro.Build]: [2]", 0),
+        }
+        self.connections: list[FakeShellConnection] = []
+        self.device = Mock(spec=AdbDevice)
+        self.device.shell.side_effect = self._open_shell
+        self.session = ShellSession(self.device)
+
+    def _open_shell(self, cmdargs, stream=False, **kwargs):
+        assert cmdargs == "sh" and stream
+        connection = FakeShellConnection(self.responses)
+        self.connections.append(connection)
+        return connection
+
+    def test_commands_share_one_connection(self):
+        """Outputs are demultiplexed from a single shell."""
+        self.assertEqual(self.session.run("wm size"), "Physical size: 1080x1920")
+        self.assertEqual(
+            self.session.run("getprop | grep Build"),
+            "[ro.build]: [1]\n[ro.Build]: [2]",
+        )
+        self.assertEqual(self.session.run("echo"), "")
+
+        self.assertEqual(len(self.connections), 1)
+        self.assertEqual(
+            self.connections[0].commands,
+            ["wm size", "getprop | grep Build", "echo"],
+        )
+
+    def test_exit_code(self):
+        """Non-zero exit codes are reported, not raised."""
+        result = self.session.execute("dumpsys input | grep 'SurfaceOrientation'")
+        self.assertEqual(result.exit_code, 1)
+        self.assertEqual(result.output, "")
+        self.assertEqual(self.session.execute("wm size").exit_code, 0)
+
+    def test_timeout_reopens_connection(self):
+        """A failed command closes the shell, the next command opens a new one."""
+        self.session.run("wm size")
+        self.connections[0].recv = Mock(side_effect=AdbTimeout("adb recv timeout"))
+
+        with self.assertRaises(AdbTimeout):
+            self.session.execute("wm size", timeout=0.1)
+        self.assertTrue(self.connections[0].closed)
+        self.connections[0].conn.settimeout.assert_called_with(0.1)
+
+        self.assertEqual(self.session.run("wm size"), "Physical size: 1080x1920")
+        self.assertEqual(len(self.connections), 2)
+
+    @patch("adb_auto_player.device.adb.retry_decorator.time.sleep")
+    def test_run_retries_on_new_connection(self, _):
+        """Run is integrated with adb_retry."""
+        first = FakeShellConnection(self.responses)
+        first.recv = Mock(side_effect=ConnectionResetError())
+        self.device.shell.side_effect = [first, self._open_shell("sh", stream=True)]
+
+        self.assertEqual(self.session.run("wm size"), "Physical size: 1080x1920")
+        self.assertTrue(first.closed)
+
+    def test_security_exception_is_unrecoverable(self):
+        """Output is checked the same way as AdbDeviceWrapper.shell."""
+        self.responses["am start"] = ("java.lang.SecurityException: denied", 255)
+
+        with self.assertRaises(GenericAdbUnrecoverableError):
+            self.session.run("am start")
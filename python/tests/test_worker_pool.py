@@ -0,0 +1,98 @@
+import logging
+import queue
+import time
+import unittest
+from unittest.mock import patch
+
+from adb_auto_player.models.commands import Command
+from adb_auto_player.util import SummaryGenerator
+from adb_auto_player.worker_pool import CommandWorkerPool, run_command_in_process
+
+
+def _log_hello() -> None:
+    logging.info("hello")
+
+
+def _summarize_and_wait() -> None:
+    SummaryGenerator.set("Test", "Cleared", 1)
+    logging.info("summarized")
+    time.sleep(30)
+
+
+COMMANDS = {
+    "Test": [
+        Command(name="Hello", action=_log_hello),
+        Command(name="SummarizeAndWait", action=_summarize_and_wait),
+    ]
+}
+
+
+class TestCommandWorkerPool(unittest.TestCase):
+    """Test CommandWorkerPool."""
+
+    def setUp(self):
+        self.pool = CommandWorkerPool(COMMANDS, size=1)
+        self.pool.start()
+        self.addCleanup(self.pool.shutdown)
+
+    def _run(self, command: list[str]):
+        worker = self.pool.acquire()
+        self.addCleanup(worker.terminate)
+        worker.submit(command)
+        result = worker.wait(timeout=30)
+        messages = []
+        while (message := worker.message_queue.get(timeout=5)) is not None:
+            messages.append(message["message"])
+        return worker, result, messages
+
+    def test_worker_is_reused_after_success(self):
+        """Successful commands return the worker to the pool."""
+        worker, result, messages = self._run(["Hello"])
+
+        self.assertIsNotNone(result)
+        self.assertTrue(result.success)  # type: ignore[union-attr]
+        self.assertIn("hello", messages)
+        self.pool.release(worker, result)
+        self.assertIs(self.pool.acquire(), worker)
+        self.pool.release(worker, result)
+
+    def test_worker_is_replaced_after_failure(self):
+        """Workers of failed commands are terminated."""
+        worker, result, messages = self._run(["Unknown"])
+
+        self.assertIsNotNone(result)
+        self.assertFalse(result.success)  # type: ignore[union-attr]
+        self.assertTrue(any("Unrecognized command" in m for m in messages))
+        self.pool.release(worker, result)
+        worker.process.join(5)
+        self.assertFalse(worker.is_alive())
+        replacement = self.pool.acquire()
+        self.assertIsNot(replacement, worker)
+        self.pool.discard(replacement)
+
+    def test_device_resources_closed_after_command(self):
+        """Controllers opened by a command are closed before the next one."""
+        logger = logging.getLogger()
+        self.addCleanup(setattr, logger, "handlers", logger.handlers[:])
+        self.addCleanup(logger.setLevel, logger.level)
+        message_queue: queue.Queue = queue.Queue()
+        with patch("adb_auto_player.worker_pool.AdbController") as controller:
+            run_command_in_process(["Hello"], COMMANDS, message_queue)  # type: ignore[arg-type]
+
+        controller.close_all.assert_called_once()
+
+    def test_summary_is_flushed_when_stopped(self):
+        """Terminating a worker still sends its last summary updates."""
+        worker = self.pool.acquire()
+        self.addCleanup(worker.terminate)
+        worker.submit(["SummarizeAndWait"])
+        while worker.message_queue.get(timeout=30).get("message") != "summarized":
+            pass
+
+        worker.process.terminate()
+        messages = []
+        while (message := worker.message_queue.get(timeout=5)) is not None:
+            messages.append(message)
+
+        self.assertIn({SummaryGenerator.DELTA_KEY: {"Test": {"Cleared": 1}}}, messages)
+        self.pool.discard(worker)
@@ -0,0 +1,126 @@
+import random
+import re
+import unittest
+from difflib import SequenceMatcher
+
+from adb_auto_player.games.afk_journey.popup_message_handler import (
+    PopupMessageHandler,
+    popup_messages,
+)
+from adb_auto_player.models import ConfidenceValue
+from adb_auto_player.util import ApproximateMatcher
+
+
+def reference_fuzzy_substring_match(
+    text: str, pattern: str, similarity_threshold: ConfidenceValue
+) -> bool:
+    """Previous StringHelper.fuzzy_substring_match implementation."""
+    text_lower = text.lower()
+    pattern_lower = pattern.lower()
+    if len(pattern_lower) > len(text_lower):
+        return False
+    for i in range(len(text_lower) - len(pattern_lower) + 1):
+        substring = text_lower[i : i + len(pattern_lower)]
+        similarity = SequenceMatcher(None, substring, pattern_lower).ratio()
+        if similarity >= similarity_threshold:
+            return True
+    return False
+
+
+def reference_find_matching_popup(ocr_text: str):
+    """Previous PopupMessageHandler._find_matching_popup implementation."""
+    for popup in popup_messages:
+        text = ocr_text
+        if popup.strip_numbers:
+            text = re.sub(r"\d+", "", text)
+            text = re.sub(r"\s+", " ", text)
+            text = text.strip()
+        if reference_fuzzy_substring_match(text, popup.text, ConfidenceValue("80%")):
+            return popup
+    return None
+
+
+def _ocr_noise(rng: random.Random, text: str, errors: int) -> str:
+    """Apply typical OCR errors: substitutions, drops and insertions."""
+    characters = list(text)
+    for _ in range(errors):
+        position = rng.randrange(len(characters) + 1)
+        operation = rng.choice(("substitute", "drop", "insert"))
+        if operation == "substitute" and position < len(characters):
+            characters[position] = rng.choice("Il1|0Oo.,' ")
+        elif operation == "drop" and position < len(characters):
+            del characters[position]
+        else:
+            characters.insert(position, rng.choice("abc .,'1"))
+    return "".join(characters)
+
+
+class TestApproximateMatcher(unittest.TestCase):
+    """Test ApproximateMatcher."""
+
+    def test_first_pattern_wins(self):
+        """Earlier patterns take precedence, the best window is reported."""
+        matcher = ApproximateMatcher([("exit the", 1), ("exit the game", 2)])
+        match = matcher.find("Are you sure you want to exit the game?")
+        assert match is not None
+        self.assertEqual(match.value, 1)
+        self.assertEqual(match.similarity, 1.0)
+        self.assertEqual(match.start, 25)
+        self.assertEqual(
+            [m.value for m in matcher.find_all("exit the game")],
+            [1, 2],
+        )
+
+    def test_normalizers(self):
+        """Text is normalized per pattern."""
+        matcher = ApproximateMatcher(
+            [("spend to challenge", "strip"), ("spend", "raw")],
+            normalizers=[lambda text: re.sub(r"\d+ ", "", text), None],
+        )
+        match = matcher.find("Spend 100 to challenge this stage again?")
+        assert match is not None
+        self.assertEqual(match.value, "strip")
+
+    def test_equivalent_to_previous_fuzzy_substring_match(self):
+        """Randomized texts give the same decision as the sliding window search."""
+        rng = random.Random(42)
+        alphabet = "abcde fghij"
+        for threshold in ("50%", "70%", "80%", "90%"):
+            confidence = ConfidenceValue(threshold)
+            for _ in range(300):
+                pattern = "".join(rng.choices(alphabet, k=rng.randint(0, 8)))
+                text = "".join(rng.choices(alphabet, k=rng.randint(0, 30)))
+                if pattern and rng.random() < 0.5:
+                    position = rng.randint(0, len(text))
+                    noisy = _ocr_noise(rng, pattern, rng.randint(0, 2))
+                    text = text[:position] + noisy + text[position:]
+                with self.subTest(text=text, pattern=pattern, threshold=threshold):
+                    self.assertEqual(
+                        ApproximateMatcher([(pattern, None)], confidence).find(text)
+                        is not None,
+                        reference_fuzzy_substring_match(text, pattern, confidence),
+                    )
+
+    def test_popup_lookup_equivalent_to_previous_implementation(self):
+        """All popup messages with OCR noise resolve to the same popup as before."""
+        rng = random.Random(7)
+        texts = ["", "Battle", "Nothing to see here, just some text"]
+        for popup in popup_messages:
+            texts.append(popup.text)
+            texts.append(f"Header\n{popup.text} 12/30 Attempts")
+            for errors in (1, 2, 3, 5, 8):
+                texts.append(_ocr_noise(rng, popup.text, errors))
+        texts.append("Spend 50 to challenge this stage again?")
+        texts.append("Are you sure you want to exit the game?")
+
+        matched = 0
+        for text in texts:
+            with self.subTest(text=text):
+                expected = reference_find_matching_popup(text)
+                self.assertEqual(
+                    PopupMessageHandler._find_matching_popup(text), expected
+                )
+                matched += expected is not None
+        # Make sure the corpus covers both outcomes.
+        self.assertGreater(matched, len(popup_messages))
+        self.assertLess(matched, len(texts))
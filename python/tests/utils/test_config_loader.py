@@ -17,6 +17,7 @@ class TestConfigLoader:
         ConfigLoader.working_dir.cache_clear()
         ConfigLoader.games_dir.cache_clear()
         ConfigLoader.binaries_dir.cache_clear()
+        ConfigLoader.cache_dir.cache_clear()
         ConfigLoader.general_settings.cache_clear()
 
     def test_working_dir_normal_case(self):
@@ -93,6 +94,17 @@ class TestConfigLoader:
             result = ConfigLoader.binaries_dir()
             assert result == expected
 
+    def test_cache_dir(self):
+        """Test cache_dir defaults to working_dir / cache and can be overridden."""
+        working_path = Path("home") / "user" / "project"
+
+        with patch.object(ConfigLoader, "working_dir", return_value=working_path):
+            with patch.dict("os.environ", {"ADB_AUTO_PLAYER_CACHE_DIR": ""}):
+                assert ConfigLoader.cache_dir() == working_path / "cache"
+            ConfigLoader.cache_dir.cache_clear()
+            with patch.dict("os.environ", {"ADB_AUTO_PLAYER_CACHE_DIR": "custom"}):
+                assert ConfigLoader.cache_dir() == Path("custom")
+
     def test_main_config_successful_load(self):
         """Test main_config successfully loads valid TOML file."""
         config_data = {"device": {"ID": "test"}}
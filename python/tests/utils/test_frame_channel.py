@@ -0,0 +1,29 @@
+import asyncio
+import unittest
+
+from adb_auto_player.ipc_util import FrameChannel
+
+
+class TestFrameChannel(unittest.IsolatedAsyncioTestCase):
+    """Test FrameChannel."""
+
+    async def test_newest_frame_wins(self):
+        """Frames arriving faster than max_fps replace each other."""
+        sent: list[bytes] = []
+
+        async def send(frame: bytes) -> None:
+            sent.append(frame)
+
+        channel = FrameChannel(send, max_fps=5)
+        task = asyncio.create_task(channel.run())
+        channel.put(b"0")
+        await asyncio.sleep(0.05)
+        for index in range(1, 10):
+            channel.put(str(index).encode())
+        await asyncio.sleep(0.3)
+        channel.close()
+        await task
+
+        self.assertEqual(sent, [b"0", b"9"])
+        self.assertEqual(channel.skipped, 8)
+        self.assertFalse(channel.put(b"10"))
@@ -0,0 +1,74 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from adb_auto_player.games import AFKJourneyBase
+from adb_auto_player.ipc import GameGUIOptions, MenuOption
+from adb_auto_player.ipc_util import GameGUIData, GamePackageNames, GUIOptionsCache
+
+
+def _gui_data() -> GameGUIData:
+    return GameGUIData(
+        gui_options=[
+            GameGUIOptions(
+                game_title="Game",
+                menu_options=[MenuOption(label="Run", args=["Run"], category="A")],
+                categories=["A"],
+                constraints={"General": {"count": {"type": "checkbox"}}},
+            )
+        ],
+        game_packages=[GamePackageNames("Game", None, ["com.example"])],
+    )
+
+
+class TestGUIOptionsCache(unittest.TestCase):
+    """Test GUIOptionsCache."""
+
+    def setUp(self):
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self.cache = GUIOptionsCache(Path(tmp_dir.name) / "gui_options.json")
+
+    def test_round_trip(self):
+        """Saved data is loaded for the same fingerprint."""
+        self.cache.save("a", _gui_data())
+
+        self.assertEqual(self.cache.load("a"), _gui_data())
+        self.assertIsNone(self.cache.load("b"))
+
+    def test_invalidate(self):
+        """Invalidated data is rebuilt."""
+        self.cache.save("a", _gui_data())
+        self.cache.invalidate()
+
+        self.assertIsNone(self.cache.load("a"))
+        self.cache.invalidate()
+
+    def test_corrupt_file(self):
+        """Unreadable files are ignored."""
+        self.cache.path.write_text("{", encoding="utf-8")
+
+        self.assertIsNone(self.cache.load("a"))
+
+    def test_fingerprint_is_stable(self):
+        """The fingerprint only changes with its inputs."""
+        self.assertEqual(
+            GUIOptionsCache.fingerprint([AFKJourneyBase]),
+            GUIOptionsCache.fingerprint([AFKJourneyBase]),
+        )
+        self.assertNotEqual(
+            GUIOptionsCache.fingerprint([AFKJourneyBase]),
+            GUIOptionsCache.fingerprint([]),
+        )
+
+    def test_package_names(self):
+        """Apps are matched by package name or substring."""
+        self.assertTrue(
+            GamePackageNames("Game", None, ["example"]).matches("com.example")
+        )
+        self.assertTrue(GamePackageNames("Game", "com.a", []).matches("com.a"))
+        self.assertFalse(GamePackageNames("Game", "com.a", []).matches("com.b"))
+
+
+if __name__ == "__main__":
+    unittest.main()
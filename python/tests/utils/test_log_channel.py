@@ -0,0 +1,76 @@
+import asyncio
+import json
+import unittest
+
+from adb_auto_player.ipc import LogLevel
+from adb_auto_player.ipc_util import LogChannel
+
+
+def _log(level: str, index: int) -> dict:
+    return {"level": level, "message": str(index)}
+
+
+class SlowWebSocket:
+    """Records frames, sending blocks until released."""
+
+    def __init__(self):
+        self.frames: list = []
+        self.release = asyncio.Event()
+
+    async def send_text(self, text: str) -> None:
+        await self.release.wait()
+        self.frames.append(json.loads(text))
+
+    @property
+    def messages(self) -> list[dict]:
+        messages = []
+        for frame in self.frames:
+            messages.extend(frame if isinstance(frame, list) else [frame])
+        return messages
+
+
+class TestLogChannel(unittest.IsolatedAsyncioTestCase):
+    """Test LogChannel."""
+
+    async def test_batches_in_order(self):
+        """Messages are sent in order with few frames, single ones as object."""
+        websocket = SlowWebSocket()
+        websocket.release.set()
+        channel = LogChannel(websocket.send_text, batch_size=50)
+        task = asyncio.create_task(channel.run())
+
+        for index in range(120):
+            channel.put(_log(LogLevel.INFO, index))
+        await asyncio.sleep(0.2)
+        channel.put({"summary_message": "done"})
+        channel.close()
+        await task
+
+        self.assertEqual(len(websocket.frames), 4)
+        self.assertEqual(websocket.frames[-1], {"summary_message": "done"})
+        self.assertEqual(
+            [int(m["message"]) for m in websocket.messages[:-1]], list(range(120))
+        )
+        self.assertFalse(channel.put(_log(LogLevel.INFO, 0)))
+
+    async def test_debug_is_dropped_first(self):
+        """A slow consumer loses DEBUG messages before anything else."""
+        websocket = SlowWebSocket()
+        channel = LogChannel(websocket.send_text, max_buffered=10)
+        task = asyncio.create_task(channel.run())
+
+        for index in range(20):
+            level = LogLevel.DEBUG if index % 2 else LogLevel.WARNING
+            channel.put(_log(level, index))
+        channel.put({"summary_message": "summary"})
+        self.assertEqual(channel.buffered, 10)
+
+        websocket.release.set()
+        channel.close()
+        await task
+
+        messages = websocket.messages
+        self.assertEqual(channel.dropped, {LogLevel.DEBUG: 10, LogLevel.WARNING: 1})
+        self.assertNotIn(LogLevel.DEBUG, [m.get("level") for m in messages[:-1]])
+        self.assertIn({"summary_message": "summary"}, messages)
+        self.assertIn("11 log messages were dropped", messages[-1]["message"])
@@ -0,0 +1,56 @@
+import json
+import unittest
+from unittest.mock import Mock, patch
+
+from adb_auto_player.ipc_util import EncodedMessage, HubTopic, MessageHub
+
+
+class TestMessageHub(unittest.TestCase):
+    """Test MessageHub."""
+
+    def test_topics(self):
+        """Messages only reach subscribers of their topic."""
+        hub = MessageHub()
+        logs, everything = Mock(), Mock()
+        hub.subscribe(logs, [HubTopic.LOGS])
+        hub.subscribe(everything, list(HubTopic))
+
+        self.assertEqual(hub.publish({"level": "INFO", "message": "a"}), 2)
+        self.assertEqual(hub.publish({"summary_message": "b"}), 1)
+        self.assertEqual(hub.publish({"stream_stats": {"fps": 30}}), 1)
+
+        self.assertEqual(logs.put.call_count, 1)
+        self.assertEqual(
+            [json.loads(c.args[0].text) for c in everything.put.call_args_list],
+            [
+                {"level": "INFO", "message": "a"},
+                {"summary_message": "b"},
+                {"stream_stats": {"fps": 30}},
+            ],
+        )
+
+    def test_serialized_once(self):
+        """All subscribers get the same encoded message."""
+        hub = MessageHub()
+        subscribers = [Mock() for _ in range(3)]
+        for subscriber in subscribers:
+            hub.subscribe(subscriber, [HubTopic.LOGS])
+
+        with patch.object(
+            EncodedMessage, "from_dict", wraps=EncodedMessage.from_dict
+        ) as from_dict:
+            hub.publish({"level": "INFO", "message": "a"})
+        from_dict.assert_called_once()
+        encoded = {id(s.put.call_args.args[0]) for s in subscribers}
+        self.assertEqual(len(encoded), 1)
+
+    def test_unsubscribe(self):
+        """Nothing is encoded once the last subscriber left."""
+        hub = MessageHub()
+        subscriber = Mock()
+        hub.subscribe(subscriber, [HubTopic.LOGS])
+        hub.unsubscribe(subscriber)
+
+        self.assertFalse(hub.has_subscribers(HubTopic.LOGS))
+        self.assertEqual(hub.publish({"level": "INFO", "message": "a"}), 0)
+        subscriber.put.assert_not_called()
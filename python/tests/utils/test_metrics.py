@@ -0,0 +1,76 @@
+import os
+import threading
+import unittest
+
+from adb_auto_player.util import Metrics, MetricsSnapshot
+
+
+class TestMetrics(unittest.TestCase):
+    """Test Metrics."""
+
+    def setUp(self):
+        Metrics.reset()
+        self.addCleanup(Metrics.reset)
+
+    def test_counters_of_all_threads_are_summed(self):
+        """Every thread records separately, snapshots add them up."""
+
+        def record():
+            for _ in range(100):
+                Metrics.increment("taps_total", input="adb")
+
+        threads = [threading.Thread(target=record) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        counters = Metrics.snapshot().counters
+        self.assertEqual(counters[("taps_total", (("input", "adb"),))], 400)
+
+    def test_histogram(self):
+        """Observations are counted in the bucket of their upper bound."""
+        Metrics.observe("screenshot_seconds", 0.003, backend="stream")
+        Metrics.observe("screenshot_seconds", 0.2, backend="stream")
+        with Metrics.timer("screenshot_seconds", backend="stream"):
+            pass
+
+        rendered = Metrics.render()
+
+        prefix = "adb_auto_player_screenshot_seconds"
+        self.assertIn(f"# TYPE {prefix} histogram", rendered)
+        self.assertIn(f'{prefix}_bucket{{backend="stream",le="0.001"}} 1', rendered)
+        self.assertIn(f'{prefix}_bucket{{backend="stream",le="0.005"}} 2', rendered)
+        self.assertIn(f'{prefix}_bucket{{backend="stream",le="+Inf"}} 3', rendered)
+        self.assertIn(f'{prefix}_count{{backend="stream"}} 3', rendered)
+
+    def test_worker_snapshots_are_added(self):
+        """Counters of workers are summed, gauges of exited workers dropped."""
+        Metrics.increment("wait_timeouts_total")
+        exited = MetricsSnapshot(
+            pid=-1,
+            counters={("wait_timeouts_total", ()): 2},
+            gauges={("process_memory_bytes", (("pid", "-1"),)): 1},
+        )
+        Metrics.merge(exited)
+        # A newer snapshot of the same process replaces the previous one.
+        Metrics.merge(exited)
+
+        rendered = Metrics.render()
+
+        self.assertIn("adb_auto_player_wait_timeouts_total 3\n", rendered)
+        self.assertIn(f'process_memory_bytes{{pid="{os.getpid()}"}}', rendered)
+        self.assertNotIn('pid="-1"', rendered)
+
+    def test_label_values_are_escaped(self):
+        """Quotes, backslashes and newlines in label values are escaped."""
+        Metrics.increment("template_matches_total", template='a\\"b\n')
+
+        self.assertIn(
+            'adb_auto_player_template_matches_total{template="a\\\\\\"b\\n"} 1',
+            Metrics.render(),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,72 @@
+import unittest
+from queue import Queue
+
+from adb_auto_player.util import SummaryGenerator
+
+
+class TestSummaryGenerator(unittest.TestCase):
+    """Test SummaryGenerator."""
+
+    def setUp(self):
+        SummaryGenerator.reset()
+        self.addCleanup(SummaryGenerator.reset)
+        self.addCleanup(setattr, SummaryGenerator(), "_message_queue", None)
+        self.addCleanup(setattr, SummaryGenerator, "flush_interval", 0.5)
+        # Keeps the background thread from sending during the test.
+        SummaryGenerator.flush_interval = 60
+        self.message_queue: Queue = Queue()
+
+    def _deltas(self) -> list[dict]:
+        deltas = []
+        while not self.message_queue.empty():
+            deltas.append(self.message_queue.get()[SummaryGenerator.DELTA_KEY])
+        return deltas
+
+    def test_updates_are_coalesced(self):
+        """Many updates between flushes are sent as one delta."""
+        SummaryGenerator.set_message_queue(self.message_queue)
+        SummaryGenerator.flush()
+        self._deltas()
+
+        for _ in range(1000):
+            SummaryGenerator.increment("Guitar Girl", "Notes")
+        SummaryGenerator.set("Guitar Girl", "Stage", "1-1")
+        SummaryGenerator.flush()
+        SummaryGenerator.flush()
+
+        self.assertEqual(
+            self._deltas(), [{"Guitar Girl": {"Notes": 1000, "Stage": "1-1"}}]
+        )
+
+    def test_deltas_assemble_the_summary(self):
+        """Applying all deltas gives the summary of the generator."""
+        SummaryGenerator.set_message_queue(self.message_queue)
+        SummaryGenerator.increment("A", "Battles")
+        SummaryGenerator.flush()
+        SummaryGenerator.increment("B", "Cleared", 3)
+        SummaryGenerator.increment("A", "Battles")
+        SummaryGenerator.flush()
+
+        entries: dict = {}
+        for delta in self._deltas():
+            SummaryGenerator.apply_delta(entries, delta)
+
+        self.assertEqual(
+            SummaryGenerator.format_summary(entries),
+            SummaryGenerator().get_summary_message(),
+        )
+        self.assertEqual(
+            SummaryGenerator().get_summary_message(),
+            "=== SUMMARY ===\nA\n  Battles: 2\n\nB\n  Cleared: 3",
+        )
+
+    def test_increment_non_integer(self):
+        """Only integer values can be incremented."""
+        SummaryGenerator.set("A", "Stage", "1-1")
+
+        with self.assertRaises(TypeError):
+            SummaryGenerator.increment("A", "Stage")
+
+
+if __name__ == "__main__":
+    unittest.main()